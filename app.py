@@ -3,19 +3,44 @@ import shutil
 import re
 import asyncio
 import uuid
+import threading
+import hashlib
+import json
+import sqlite3
+import time
+import multiprocessing
+import functools
+import contextvars
 import nest_asyncio
+from collections import OrderedDict, deque
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from contextlib import asynccontextmanager, contextmanager
+from importlib import metadata
 from pathlib import Path
 from PIL import Image
 from playwright.async_api import async_playwright
-from fastapi import FastAPI, UploadFile, File, Form, HTTPException, BackgroundTasks, Request
-from fastapi.responses import FileResponse, HTMLResponse, JSONResponse
+from fastapi import FastAPI, Form, HTTPException, BackgroundTasks, Request, Query
+from fastapi.responses import FileResponse, HTMLResponse, JSONResponse, StreamingResponse, Response
 from fastapi.templating import Jinja2Templates
+from starlette.datastructures import FormData
+from starlette.routing import Match
+try:
+    from python_multipart.multipart import MultipartParser, parse_options_header
+    from python_multipart.exceptions import FormParserError
+except ImportError:  # python-multipart < 0.0.13
+    from multipart.multipart import MultipartParser, parse_options_header
+    from multipart.exceptions import FormParserError
 import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
 from docling.document_converter import DocumentConverter, PdfFormatOption
 from docling.datamodel.base_models import InputFormat
-from docling.datamodel.pipeline_options import PdfPipelineOptions
+from docling.datamodel.pipeline_options import PdfPipelineOptions, TableFormerMode
+import pypdfium2 as pdfium
+import pypdfium2.raw as pdfium_c
 import zipfile
 import httpx
+from urllib.parse import quote, urlsplit
 
 # Unstructured imports (optional, will check if available)
 try:
@@ -27,6 +52,24 @@ except ImportError:
     pytesseract = None
     print("[!] Unstructured library not available. Install with: pip install unstructured[all-docs]")
 
+# LibreOffice UNO bridge (optional). When this interpreter cannot import `uno`,
+# uno_bridge.py runs under a Python that can (see LIBREOFFICE_PYTHON); without
+# either, each conversion runs as a one-shot soffice process.
+try:
+    from uno_bridge import uno_convert_to_pdf
+    LIBREOFFICE_UNO_AVAILABLE = True
+except ImportError:
+    LIBREOFFICE_UNO_AVAILABLE = False
+
+# Prometheus client (optional, /metrics is disabled without it)
+try:
+    from prometheus_client import Histogram, REGISTRY, CONTENT_TYPE_LATEST, generate_latest
+    from prometheus_client.core import GaugeMetricFamily
+    PROMETHEUS_AVAILABLE = True
+except ImportError:
+    PROMETHEUS_AVAILABLE = False
+    print("[!] prometheus_client not available. Install with: pip install prometheus-client")
+
 # Windows-only import
 if os.name == 'nt':
     try:
@@ -42,12 +85,166 @@ app = FastAPI()
 UPLOAD_DIR = Path("uploads")
 OUTPUT_DIR = Path("outputs")
 EXTRACTED_DIR = Path("extracted")
+CACHE_DIR = Path("cache")
 UPLOAD_DIR.mkdir(exist_ok=True)
 OUTPUT_DIR.mkdir(exist_ok=True)
 EXTRACTED_DIR.mkdir(exist_ok=True)
+CACHE_DIR.mkdir(exist_ok=True)
 
 templates = Jinja2Templates(directory="templates")
 
+# Artifact janitor: TTLs (seconds) and disk ceiling for uploads/, outputs/ and extracted/
+JANITOR_INTERVAL = float(os.environ.get("JANITOR_INTERVAL", "30"))
+ARTIFACT_MAX_BYTES = int(os.environ.get("ARTIFACT_MAX_BYTES", str(5 * 1024 ** 3)))
+CONVERT_TTL = 60
+EXTRACTION_DOWNLOAD_TTL = 120
+EXTRACTION_VIEW_TTL = float(os.environ.get("EXTRACTION_VIEW_TTL", "3600"))
+# /batch-report links outlive the batch's PDFs, which go after CONVERT_TTL
+BATCH_REPORT_TTL = float(os.environ.get("BATCH_REPORT_TTL", str(EXTRACTION_VIEW_TTL)))
+ORPHAN_TTL = float(os.environ.get("ORPHAN_TTL", "600"))
+
+# Upload ingestion
+MAX_UPLOAD_BYTES = int(os.environ.get("MAX_UPLOAD_BYTES", str(256 * 1024 ** 2)))
+UPLOAD_CHUNK_BYTES = 1024 * 1024
+
+# Chromium pool limits for /convert-url
+BROWSER_MAX_CONTEXTS = int(os.environ.get("BROWSER_MAX_CONTEXTS", "4"))
+BROWSER_RECYCLE_PAGES = int(os.environ.get("BROWSER_RECYCLE_PAGES", "100"))
+# Render readiness: hard deadline for lazy content, and how long the network
+# must stay quiet before the page is considered loaded
+RENDER_READY_TIMEOUT = float(os.environ.get("RENDER_READY_TIMEOUT", "15"))
+RENDER_NETWORK_QUIET = float(os.environ.get("RENDER_NETWORK_QUIET", "0.5"))
+# Request interception during rendering: resource classes to block (see
+# RENDER_BLOCKABLE) and the shared on-disk cache for static assets (0 disables it)
+RENDER_BLOCK = [c.strip() for c in os.environ.get("RENDER_BLOCK", "analytics,ads,media").split(",") if c.strip()]
+RENDER_ASSET_CACHE_MAX_BYTES = int(os.environ.get("RENDER_ASSET_CACHE_MAX_BYTES", str(512 * 1024 ** 2)))
+RENDER_ASSET_DEFAULT_TTL = float(os.environ.get("RENDER_ASSET_DEFAULT_TTL", "3600"))
+# Direct-PDF downloads in /convert-url: size cap, shared connection pool and
+# the local store of ETag/Last-Modified validated PDFs
+PDF_DOWNLOAD_MAX_BYTES = int(os.environ.get("PDF_DOWNLOAD_MAX_BYTES", str(MAX_UPLOAD_BYTES)))
+PDF_DOWNLOAD_CONNECTIONS = int(os.environ.get("PDF_DOWNLOAD_CONNECTIONS", "20"))
+PDF_STORE_MAX_BYTES = int(os.environ.get("PDF_STORE_MAX_BYTES", str(1024 ** 3)))
+
+# LibreOffice worker pool for /convert-file on Linux
+LIBREOFFICE_WORKERS = int(os.environ.get("LIBREOFFICE_WORKERS", "2"))
+LIBREOFFICE_TIMEOUT = float(os.environ.get("LIBREOFFICE_TIMEOUT", "120"))
+LIBREOFFICE_BASE_PORT = int(os.environ.get("LIBREOFFICE_BASE_PORT", "2002"))
+LIBREOFFICE_WORK_DIR = OUTPUT_DIR / ".libreoffice"
+# Interpreter for uno_bridge.py when `uno` is not importable here; by default the
+# first of LibreOffice's bundled python and the distro python3 that has it
+LIBREOFFICE_PYTHON = os.environ.get("LIBREOFFICE_PYTHON", "")
+UNO_BRIDGE_SCRIPT = Path(__file__).absolute().with_name("uno_bridge.py")
+
+# Batch conversion (/convert-batch): item limit and per-engine concurrency
+BATCH_MAX_ITEMS = int(os.environ.get("BATCH_MAX_ITEMS", "50"))
+BATCH_CONCURRENCY = {
+    "image": int(os.environ.get("BATCH_IMAGE_CONCURRENCY", str(os.cpu_count() or 2))),
+    "office": int(os.environ.get("BATCH_OFFICE_CONCURRENCY", str(LIBREOFFICE_WORKERS))),
+    "web": int(os.environ.get("BATCH_WEB_CONCURRENCY", str(BROWSER_MAX_CONTEXTS))),
+}
+
+# Extraction cache limits
+EXTRACTION_CACHE_MAX_BYTES = int(os.environ.get("EXTRACTION_CACHE_MAX_BYTES", str(2 * 1024 ** 3)))
+EXTRACTION_CACHE_MAX_AGE = float(os.environ.get("EXTRACTION_CACHE_MAX_AGE", str(7 * 24 * 3600)))
+
+# Extraction worker processes and job queue
+EXTRACTION_WORKERS = int(os.environ.get("EXTRACTION_WORKERS", str(max(1, (os.cpu_count() or 2) // 2))))
+EXTRACTION_QUEUE_SIZE = int(os.environ.get("EXTRACTION_QUEUE_SIZE", "16"))
+EXTRACTION_JOB_RETENTION = float(os.environ.get("EXTRACTION_JOB_RETENTION", "3600"))
+
+# Docling page-range sharding: PDFs longer than DOCLING_SHARD_PAGES are split
+# into ranges of that many pages and converted in parallel (0 disables)
+DOCLING_SHARD_PAGES = int(os.environ.get("DOCLING_SHARD_PAGES", "0"))
+DOCLING_SHARD_WORKERS = int(os.environ.get("DOCLING_SHARD_WORKERS", str(os.cpu_count() or 2)))
+# Converters kept per pipeline configuration in one process; each runs one
+# conversion at a time and extra ones are only created under concurrent load
+DOCLING_CONVERTERS_PER_CONFIG = int(os.environ.get("DOCLING_CONVERTERS_PER_CONFIG", "2"))
+# Pages per docling conversion step for progressive (/extract-jobs) extractions;
+# a few pages per step keeps docling's page batching while the first pages still
+# show up early
+DOCLING_STREAM_PAGES = int(os.environ.get("DOCLING_STREAM_PAGES", "4"))
+
+# Extraction profiles (/extract-pdf `profile`): table structure mode (None skips
+# table models) and whether pictures are rendered and saved. Unstructured has no
+# cheaper table mode, so "fast" only differs from "full" in docling.
+EXTRACTION_PROFILES = {
+    "full": {"tables": "accurate", "pictures": True},
+    "fast": {"tables": "fast", "pictures": True},
+    "text-only": {"tables": None, "pictures": False},
+}
+
+# Per-page triage: pages with fewer than PAGE_TRIAGE_MIN_CHARS text-layer
+# characters whose images cover at least PAGE_TRIAGE_MIN_IMAGE_COVERAGE of the
+# page are treated as scanned and sent to OCR; all other pages use the text layer
+PAGE_TRIAGE = os.environ.get("PAGE_TRIAGE", "1") != "0"
+PAGE_TRIAGE_MIN_CHARS = int(os.environ.get("PAGE_TRIAGE_MIN_CHARS", "32"))
+PAGE_TRIAGE_MIN_IMAGE_COVERAGE = float(os.environ.get("PAGE_TRIAGE_MIN_IMAGE_COVERAGE", "0.5"))
+
+# Page offset indexes of extracted text kept in memory for /get-extracted-text?page=
+TEXT_INDEX_CACHE_SIZE = int(os.environ.get("TEXT_INDEX_CACHE_SIZE", "256"))
+
+# Extracted image variants (longest side in px), served by /serve-image?size=
+IMAGE_VARIANT_SIZES = {"thumb": 256, "medium": 1024}
+IMAGE_ENCODE_WORKERS = int(os.environ.get("IMAGE_ENCODE_WORKERS", str(os.cpu_count() or 2)))
+
+# Unstructured hi_res OCR: PDFs are split into ranges of UNSTRUCTURED_OCR_PAGES
+# pages partitioned on UNSTRUCTURED_OCR_WORKERS processes (1 disables it), each
+# Tesseract run limited to UNSTRUCTURED_OCR_THREADS threads (OMP_THREAD_LIMIT)
+UNSTRUCTURED_OCR_PAGES = int(os.environ.get("UNSTRUCTURED_OCR_PAGES", "2"))
+UNSTRUCTURED_OCR_WORKERS = int(os.environ.get("UNSTRUCTURED_OCR_WORKERS", str(os.cpu_count() or 2)))
+UNSTRUCTURED_OCR_THREADS = int(os.environ.get("UNSTRUCTURED_OCR_THREADS", "1"))
+# OCR processes started (with their models) when an Unstructured worker warms up;
+# the pool starts the others as ranges arrive
+UNSTRUCTURED_OCR_WARM = int(os.environ.get("UNSTRUCTURED_OCR_WARM", "1"))
+# Resident Unstructured extraction workers (models loaded at boot), replaced
+# after UNSTRUCTURED_RECYCLE_DOCS documents to bound memory growth
+UNSTRUCTURED_WORKERS = int(os.environ.get("UNSTRUCTURED_WORKERS", "1"))
+UNSTRUCTURED_RECYCLE_DOCS = int(os.environ.get("UNSTRUCTURED_RECYCLE_DOCS", "50"))
+# How long a warmed worker waits at the warm-up barrier for the others before
+# the pool's warm-up is reported as failed
+UNSTRUCTURED_WARMUP_TIMEOUT = float(os.environ.get("UNSTRUCTURED_WARMUP_TIMEOUT", "600"))
+
+if PROMETHEUS_AVAILABLE:
+    REQUEST_SECONDS = Histogram(
+        "allto_pdf_request_duration_seconds", "HTTP request latency", ["method", "route"]
+    )
+    STAGE_SECONDS = Histogram(
+        "allto_pdf_stage_duration_seconds", "Conversion/extraction engine stage latency", ["stage"],
+        buckets=(0.01, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300, 600),
+    )
+
+def observe_stage(name, seconds):
+    if PROMETHEUS_AVAILABLE:
+        STAGE_SECONDS.labels(name).observe(seconds)
+
+# Per-stage wall time of the conversion/extraction engines. Every block is
+# observed in this process's stage histogram and, while a record_stages()
+# block is active, also collected so it can be reported elsewhere (extraction
+# worker processes hand theirs back with the result; see also benchmark.py).
+_stage_recorder = contextvars.ContextVar("stage_recorder", default=None)
+
+@contextmanager
+def timed_stage(name):
+    recorder = _stage_recorder.get()
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        seconds = time.perf_counter() - start
+        observe_stage(name, seconds)
+        if recorder is not None:
+            recorder.setdefault(name, []).append(seconds)
+
+@contextmanager
+def record_stages():
+    """Collect {stage: [seconds, ...]} for the timed_stage blocks run in this context."""
+    recorder = {}
+    token = _stage_recorder.set(recorder)
+    try:
+        yield recorder
+    finally:
+        _stage_recorder.reset(token)
+
 def get_libreoffice_path():
     if os.name == 'nt':
         paths = [
@@ -61,24 +258,689 @@ def get_libreoffice_path():
         # Standard path for LibreOffice on Linux
         return shutil.which('libreoffice') or shutil.which('soffice')
 
-async def auto_scroll(page):
+class BrowserManager:
+    """
+    Shares one long-lived Chromium across /convert-url requests.
+    Every render gets its own isolated browser context, at most `max_contexts`
+    at a time. The browser is replaced after `recycle_after` pages or when it
+    disconnects, and a retired browser is closed once its last context ends.
+    """
+
+    def __init__(self, max_contexts=4, recycle_after=100):
+        self.max_contexts = max_contexts
+        self.recycle_after = recycle_after
+        self._semaphore = asyncio.Semaphore(max_contexts)
+        self._lock = asyncio.Lock()
+        self._playwright = None
+        self._browser = None
+        self._browser_pages = 0
+        self._open_contexts = {}  # browser -> number of open contexts
+        self.launches = 0
+        self.pages_total = 0
+
+    async def start(self):
+        async with self._lock:
+            await self._ensure_browser()
+
+    async def _launch(self):
+        if self._playwright is None:
+            self._playwright = await async_playwright().start()
+        self._browser = await self._playwright.chromium.launch(args=['--no-sandbox']) # Sandbox disabled for Docker
+        self._browser_pages = 0
+        self.launches += 1
+        print(f"[*] Chromium launched (launch #{self.launches})")
+
+    async def _ensure_browser(self):
+        browser = self._browser
+        if browser is not None and browser.is_connected() and self._browser_pages < self.recycle_after:
+            return browser
+        if browser is not None:
+            reason = "crashed" if not browser.is_connected() else f"served {self._browser_pages} pages"
+            print(f"[*] Recycling Chromium ({reason})")
+        await self._launch()
+        if browser is not None and not self._open_contexts.get(browser):
+            await self._close_browser(browser)
+        return self._browser
+
+    async def _acquire(self):
+        async with self._lock:
+            browser = await self._ensure_browser()
+            self._browser_pages += 1
+            self.pages_total += 1
+            self._open_contexts[browser] = self._open_contexts.get(browser, 0) + 1
+            return browser
+
+    async def _release(self, browser):
+        async with self._lock:
+            self._open_contexts[browser] -= 1
+            if self._open_contexts[browser] == 0:
+                del self._open_contexts[browser]
+                if browser is not self._browser:
+                    await self._close_browser(browser)
+
+    async def _close_browser(self, browser):
+        try:
+            await browser.close()
+        except Exception as e:
+            print(f"[!] Error closing Chromium: {e}")
+
+    @asynccontextmanager
+    async def new_context(self, **context_options):
+        """Yield an isolated browser context from the pool."""
+        async with self._semaphore:
+            browser = await self._acquire()
+            context = None
+            try:
+                context = await browser.new_context(**context_options)
+                yield context
+            finally:
+                if context is not None:
+                    try:
+                        await context.close()
+                    except Exception:
+                        pass
+                await self._release(browser)
+
+    async def stop(self):
+        async with self._lock:
+            browsers = set(self._open_contexts)
+            if self._browser is not None:
+                browsers.add(self._browser)
+            for browser in browsers:
+                await self._close_browser(browser)
+            self._browser = None
+            self._open_contexts.clear()
+            if self._playwright is not None:
+                await self._playwright.stop()
+                self._playwright = None
+        print("[*] Chromium pool stopped")
+
+    def stats(self):
+        return {
+            "running": self._browser is not None and self._browser.is_connected(),
+            "launches": self.launches,
+            "pages_total": self.pages_total,
+            "pages_on_current_browser": self._browser_pages,
+            "open_contexts": sum(self._open_contexts.values()),
+            "max_contexts": self.max_contexts,
+            "recycle_after": self.recycle_after,
+        }
+
+browser_manager = BrowserManager(BROWSER_MAX_CONTEXTS, BROWSER_RECYCLE_PAGES)
+
+@app.on_event("startup")
+async def start_browser_manager():
+    try:
+        await browser_manager.start()
+    except Exception as e:
+        # Not fatal: the pool retries the launch on the first /convert-url
+        print(f"[!] Chromium could not be started: {e}")
+
+@app.on_event("shutdown")
+async def stop_browser_manager():
+    await browser_manager.stop()
+
+class PendingRequests:
+    """Tracks a page's in-flight requests so rendering can wait for the network to go quiet."""
+
+    # Never "finish" while the page is open
+    IGNORED_TYPES = {"websocket", "eventsource", "media"}
+
+    def __init__(self, page):
+        self.inflight = set()
+        self.last_change = time.monotonic()
+        page.on("request", self._started)
+        page.on("requestfinished", self._finished)
+        page.on("requestfailed", self._finished)
+
+    def _started(self, request):
+        if request.resource_type not in self.IGNORED_TYPES:
+            self.inflight.add(request)
+            self.last_change = time.monotonic()
+
+    def _finished(self, request):
+        if request in self.inflight:
+            self.inflight.discard(request)
+            self.last_change = time.monotonic()
+
+    async def wait_idle(self, quiet, deadline):
+        while time.monotonic() < deadline:
+            if not self.inflight and time.monotonic() - self.last_change >= quiet:
+                return True
+            await asyncio.sleep(0.05)
+        return False
+
+# Resource classes that RENDER_BLOCK can name: Playwright resource types and/or
+# third-party hosts (a host also matches its subdomains)
+RENDER_BLOCKABLE = {
+    "analytics": {"hosts": {
+        "google-analytics.com", "googletagmanager.com", "analytics.google.com", "segment.io", "segment.com",
+        "mixpanel.com", "hotjar.com", "clarity.ms", "plausible.io", "scorecardresearch.com", "nr-data.net",
+    }},
+    "ads": {"hosts": {
+        "doubleclick.net", "googlesyndication.com", "googleadservices.com", "adservice.google.com",
+        "amazon-adsystem.com", "adnxs.com", "criteo.com", "taboola.com", "outbrain.com", "pubmatic.com",
+    }},
+    "media": {"types": {"media"}},
+    "fonts": {"types": {"font"}},
+    "images": {"types": {"image"}},
+}
+
+class RenderAssetCache:
+    """
+    Intercepts the requests of every /convert-url render: blocks the configured
+    resource classes and serves static assets (scripts, stylesheets, fonts,
+    images) from an on-disk HTTP cache shared by all renders. Freshness follows
+    Cache-Control max-age, or `default_ttl` without one; no-store, no-cache,
+    private and cookie-setting responses are never stored. Responses with Vary
+    are stored per value of the request headers it lists (Vary: * is not
+    stored). Least recently used entries are evicted once the cache holds more
+    than `max_bytes`.
+    """
+
+    CACHEABLE_TYPES = {"script", "stylesheet", "font", "image"}
+    # The body handed back to Chromium is already decoded, so framing headers go
+    DROPPED_HEADERS = {"content-encoding", "content-length", "transfer-encoding", "connection", "set-cookie"}
+
+    def __init__(self, root, max_bytes, default_ttl, block):
+        self.root = Path(root)
+        self.max_bytes = max_bytes
+        self.default_ttl = default_ttl
+        self.blocked_classes = []
+        self.blocked_types = set()
+        self.blocked_hosts = set()
+        for name in block:
+            if name not in RENDER_BLOCKABLE:
+                print(f"[!] Unknown RENDER_BLOCK class '{name}', use one of: {', '.join(RENDER_BLOCKABLE)}")
+                continue
+            self.blocked_classes.append(name)
+            self.blocked_types |= RENDER_BLOCKABLE[name].get("types", set())
+            self.blocked_hosts |= RENDER_BLOCKABLE[name].get("hosts", set())
+        self.entries = {}  # key -> {"size", "last_used"}
+        self.vary = {}  # URL key -> request headers named by the stored response's Vary
+        self._lock = threading.Lock()
+        self.total_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.stored = 0
+        self.evictions = 0
+        self.blocked = 0
+        self.bytes_saved = 0
+
+    @property
+    def enabled(self):
+        return self.max_bytes > 0
+
+    def load(self):
+        """Index the entries left on disk by earlier runs."""
+        if not self.enabled:
+            return
+        self.root.mkdir(parents=True, exist_ok=True)
+        with self._lock:
+            for path in self.root.iterdir():
+                # dot-files are interrupted writes
+                if path.name.startswith("."):
+                    path.unlink(missing_ok=True)
+                    continue
+                if path.suffix != ".body":
+                    continue
+                if not path.with_suffix(".json").exists():
+                    path.unlink(missing_ok=True)
+                    continue
+                try:
+                    with open(path.with_suffix(".json"), "r", encoding="utf-8") as f:
+                        meta = json.load(f)
+                except (OSError, ValueError):
+                    path.unlink(missing_ok=True)
+                    continue
+                if meta.get("vary"):
+                    self.vary[self._key(meta["url"])] = meta["vary"]
+                stat = path.stat()
+                self.entries[path.stem] = {"size": stat.st_size, "last_used": stat.st_mtime}
+            self.total_bytes = sum(entry["size"] for entry in self.entries.values())
+            self._evict()
+        print(f"[*] Render asset cache: {len(self.entries)} entries, {self.total_bytes / 1024 ** 2:.1f} MB")
+
+    def blocked_domain(self, host):
+        """The RENDER_BLOCKABLE host that `host` is, or is a subdomain of, if any."""
+        parts = (host or "").split(".")
+        for i in range(len(parts) - 1):
+            domain = ".".join(parts[i:])
+            if domain in self.blocked_hosts:
+                return domain
+        return None
+
+    def is_blocked(self, request):
+        # The page being rendered (and any frame navigation) is never blocked
+        if request.resource_type == "document" or request.is_navigation_request():
+            return False
+        if request.resource_type in self.blocked_types:
+            return True
+        domain = self.blocked_domain(urlsplit(request.url).hostname)
+        if domain is None:
+            return False
+        # Hosts are only blocked as third parties: a page on segment.com keeps its own assets
+        try:
+            page_host = urlsplit(request.frame.page.main_frame.url).hostname or ""
+        except Exception:
+            page_host = ""
+        return page_host != domain and not page_host.endswith("." + domain)
+
+    def freshness(self, headers):
+        """Seconds a response may be served from the cache (0 means do not store it)."""
+        directives = {}
+        for directive in headers.get("cache-control", "").lower().split(","):
+            name, _, value = directive.strip().partition("=")
+            directives[name] = value.strip('"')
+        if {"no-store", "no-cache", "private"} & directives.keys() or "set-cookie" in headers:
+            return 0
+        for name in ("s-maxage", "max-age"):
+            if directives.get(name, "").isdigit():
+                return int(directives[name])
+        return self.default_ttl
+
+    @staticmethod
+    def vary_headers(headers):
+        """Request headers a response varies on, or None for Vary: *."""
+        names = {name.strip().lower() for name in headers.get("vary", "").split(",") if name.strip()}
+        if "*" in names:
+            return None
+        # Bodies are stored decoded, so the encoding negotiated does not matter
+        names.discard("accept-encoding")
+        return sorted(names)
+
+    def _key(self, url, vary=(), request_headers=None):
+        if vary:
+            url += "".join(f"\n{name}: {(request_headers or {}).get(name, '')}" for name in vary)
+        return hashlib.sha256(url.encode("utf-8")).hexdigest()
+
+    def _variant_key(self, url, request_headers):
+        return self._key(url, self.vary.get(self._key(url), ()), request_headers)
+
+    def _unlink(self, key):
+        (self.root / f"{key}.body").unlink(missing_ok=True)
+        (self.root / f"{key}.json").unlink(missing_ok=True)
+        entry = self.entries.pop(key, None)
+        if entry is not None:
+            self.total_bytes -= entry["size"]
+
+    def get(self, url, request_headers=None):
+        """Return (meta, body) for a fresh cached response to this request, or None."""
+        with self._lock:
+            key = self._variant_key(url, request_headers)
+            if key not in self.entries:
+                return None
+        try:
+            with open(self.root / f"{key}.json", "r", encoding="utf-8") as f:
+                meta = json.load(f)
+            body = (self.root / f"{key}.body").read_bytes()
+        except (OSError, ValueError):
+            meta = None
+        with self._lock:
+            if meta is None or meta["expires_at"] <= time.time():
+                self._unlink(key)
+                return None
+            if key in self.entries:
+                self.entries[key]["last_used"] = time.time()
+        return meta, body
+
+    def put(self, url, status, headers, body, ttl, request_headers=None, vary=()):
+        # A single asset may not take over the cache
+        if len(body) > self.max_bytes // 10:
+            return
+        key = self._key(url, vary, request_headers)
+        body_path = self.root / f"{key}.body"
+        meta_path = self.root / f"{key}.json"
+        tmp_suffix = uuid.uuid4().hex
+        tmp_body = self.root / f".{key}.{tmp_suffix}.body"
+        tmp_meta = self.root / f".{key}.{tmp_suffix}.json"
+        try:
+            self.root.mkdir(parents=True, exist_ok=True)
+            tmp_body.write_bytes(body)
+            with open(tmp_meta, "w", encoding="utf-8") as f:
+                json.dump({"url": url, "status": status, "headers": headers, "vary": vary,
+                           "expires_at": time.time() + ttl}, f)
+            with self._lock:
+                os.replace(tmp_body, body_path)
+                os.replace(tmp_meta, meta_path)
+                if vary:
+                    self.vary[self._key(url)] = vary
+                else:
+                    self.vary.pop(self._key(url), None)
+                previous = self.entries.get(key)
+                self.total_bytes += len(body) - (previous["size"] if previous else 0)
+                self.entries[key] = {"size": len(body), "last_used": time.time()}
+                self.stored += 1
+                self._evict()
+        except OSError as e:
+            print(f"[!] Could not cache render asset {url}: {e}")
+            tmp_body.unlink(missing_ok=True)
+            tmp_meta.unlink(missing_ok=True)
+
+    def _evict(self):
+        if self.total_bytes <= self.max_bytes:
+            return
+        for key, _ in sorted(self.entries.items(), key=lambda item: item[1]["last_used"]):
+            if self.total_bytes <= self.max_bytes:
+                break
+            self._unlink(key)
+            self.evictions += 1
+
+    async def handle(self, route):
+        request = route.request
+        try:
+            if self.is_blocked(request):
+                self.blocked += 1
+                await route.abort("blockedbyclient")
+                return
+            if (not self.enabled or request.method != "GET"
+                    or request.resource_type not in self.CACHEABLE_TYPES
+                    or not request.url.startswith(("http://", "https://"))):
+                await route.continue_()
+                return
+
+            loop = asyncio.get_event_loop()
+            request_headers = await request.all_headers()
+            cached = await loop.run_in_executor(None, self.get, request.url, request_headers)
+            if cached is not None:
+                meta, body = cached
+                self.hits += 1
+                self.bytes_saved += len(body)
+                await route.fulfill(status=meta["status"], headers=meta["headers"], body=body)
+                return
+
+            self.misses += 1
+            response = await route.fetch()
+            body = await response.body()
+            headers = {k: v for k, v in response.headers.items() if k.lower() not in self.DROPPED_HEADERS}
+            ttl = self.freshness(response.headers)
+            vary = self.vary_headers(response.headers)
+            if response.status == 200 and ttl > 0 and vary is not None:
+                await loop.run_in_executor(
+                    None, self.put, request.url, response.status, headers, body, ttl, request_headers, vary
+                )
+            await route.fulfill(status=response.status, headers=headers, body=body)
+        except Exception as e:
+            # Page closed mid-request or the fetch failed; let Chromium see a failed request
+            print(f"[!] Asset interception failed for {request.url[:100]}: {e}")
+            try:
+                await route.abort("failed")
+            except Exception:
+                pass
+
+    async def attach(self, context):
+        """Route all requests of a browser context through the cache and block list."""
+        if self.enabled or self.blocked_classes:
+            await context.route("**/*", self.handle)
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        with self._lock:
+            entries = len(self.entries)
+        return {
+            "enabled": self.enabled,
+            "blocked_classes": self.blocked_classes,
+            "blocked_requests": self.blocked,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / lookups, 3) if lookups else 0.0,
+            "bytes_saved": self.bytes_saved,
+            "stored": self.stored,
+            "evictions": self.evictions,
+            "entries": entries,
+            "bytes": self.total_bytes,
+            "max_bytes": self.max_bytes,
+        }
+
+# A dot-dir, so the extraction cache's eviction scan skips it
+render_assets = RenderAssetCache(
+    CACHE_DIR / ".render_assets", RENDER_ASSET_CACHE_MAX_BYTES, RENDER_ASSET_DEFAULT_TTL, RENDER_BLOCK
+)
+
+@app.on_event("startup")
+async def load_render_assets():
+    loop = asyncio.get_event_loop()
+    await loop.run_in_executor(None, render_assets.load)
+
+async def auto_scroll(page, pending=None, timeout=None):
+    """
+    Get lazy content loaded before printing: switch lazy images/iframes to
+    eager, scroll one viewport per animation frame pair so IntersectionObservers
+    fire, then wait for images, fonts and (with `pending`) the network to settle.
+    Everything is bounded by one deadline, so the cost follows the content rather
+    than the page length.
+    """
+    deadline = time.monotonic() + (RENDER_READY_TIMEOUT if timeout is None else timeout)
     await page.evaluate("""
-        async () => {
-            await new Promise((resolve) => {
-                let totalHeight = 0;
-                let distance = 100;
-                let timer = setInterval(() => {
-                    let scrollHeight = document.body.scrollHeight;
-                    window.scrollBy(0, distance);
-                    totalHeight += distance;
-                    if(totalHeight >= scrollHeight){
-                        clearInterval(timer);
-                        resolve();
-                    }
-                }, 100);
+        () => {
+            document.querySelectorAll('img[loading="lazy"], iframe[loading="lazy"]').forEach(el => {
+                el.loading = 'eager';
+            });
+            // data-src style lazy loaders
+            document.querySelectorAll('img[data-src], img[data-srcset], source[data-srcset]').forEach(el => {
+                const src = el.getAttribute('src');
+                if (el.dataset.src && (!src || src.startsWith('data:'))) el.src = el.dataset.src;
+                if (el.dataset.srcset && !el.getAttribute('srcset')) el.srcset = el.dataset.srcset;
             });
         }
     """)
+    
+    steps = 0
+    while time.monotonic() < deadline:
+        steps += 1
+        at_bottom = await page.evaluate("""
+            async () => {
+                const before = window.scrollY;
+                window.scrollBy(0, window.innerHeight);
+                await new Promise(r => requestAnimationFrame(() => requestAnimationFrame(r)));
+                const root = document.scrollingElement || document.documentElement;
+                return window.scrollY === before || window.scrollY + window.innerHeight >= root.scrollHeight - 1;
+            }
+        """)
+        if at_bottom:
+            break
+    await page.evaluate("() => window.scrollTo(0, 0)")
+    
+    remaining_ms = max(0, int((deadline - time.monotonic()) * 1000))
+    incomplete = await page.evaluate("""
+        async (timeoutMs) => {
+            const waiting = Array.from(document.images).filter(img => !img.complete).map(img => new Promise(r => {
+                img.addEventListener('load', r, {once: true});
+                img.addEventListener('error', r, {once: true});
+            }));
+            await Promise.race([
+                Promise.all([...waiting, document.fonts ? document.fonts.ready : null]),
+                new Promise(r => setTimeout(r, timeoutMs)),
+            ]);
+            return Array.from(document.images).filter(img => !img.complete).length;
+        }
+    """, remaining_ms)
+    network_idle = await pending.wait_idle(RENDER_NETWORK_QUIET, deadline) if pending is not None else True
+    
+    if incomplete or not network_idle:
+        print(f"[!] Render deadline reached after {steps} scroll steps "
+              f"({incomplete} images still loading, {len(pending.inflight) if pending else 0} requests pending)")
+
+class PdfDownloader:
+    """
+    Fetches direct-PDF URLs for /convert-url over one pooled keep-alive client.
+    Bodies are streamed to disk and capped at `max_bytes`; the first bytes must
+    carry a PDF header, otherwise the caller falls back to browser rendering.
+    Responses with an ETag or Last-Modified are kept in a local store (LRU,
+    bounded by `store_max_bytes`), and repeat URLs are revalidated with a
+    conditional request so an unchanged PDF is copied from the store.
+    """
+
+    def __init__(self, store_dir, max_bytes, store_max_bytes, max_connections):
+        self.store_dir = Path(store_dir)
+        self.max_bytes = max_bytes
+        self.store_max_bytes = store_max_bytes
+        self.max_connections = max_connections
+        self._client = None
+        self._lock = threading.Lock()
+        self.downloads = 0
+        self.revalidated = 0
+        self.not_pdf = 0
+        self.rejected = 0
+        self.bytes_downloaded = 0
+        self.bytes_saved = 0
+
+    def client(self):
+        if self._client is None:
+            self._client = httpx.AsyncClient(
+                follow_redirects=True,
+                timeout=60.0,
+                limits=httpx.Limits(
+                    max_connections=self.max_connections,
+                    max_keepalive_connections=self.max_connections,
+                    keepalive_expiry=60.0,
+                ),
+            )
+        return self._client
+
+    async def close(self):
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    def _paths(self, url):
+        key = hashlib.sha256(url.encode("utf-8")).hexdigest()
+        return self.store_dir / f"{key}.pdf", self.store_dir / f"{key}.json"
+
+    def _read_validators(self, url):
+        pdf_path, meta_path = self._paths(url)
+        try:
+            with open(meta_path, "r", encoding="utf-8") as f:
+                meta = json.load(f)
+        except (OSError, ValueError):
+            return None
+        return meta if pdf_path.exists() else None
+
+    def _restore(self, url, output_path):
+        pdf_path, _ = self._paths(url)
+        try:
+            shutil.copyfile(pdf_path, output_path)
+            os.utime(pdf_path)  # LRU order for eviction
+        except OSError as e:
+            print(f"[!] Could not restore stored PDF: {e}")
+            return False
+        return True
+
+    def _store(self, url, output_path, validators):
+        pdf_path, meta_path = self._paths(url)
+        try:
+            self.store_dir.mkdir(parents=True, exist_ok=True)
+            tmp_path = pdf_path.with_name(f".{uuid.uuid4().hex}.pdf")
+            shutil.copyfile(output_path, tmp_path)
+            with self._lock:
+                os.replace(tmp_path, pdf_path)
+                with open(meta_path, "w", encoding="utf-8") as f:
+                    json.dump(dict(validators, url=url), f)
+                self._evict()
+        except OSError as e:
+            print(f"[!] Could not store downloaded PDF: {e}")
+
+    def _evict(self):
+        entries = [(p.stat().st_mtime, p.stat().st_size, p) for p in self.store_dir.glob("*.pdf")]
+        total = sum(size for _, size, _ in entries)
+        for _, size, pdf_path in sorted(entries):
+            if total <= self.store_max_bytes:
+                break
+            pdf_path.unlink(missing_ok=True)
+            pdf_path.with_suffix(".json").unlink(missing_ok=True)
+            total -= size
+
+    async def download(self, url, output_path):
+        """
+        Write the PDF at `url` to `output_path`. Returns False when the URL does
+        not serve a PDF; raises for HTTP errors and bodies over the size cap.
+        """
+        loop = asyncio.get_event_loop()
+        stored = await loop.run_in_executor(None, self._read_validators, url)
+        headers = {}
+        if stored:
+            if stored.get("etag"):
+                headers["If-None-Match"] = stored["etag"]
+            if stored.get("last_modified"):
+                headers["If-Modified-Since"] = stored["last_modified"]
+
+        async with self.client().stream("GET", url, headers=headers) as response:
+            if response.status_code == 304 and stored:
+                if await loop.run_in_executor(None, self._restore, url, output_path):
+                    self.revalidated += 1
+                    self.bytes_saved += os.path.getsize(output_path)
+                    return True
+                # Stored copy vanished; fetch it again without validators
+                return await self._download_fresh(url, output_path)
+            response.raise_for_status()
+            return await self._save_response(url, response, output_path)
+
+    async def _download_fresh(self, url, output_path):
+        async with self.client().stream("GET", url) as response:
+            response.raise_for_status()
+            return await self._save_response(url, response, output_path)
+
+    async def _save_response(self, url, response, output_path):
+        declared = response.headers.get("content-length")
+        if declared and declared.isdigit() and int(declared) > self.max_bytes:
+            self.rejected += 1
+            raise ValueError(f"PDF exceeds the {self.max_bytes // 1024 ** 2} MB download limit")
+
+        loop = asyncio.get_event_loop()
+        size = 0
+        out = None
+        try:
+            async for chunk in response.aiter_bytes(UPLOAD_CHUNK_BYTES):
+                if out is None:
+                    # Sniff the body rather than trusting the URL or Content-Type
+                    if b"%PDF-" not in chunk[:1024]:
+                        self.not_pdf += 1
+                        return False
+                    out = await loop.run_in_executor(None, open, output_path, "wb")
+                size += len(chunk)
+                if size > self.max_bytes:
+                    self.rejected += 1
+                    raise ValueError(f"PDF exceeds the {self.max_bytes // 1024 ** 2} MB download limit")
+                await loop.run_in_executor(None, out.write, chunk)
+        except BaseException:
+            if out is not None:
+                await loop.run_in_executor(None, out.close)
+                if os.path.exists(output_path): os.remove(output_path)
+            raise
+        if out is None:
+            self.not_pdf += 1
+            return False
+        await loop.run_in_executor(None, out.close)
+        self.downloads += 1
+        self.bytes_downloaded += size
+
+        validators = {
+            "etag": response.headers.get("etag"),
+            "last_modified": response.headers.get("last-modified"),
+        }
+        if (validators["etag"] or validators["last_modified"]) and size <= self.store_max_bytes // 10:
+            await loop.run_in_executor(None, self._store, url, output_path, validators)
+        return True
+
+    def stats(self):
+        return {
+            "downloads": self.downloads,
+            "revalidated": self.revalidated,
+            "not_pdf": self.not_pdf,
+            "rejected": self.rejected,
+            "bytes_downloaded": self.bytes_downloaded,
+            "bytes_saved": self.bytes_saved,
+            "max_bytes": self.max_bytes,
+            "store_max_bytes": self.store_max_bytes,
+        }
+
+pdf_downloader = PdfDownloader(
+    CACHE_DIR / ".pdf_downloads", PDF_DOWNLOAD_MAX_BYTES, PDF_STORE_MAX_BYTES, PDF_DOWNLOAD_CONNECTIONS
+)
+
+@app.on_event("shutdown")
+async def close_pdf_downloader():
+    await pdf_downloader.close()
 
 async def convert_web_to_pdf(url, output_path):
     print(f"[*] Converting URL: {url}")
@@ -86,29 +948,24 @@ async def convert_web_to_pdf(url, output_path):
         # Check if URL is a direct PDF file
         if url.lower().endswith('.pdf') or '/pdf/' in url.lower():
             print(f"[*] Detected PDF URL, downloading directly...")
-            async with httpx.AsyncClient(follow_redirects=True, timeout=60.0) as client:
-                response = await client.get(url)
-                response.raise_for_status()
-                
-                # Check content type to confirm it's a PDF
-                content_type = response.headers.get('content-type', '').lower()
-                if 'application/pdf' in content_type or url.lower().endswith('.pdf'):
-                    with open(output_path, 'wb') as f:
-                        f.write(response.content)
-                    print(f"[V] PDF downloaded successfully to {output_path}")
-                    return True
-                else:
-                    print(f"[!] URL doesn't return PDF content, falling back to browser rendering...")
+            with timed_stage("download"):
+                downloaded = await pdf_downloader.download(url, output_path)
+            if downloaded:
+                print(f"[V] PDF downloaded successfully to {output_path}")
+                return True
+            print(f"[!] URL doesn't return PDF content, falling back to browser rendering...")
         
         # Regular webpage to PDF conversion
-        async with async_playwright() as p:
-            browser = await p.chromium.launch(args=['--no-sandbox']) # Sandbox disabled for Docker
-            page = await browser.new_page()
-            await page.goto(url, wait_until="domcontentloaded", timeout=60000)
-            await auto_scroll(page)
-            await asyncio.sleep(2)
-            await page.pdf(path=str(output_path), format="A4", print_background=True)
-            await browser.close()
+        async with browser_manager.new_context() as context:
+            await render_assets.attach(context)
+            page = await context.new_page()
+            pending = PendingRequests(page)
+            with timed_stage("page_load"):
+                await page.goto(url, wait_until="domcontentloaded", timeout=60000)
+            with timed_stage("scroll"):
+                await auto_scroll(page, pending)
+            with timed_stage("pdf_render"):
+                await page.pdf(path=str(output_path), format="A4", print_background=True)
         return True
     except Exception as e:
         print(f"[X] Web Error: {e}")
@@ -141,148 +998,1838 @@ def windows_office_to_pdf(input_path, output_path, ext):
     finally: pythoncom.CoUninitialize()
     return False
 
-async def convert_file_to_pdf(input_path, output_path):
-    input_path = Path(input_path)
-    output_path = Path(output_path)
-    ext = input_path.suffix.lower()
-    try:
-        if ext in ['.jpg', '.jpeg', '.png', '.bmp', '.tiff', '.webp']:
-            image = Image.open(input_path)
-            if image.mode in ("RGBA", "P", "LA"): image = image.convert("RGB")
-            image.save(output_path, "PDF", resolution=100.0)
-            return True
-        
-        # Windows logic
-        if os.name == 'nt':
+async def find_uno_python(libo):
+    """Return an interpreter that can run uno_bridge.py, or None."""
+    if LIBREOFFICE_PYTHON:
+        candidates = [LIBREOFFICE_PYTHON]
+    else:
+        candidates = [str(Path(libo).resolve().parent / "python"), "/usr/bin/python3", shutil.which("python3")]
+    for candidate in candidates:
+        if not candidate or not os.path.exists(candidate):
+            continue
+        try:
+            process = await asyncio.create_subprocess_exec(
+                candidate, "-c", "import uno",
+                stdout=asyncio.subprocess.DEVNULL, stderr=asyncio.subprocess.DEVNULL
+            )
+            if await process.wait() == 0:
+                return candidate
+        except OSError:
+            continue
+    return None
+
+class LibreOfficeWorker:
+    """
+    One LibreOffice instance with its own user profile and output directory.
+    With a UNO bridge the instance stays resident behind a socket listener and
+    documents are converted through it, either in-process (`bridge` is None) or
+    by running uno_bridge.py under the `bridge` interpreter. Without a bridge
+    each conversion runs a one-shot soffice on the private profile.
+    """
+
+    def __init__(self, index, base_dir, port):
+        self.index = index
+        self.port = port
+        self.profile_dir = (base_dir / f"worker_{index}" / "profile").absolute()
+        self.out_dir = (base_dir / f"worker_{index}" / "out").absolute()
+        self.process = None
+        self.conversions = 0
+        self.restarts = 0
+
+    @property
+    def resident(self):
+        return self.process is not None and self.process.returncode is None
+
+    async def start(self, libo, resident=True):
+        self.profile_dir.mkdir(parents=True, exist_ok=True)
+        self.out_dir.mkdir(parents=True, exist_ok=True)
+        if not resident:
+            return
+        self.process = await asyncio.create_subprocess_exec(
+            libo, f"-env:UserInstallation={self.profile_dir.as_uri()}",
+            '--headless', '--invisible', '--nologo', '--norestore', '--nodefault',
+            f"--accept=socket,host=127.0.0.1,port={self.port};urp;StarOffice.ComponentContext",
+            stdout=asyncio.subprocess.DEVNULL, stderr=asyncio.subprocess.DEVNULL
+        )
+        # Wait for the UNO listener to come up (first start also creates the profile)
+        loop = asyncio.get_event_loop()
+        deadline = loop.time() + 60
+        while loop.time() < deadline:
+            if self.process.returncode is not None:
+                break
+            try:
+                _, writer = await asyncio.open_connection("127.0.0.1", self.port)
+                writer.close()
+                print(f"[*] LibreOffice worker {self.index} listening on port {self.port}")
+                return
+            except OSError:
+                await asyncio.sleep(0.5)
+        print(f"[!] LibreOffice worker {self.index} did not start, falling back to one-shot conversions")
+        await self.stop()
+
+    async def stop(self):
+        if self.resident:
+            self.process.kill()
+            await self.process.wait()
+        self.process = None
+
+    async def restart(self, libo, resident=True):
+        self.restarts += 1
+        print(f"[*] Restarting LibreOffice worker {self.index}")
+        await self.stop()
+        await self.start(libo, resident)
+
+    async def convert(self, libo, input_path, bridge=None):
+        """Convert into this worker's private output dir and return the generated PDF path."""
+        input_path = Path(input_path)
+        generated = self.out_dir / (input_path.stem + ".pdf")
+        if generated.exists():
+            os.remove(generated)
+        self.conversions += 1
+        if self.resident and bridge is None:
             loop = asyncio.get_event_loop()
-            return await loop.run_in_executor(None, windows_office_to_pdf, str(input_path), str(output_path), ext)
-        
-        # Linux/Docker logic (LibreOffice)
+            await loop.run_in_executor(None, uno_convert_to_pdf, self.port, str(input_path), str(generated))
+        elif self.resident:
+            process = await asyncio.create_subprocess_exec(
+                bridge, str(UNO_BRIDGE_SCRIPT), str(self.port), str(input_path), str(generated),
+                stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.PIPE
+            )
+            try:
+                _, stderr = await process.communicate()
+            except asyncio.CancelledError:
+                process.kill()
+                raise
+            if process.returncode != 0:
+                raise RuntimeError(stderr.decode(errors="replace").strip() or f"uno_bridge exited with {process.returncode}")
         else:
-            libo = get_libreoffice_path()
-            if not libo:
-                print("[X] Error: LibreOffice not found in PATH")
-                return False
-            
-            print(f"[*] Running LibreOffice: {libo} for {input_path}")
             process = await asyncio.create_subprocess_exec(
-                libo, '--headless', '--convert-to', 'pdf', 
-                str(input_path), '--outdir', str(OUTPUT_DIR),
+                libo, f"-env:UserInstallation={self.profile_dir.as_uri()}",
+                '--headless', '--convert-to', 'pdf',
+                str(input_path), '--outdir', str(self.out_dir),
                 stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.PIPE
             )
-            stdout, stderr = await process.communicate()
-            
+            try:
+                stdout, stderr = await process.communicate()
+            except asyncio.CancelledError:
+                process.kill()
+                raise
             if stdout: print(f"[LibO Out]: {stdout.decode()}")
             if stderr: print(f"[LibO Err]: {stderr.decode()}")
+        return generated
 
-            gen = OUTPUT_DIR / (input_path.stem + ".pdf")
-            if gen.exists():
-                if gen != output_path:
-                    if output_path.exists(): os.remove(output_path)
-                    os.rename(gen, output_path)
-                print(f"[V] Successfully converted to: {output_path}")
+class LibreOfficePool:
+    """Dispatches conversions to idle LibreOffice workers and restarts hung ones."""
+
+    def __init__(self, size, base_dir, base_port, timeout):
+        self.workers = [LibreOfficeWorker(i, base_dir, base_port + i) for i in range(size)]
+        self.timeout = timeout
+        self._idle = None
+        self._libo = None
+        self._bridge = None
+        self.uno = False
+        self._start_lock = asyncio.Lock()
+        self.timeouts = 0
+
+    async def start(self):
+        async with self._start_lock:
+            if self._idle is not None:
                 return True
+            self._libo = get_libreoffice_path()
+            if not self._libo:
+                return False
+            if LIBREOFFICE_UNO_AVAILABLE:
+                self.uno = True
             else:
+                self._bridge = await find_uno_python(self._libo)
+                self.uno = self._bridge is not None
+            if self.uno:
+                print(f"[*] LibreOffice UNO bridge: {self._bridge or 'in-process'}")
+            else:
+                print("[!] LibreOffice UNO bridge unavailable (no `uno` module here or in LIBREOFFICE_PYTHON); "
+                      "pool running in fallback mode with a one-shot soffice per conversion")
+            self._idle = asyncio.Queue()
+            for worker in self.workers:
+                await worker.start(self._libo, self.uno)
+                self._idle.put_nowait(worker)
+            return True
+
+    async def convert(self, input_path, output_path):
+        if not await self.start():
+            print("[X] Error: LibreOffice not found in PATH")
+            return False
+        output_path = Path(output_path)
+        worker = await self._idle.get()
+        try:
+            print(f"[*] LibreOffice worker {worker.index} converting {input_path}")
+            try:
+                with timed_stage("libreoffice"):
+                    generated = await asyncio.wait_for(worker.convert(self._libo, input_path, self._bridge), self.timeout)
+            except asyncio.TimeoutError:
+                self.timeouts += 1
+                print(f"[X] LibreOffice worker {worker.index} timed out after {self.timeout}s")
+                await worker.restart(self._libo, self.uno)
+                return False
+            except Exception as e:
+                print(f"[X] LibreOffice worker {worker.index} failed: {e}")
+                if worker.process is not None and not worker.resident:
+                    await worker.restart(self._libo, self.uno)
+                return False
+            if not generated.exists():
                 print(f"[X] LibreOffice failed to generate PDF. Check logs above.")
                 return False
-    except Exception as e:
-        print(f"System Error: {e}")
-        return False
+            if output_path.exists(): os.remove(output_path)
+            shutil.move(str(generated), str(output_path))
+            return True
+        finally:
+            self._idle.put_nowait(worker)
+
+    async def stop(self):
+        for worker in self.workers:
+            await worker.stop()
+
+    def stats(self):
+        return {
+            "workers": len(self.workers),
+            "idle": self._idle.qsize() if self._idle is not None else 0,
+            "uno": self.uno,
+            "bridge": (self._bridge or "in-process") if self.uno else None,
+            "resident": sum(1 for w in self.workers if w.resident),
+            "conversions": sum(w.conversions for w in self.workers),
+            "restarts": sum(w.restarts for w in self.workers),
+            "timeouts": self.timeouts,
+        }
 
-async def cleanup_files(input_p=None, output_p=None):
-    await asyncio.sleep(60)
+libreoffice_pool = LibreOfficePool(LIBREOFFICE_WORKERS, LIBREOFFICE_WORK_DIR, LIBREOFFICE_BASE_PORT, LIBREOFFICE_TIMEOUT)
+
+@app.on_event("startup")
+async def start_libreoffice_pool():
+    if os.name == 'nt':
+        return
     try:
-        if input_p and os.path.exists(input_p): os.remove(input_p)
-        if output_p and os.path.exists(output_p): os.remove(output_p)
-    except: pass
+        await libreoffice_pool.start()
+    except Exception as e:
+        print(f"[!] LibreOffice pool could not be started: {e}")
 
-def extract_from_pdf(pdf_path, extract_id):
-    """
-    Extract text, tables, and images from PDF using docling.
-    Works on Windows without requiring poppler/tesseract installation.
-    """
+@app.on_event("shutdown")
+async def stop_libreoffice_pool():
+    await libreoffice_pool.stop()
+
+IMAGE_EXTENSIONS = ['.jpg', '.jpeg', '.png', '.bmp', '.tiff', '.webp']
+
+def image_to_pdf(input_path, output_path):
+    image = Image.open(input_path)
+    if image.mode in ("RGBA", "P", "LA"): image = image.convert("RGB")
+    image.save(output_path, "PDF", resolution=100.0)
+    return True
+
+async def convert_file_to_pdf(input_path, output_path):
+    input_path = Path(input_path)
+    output_path = Path(output_path)
+    ext = input_path.suffix.lower()
     try:
-        pdf_path = Path(pdf_path)
-        output_base = EXTRACTED_DIR / extract_id
-        output_base.mkdir(exist_ok=True)
-        
-        # Setup directories
-        text_dir = output_base / "text"
-        tables_dir = output_base / "tables"
-        images_dir = output_base / "images"
-        text_dir.mkdir(exist_ok=True)
-        tables_dir.mkdir(exist_ok=True)
-        images_dir.mkdir(exist_ok=True)
+        if ext in IMAGE_EXTENSIONS:
+            # Pillow encoding is CPU-bound; keep it off the event loop
+            loop = asyncio.get_event_loop()
+            with timed_stage("image_to_pdf"):
+                return await loop.run_in_executor(None, image_to_pdf, input_path, output_path)
         
-        # Configure docling pipeline
-        pipeline_options = PdfPipelineOptions()
-        pipeline_options.do_ocr = False  # Faster for digital PDFs
-        pipeline_options.do_table_structure = True
-        pipeline_options.generate_picture_images = True
+        # Windows logic
+        if os.name == 'nt':
+            loop = asyncio.get_event_loop()
+            with timed_stage("office_convert"):
+                return await loop.run_in_executor(None, windows_office_to_pdf, str(input_path), str(output_path), ext)
         
-        # Initialize converter
-        doc_converter = DocumentConverter(
+        # Linux/Docker logic (LibreOffice worker pool)
+        else:
+            success = await libreoffice_pool.convert(input_path, output_path)
+            if success:
+                print(f"[V] Successfully converted to: {output_path}")
+            return success
+    except Exception as e:
+        print(f"System Error: {e}")
+        return False
+
+# Docling converters load layout/table models on first use, so keep them per
+# pipeline configuration for the lifetime of the process instead of per request.
+_docling_converters = {}
+_docling_converters_lock = threading.Lock()
+
+def create_docling_converter(do_ocr, do_table_structure, generate_picture_images, table_mode):
+    pipeline_options = PdfPipelineOptions()
+    pipeline_options.do_ocr = do_ocr
+    pipeline_options.do_table_structure = do_table_structure
+    pipeline_options.generate_picture_images = generate_picture_images
+    pipeline_options.table_structure_options.mode = (
+        TableFormerMode.FAST if table_mode == "fast" else TableFormerMode.ACCURATE
+    )
+    with timed_stage("model_init"):
+        converter = DocumentConverter(
             format_options={
                 InputFormat.PDF: PdfFormatOption(pipeline_options=pipeline_options)
             }
         )
-        
-        print(f"[*] Extracting from: {pdf_path}")
-        result = doc_converter.convert(str(pdf_path))
-        doc = result.document
-        
-        # Extract text to markdown
-        md_content = doc.export_to_markdown()
-        text_file = text_dir / "extracted_text.md"
-        with open(text_file, "w", encoding="utf-8") as f:
-            f.write(md_content)
-        print(f"[✓] Text saved: {text_file}")
-        
-        # Extract text to plain text using export_to_text() method
+        # Load the models now rather than inside the first convert()
+        if hasattr(converter, "initialize_pipeline"):
+            converter.initialize_pipeline(InputFormat.PDF)
+    print(f"[*] Docling converter created for ocr={do_ocr}, tables={do_table_structure} ({table_mode}), "
+          f"pictures={generate_picture_images}")
+    return converter
+
+class DoclingConverterEntry:
+    """
+    Converters for one pipeline configuration. A converter runs one conversion
+    at a time (model inference inside docling is not guaranteed to be
+    thread-safe), so concurrent conversions check out separate converters, up
+    to `size`. A converter is only created when a conversion finds none idle,
+    and is initialized outside the pool's lock.
+    """
+
+    def __init__(self, key, size):
+        self.key = key
+        self.size = max(1, size)
+        self.converters = 0
+        self._idle = []  # (converter, warm)
+        self._available = threading.Condition()
+        self.cold_runs = 0
+        self.warm_runs = 0
+
+    def checkout(self):
+        """Return an idle (converter, warm) pair, creating a converter if the pool has room."""
+        with self._available:
+            while not self._idle and self.converters >= self.size:
+                self._available.wait()
+            if self._idle:
+                return self._idle.pop()
+            self.converters += 1
         try:
-            plain_text = doc.export_to_text()
-        except AttributeError:
-            # Fallback: derive plain text from markdown by removing markdown syntax
-            plain_text = re.sub(r'[#*`\[\]()]', '', md_content)
-        
-        txt_file = text_dir / "extracted_text.txt"
-        with open(txt_file, "w", encoding="utf-8") as f:
-            f.write(plain_text)
-        print(f"[✓] Plain text saved: {txt_file}")
-        
-        # Extract tables to CSV
-        table_count = 0
-        if hasattr(doc, 'tables') and doc.tables:
-            for i, table in enumerate(doc.tables):
+            return create_docling_converter(*self.key), False
+        except BaseException:
+            with self._available:
+                self.converters -= 1
+                self._available.notify()
+            raise
+
+    def checkin(self, converter, warm):
+        with self._available:
+            self._idle.append((converter, warm))
+            self._available.notify()
+
+    def record_run(self, warm):
+        with self._available:
+            if warm:
+                self.warm_runs += 1
+            else:
+                self.cold_runs += 1
+
+def get_docling_converter(do_ocr=False, do_table_structure=True, generate_picture_images=True, table_mode="accurate"):
+    """Return the converter pool for a pipeline configuration, creating it once."""
+    key = (do_ocr, do_table_structure, generate_picture_images, table_mode)
+    with _docling_converters_lock:
+        entry = _docling_converters.get(key)
+        if entry is None:
+            entry = DoclingConverterEntry(key, DOCLING_CONVERTERS_PER_CONFIG)
+            _docling_converters[key] = entry
+        return entry
+
+def run_docling_convert(source, page_range=None, **pipeline_config):
+    """Convert a document on a pooled converter, recording whether it ran warm or cold."""
+    entry = get_docling_converter(**pipeline_config)
+    convert_kwargs = {"page_range": page_range} if page_range else {}
+    converter, warm = entry.checkout()
+    converted = False
+    try:
+        with timed_stage("convert"):
+            result = converter.convert(source, **convert_kwargs)
+        converted = True
+    finally:
+        entry.checkin(converter, warm or converted)
+    entry.record_run(warm)
+    return result
+
+def docling_converter_stats():
+    with _docling_converters_lock:
+        items = list(_docling_converters.items())
+    return [
+        {
+            "do_ocr": key[0],
+            "do_table_structure": key[1],
+            "generate_picture_images": key[2],
+            "table_mode": key[3],
+            "converters": entry.converters,
+            "cold_runs": entry.cold_runs,
+            "warm_runs": entry.warm_runs,
+        }
+        for key, entry in items
+    ]
+
+def engine_version(package):
+    try:
+        return metadata.version(package)
+    except metadata.PackageNotFoundError:
+        return "unknown"
+
+def _link_or_copy(src, dst):
+    try:
+        os.link(src, dst)
+    except OSError:
+        shutil.copy2(src, dst)
+
+class ExtractionCache:
+    """
+    Content-addressed store of finished extraction trees.
+    Entries are keyed by (file sha256, method, options, engine version) and
+    evicted by age and by least-recent use once the total size exceeds `max_bytes`.
+    Options that only change how results are delivered are not part of the key.
+    """
+
+    DELIVERY_OPTIONS = ("stream_pages",)
+
+    def __init__(self, root, max_bytes, max_age):
+        self.root = Path(root)
+        self.max_bytes = max_bytes
+        self.max_age = max_age
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def key(self, file_hash, method, options):
+        engine = "unstructured" if method == "unstructured" else "docling"
+        payload = json.dumps({
+            "sha256": file_hash,
+            "method": method,
+            "options": {name: value for name, value in options.items() if name not in self.DELIVERY_OPTIONS},
+            "engine_version": engine_version(engine),
+        }, sort_keys=True)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def _read_meta(self, entry_dir):
+        with open(entry_dir / "entry.json", "r", encoding="utf-8") as f:
+            return json.load(f)
+
+    def _write_meta(self, entry_dir, meta):
+        with open(entry_dir / "entry.json", "w", encoding="utf-8") as f:
+            json.dump(meta, f)
+
+    def restore(self, key, extract_id):
+        """Materialize a cached tree as EXTRACTED_DIR/extract_id and return its summary, or None on a miss."""
+        entry_dir = self.root / key
+        with self._lock:
+            try:
+                meta = self._read_meta(entry_dir)
+            except (OSError, ValueError):
+                self.misses += 1
+                return None
+            if time.time() - meta["created_at"] > self.max_age:
+                shutil.rmtree(entry_dir, ignore_errors=True)
+                self.evictions += 1
+                self.misses += 1
+                return None
+            output_base = EXTRACTED_DIR / extract_id
+            try:
+                shutil.copytree(entry_dir / "tree", output_base, copy_function=_link_or_copy)
+            except OSError as e:
+                print(f"[!] Could not restore cached extraction: {e}")
+                shutil.rmtree(output_base, ignore_errors=True)
+                self.misses += 1
+                return None
+            meta["last_used"] = time.time()
+            self._write_meta(entry_dir, meta)
+            self.hits += 1
+
+        # summary.txt carries the extraction ID, so give this copy its own file
+        summary = dict(meta["summary"], extracted_at=extract_id)
+        summary_file = output_base / "summary.txt"
+        if summary_file.exists():
+            summary_text = summary_file.read_text(encoding="utf-8").replace(meta["extract_id"], extract_id)
+            os.remove(summary_file)
+            summary_file.write_text(summary_text, encoding="utf-8")
+        # The replayed done event must carry this extraction's summary too
+        events_file = output_base / ExtractionEvents.FILENAME
+        if events_file.exists():
+            events = [json.loads(line) for line in events_file.read_text(encoding="utf-8").splitlines() if line]
+            os.remove(events_file)
+            with open(events_file, "w", encoding="utf-8") as f:
+                for event in events:
+                    if event.get("type") == "done":
+                        event["summary"] = summary
+                    f.write(json.dumps(event, default=str) + "\n")
+        return summary
+
+    def store(self, key, output_base, extract_id, summary):
+        entry_dir = self.root / key
+        tmp_dir = self.root / f".{key}.{extract_id}.tmp"
+        try:
+            shutil.copytree(output_base, tmp_dir / "tree", copy_function=_link_or_copy)
+            size = sum(f.stat().st_size for f in (tmp_dir / "tree").rglob("*") if f.is_file())
+            now = time.time()
+            self._write_meta(tmp_dir, {
+                "extract_id": extract_id,
+                "summary": summary,
+                "size": size,
+                "created_at": now,
+                "last_used": now,
+            })
+            with self._lock:
+                if entry_dir.exists():
+                    shutil.rmtree(entry_dir, ignore_errors=True)
+                os.rename(tmp_dir, entry_dir)
+                self._evict()
+        except Exception as e:
+            print(f"[!] Could not cache extraction {extract_id}: {e}")
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+
+    def _evict(self):
+        entries = []
+        now = time.time()
+        for entry_dir in self.root.iterdir():
+            if not entry_dir.is_dir() or entry_dir.name.startswith("."):
+                continue
+            try:
+                meta = self._read_meta(entry_dir)
+            except (OSError, ValueError):
+                shutil.rmtree(entry_dir, ignore_errors=True)
+                continue
+            if now - meta["created_at"] > self.max_age:
+                shutil.rmtree(entry_dir, ignore_errors=True)
+                self.evictions += 1
+                continue
+            entries.append((meta["last_used"], meta["size"], entry_dir))
+
+        total = sum(size for _, size, _ in entries)
+        for _, size, entry_dir in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            shutil.rmtree(entry_dir, ignore_errors=True)
+            total -= size
+            self.evictions += 1
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / lookups, 3) if lookups else 0.0,
+            "evictions": self.evictions,
+            "max_bytes": self.max_bytes,
+            "max_age": self.max_age,
+        }
+
+extraction_cache = ExtractionCache(CACHE_DIR, EXTRACTION_CACHE_MAX_BYTES, EXTRACTION_CACHE_MAX_AGE)
+
+class IngestStats:
+    def __init__(self):
+        self.uploads = 0
+        self.bytes = 0
+        self.seconds = 0.0
+        self.rejected = 0
+
+    def stats(self):
+        return {
+            "uploads": self.uploads,
+            "bytes": self.bytes,
+            "rejected": self.rejected,
+            "throughput_mb_s": round(self.bytes / self.seconds / 1024 ** 2, 2) if self.seconds else 0.0,
+        }
+
+ingest_stats = IngestStats()
+
+# Room for multipart boundaries, part headers and the other form fields
+UPLOAD_FORM_OVERHEAD = 1024 ** 2
+
+def request_body_limit(path):
+    """Largest request body accepted for `path`: one upload, or a full batch for /convert-batch."""
+    uploads = BATCH_MAX_ITEMS if path == "/convert-batch" else 1
+    return uploads * MAX_UPLOAD_BYTES + UPLOAD_FORM_OVERHEAD
+
+@app.middleware("http")
+async def reject_oversized_uploads(request: Request, call_next):
+    """
+    Refuse oversized bodies from their Content-Length before reading any of it.
+    receive_upload_form enforces the same limit on bodies sent without a length.
+    """
+    length = request.headers.get("content-length", "")
+    if request.method == "POST" and length.isdigit() and int(length) > request_body_limit(request.url.path):
+        ingest_stats.rejected += 1
+        return JSONResponse(
+            {"detail": f"Request exceeds the {MAX_UPLOAD_BYTES // 1024 ** 2} MB upload limit"}, status_code=413
+        )
+    return await call_next(request)
+
+class ReceivedUpload:
+    """A file part of a multipart request, written to `path` as it arrived."""
+
+    def __init__(self, filename, path):
+        self.filename = filename
+        self.path = Path(path)
+        self.sha256 = None
+        self.size = 0
+        self.error = None
+
+async def receive_upload_form(request, dest_for, require_pdf=False, max_bytes=None, per_file_errors=False):
+    """
+    Parse a multipart/form-data body while it arrives, streaming every file part
+    straight to `dest_for(field, filename)` and hashing it on the fly, so uploads
+    are never spooled and copied. The request body limit (also for chunked bodies),
+    the per-file `max_bytes` (413) and, with `require_pdf`, the PDF header check
+    (400) apply as the bytes come in. `dest_for` may raise HTTPException to refuse
+    a part. With `per_file_errors` a refused file keeps the error on its
+    ReceivedUpload and the rest of the form is still read.
+    Returns a FormData of the fields (str) and files (ReceivedUpload) in order.
+    """
+    if max_bytes is None:
+        max_bytes = MAX_UPLOAD_BYTES
+    too_large = f"File exceeds the {max_bytes // 1024 ** 2} MB upload limit"
+    content_type, params = parse_options_header(request.headers.get("content-type", ""))
+    if content_type != b"multipart/form-data" or not params.get(b"boundary"):
+        raise HTTPException(status_code=400, detail="Expected a multipart/form-data body")
+    body_limit = request_body_limit(request.url.path)
+
+    # The parser calls back synchronously; events are handled after each write
+    events = []
+    header = [b"", b""]
+    headers = {}
+
+    def on_header_end():
+        headers[header[0].lower()] = header[1]
+        header[0] = header[1] = b""
+
+    parser = MultipartParser(params[b"boundary"], {
+        "on_part_begin": headers.clear,
+        "on_header_field": lambda data, start, end: header.__setitem__(0, header[0] + data[start:end]),
+        "on_header_value": lambda data, start, end: header.__setitem__(1, header[1] + data[start:end]),
+        "on_header_end": on_header_end,
+        "on_headers_finished": lambda: events.append(("headers", dict(headers))),
+        "on_part_data": lambda data, start, end: events.append(("data", data[start:end])),
+        "on_part_end": lambda: events.append(("end", None)),
+    })
+
+    loop = asyncio.get_event_loop()
+    parts = []
+    written = []
+    part = None  # {"name", "value"} for a field; adds "upload", "out", "digest", "head", "started" for a file
+
+    def refuse(upload, status_code, detail):
+        if not per_file_errors:
+            raise HTTPException(status_code=status_code, detail=detail)
+        ingest_stats.rejected += 1
+        upload.error = detail
+
+    async def discard(part):
+        if part.get("out") is not None:
+            await loop.run_in_executor(None, part["out"].close)
+            part["out"] = None
+            if part["upload"].path.exists(): os.remove(part["upload"].path)
+
+    async def write(part, data):
+        upload = part["upload"]
+        if upload.error:
+            return
+        if part["head"] is not None:
+            # Hold the first bytes back until there are enough to look for the PDF header
+            part["head"] += data
+            if len(part["head"]) < 1024 and data:
+                return
+            data, part["head"] = part["head"], None
+            if require_pdf and b"%PDF-" not in data[:1024]:
+                refuse(upload, 400, "Uploaded file is not a PDF")
+                await discard(part)
+                return
+        upload.size += len(data)
+        if upload.size > max_bytes:
+            refuse(upload, 413, too_large)
+            await discard(part)
+            return
+        part["digest"].update(data)
+        await loop.run_in_executor(None, part["out"].write, data)
+
+    async def handle(event, data):
+        nonlocal part
+        if event == "headers":
+            _, disposition = parse_options_header(data.get(b"content-disposition", b""))
+            name = disposition.get(b"name", b"").decode("utf-8", "replace")
+            filename = disposition.get(b"filename")
+            part = {"name": name, "value": bytearray()}
+            if filename is not None:
+                # Browsers send an empty file part when no file was chosen
+                part["value"] = None
+                filename = filename.decode("utf-8", "replace")
+                if filename:
+                    upload = ReceivedUpload(filename, dest_for(name, filename))
+                    out = await loop.run_in_executor(None, open, upload.path, "wb")
+                    written.append(upload.path)
+                    part.update(upload=upload, out=out, digest=hashlib.sha256(), head=b"" if require_pdf else None,
+                                started=time.perf_counter())
+        elif event == "data" and "upload" in part:
+            await write(part, data)
+        elif event == "data" and part["value"] is not None:
+            part["value"] += data
+            if len(part["value"]) > UPLOAD_FORM_OVERHEAD:
+                raise HTTPException(status_code=413, detail=f"Form field {part['name']} is too large")
+        elif event == "end" and "upload" in part:
+            upload = part["upload"]
+            if part["head"] is not None:
+                await write(part, b"")
+            if part["out"] is not None:
+                await loop.run_in_executor(None, part["out"].close)
+                part["out"] = None
+                upload.sha256 = part["digest"].hexdigest()
+                elapsed = time.perf_counter() - part["started"]
+                ingest_stats.uploads += 1
+                ingest_stats.bytes += upload.size
+                ingest_stats.seconds += elapsed
+                print(f"[*] Ingested {upload.filename}: {upload.size / 1024 ** 2:.1f} MB in {elapsed:.2f}s")
+            parts.append((part["name"], upload))
+            part = None
+        elif event == "end":
+            if part["value"] is not None:
+                parts.append((part["name"], part["value"].decode("utf-8", "replace")))
+            part = None
+
+    received = 0
+    try:
+        async for chunk in request.stream():
+            received += len(chunk)
+            if received > body_limit:
+                raise HTTPException(
+                    status_code=413, detail=f"Request exceeds the {MAX_UPLOAD_BYTES // 1024 ** 2} MB upload limit"
+                )
+            try:
+                parser.write(chunk)
+            except FormParserError as e:
+                raise HTTPException(status_code=400, detail=f"Malformed multipart body: {e}")
+            for event, data in events:
+                await handle(event, data)
+            events.clear()
+        parser.finalize()
+        for event, data in events:
+            await handle(event, data)
+    except BaseException as e:
+        if isinstance(e, HTTPException):
+            ingest_stats.rejected += 1
+        if part is not None:
+            await discard(part)
+        for path in written:
+            if path.exists(): os.remove(path)
+        raise
+    return FormData(parts)
+
+# Tables are stored once as Parquet; these exports are rendered on first request
+TABLE_EXPORT_FORMATS = ("csv", "xlsx", "html")
+_table_meta_key = b"all_to_pdf"
+
+def write_canonical_table(df, path, formats, source_html=None):
+    """
+    Store a table as a single Parquet file. Column labels (which may be
+    multi-level or duplicated), the export formats it offers and any source
+    HTML travel in the schema metadata.
+    """
+    columns = [list(c) if isinstance(c, tuple) else c for c in df.columns]
+    data = df.copy()
+    data.columns = [f"c{i}" for i in range(len(df.columns))]
+    try:
+        table = pa.Table.from_pandas(data, preserve_index=False)
+    except (pa.ArrowInvalid, pa.ArrowTypeError):
+        # Mixed-type columns: keep the values as text
+        data = data.apply(lambda col: col.map(lambda v: None if pd.isna(v) else str(v)))
+        table = pa.Table.from_pandas(data, preserve_index=False)
+    meta = {"columns": columns, "formats": list(formats), "source_html": source_html}
+    schema_metadata = dict(table.schema.metadata or {})
+    schema_metadata[_table_meta_key] = json.dumps(meta, default=str).encode("utf-8")
+    pq.write_table(table.replace_schema_metadata(schema_metadata), path)
+
+def canonical_table_meta(path):
+    return json.loads(pq.read_schema(path).metadata[_table_meta_key])
+
+def read_canonical_table(path):
+    table = pq.read_table(path)
+    meta = json.loads(table.schema.metadata[_table_meta_key])
+    df = table.to_pandas()
+    columns = meta["columns"]
+    if any(isinstance(c, list) for c in columns):
+        df.columns = pd.MultiIndex.from_tuples([tuple(c) if isinstance(c, list) else (c,) for c in columns])
+    else:
+        df.columns = columns
+    return df, meta
+
+def materialize_table(tables_dir, filename):
+    """
+    Return the path of a table export such as table_3.xlsx, rendering it from
+    table_3.parquet and keeping it on first request. Returns None if neither
+    the export nor a canonical table that offers it exists.
+    """
+    tables_dir = Path(tables_dir)
+    path = tables_dir / filename
+    if path.exists():
+        return path
+    stem, _, fmt = filename.rpartition(".")
+    source = tables_dir / f"{stem}.parquet"
+    if fmt not in TABLE_EXPORT_FORMATS or not source.exists():
+        return None
+    df, meta = read_canonical_table(source)
+    if fmt not in meta["formats"]:
+        return None
+
+    # Render under a temporary name so concurrent requests never see a partial file
+    tmp_path = tables_dir / f".{uuid.uuid4().hex}.{filename}"
+    try:
+        if fmt == "csv":
+            df.to_csv(tmp_path, index=False, encoding="utf-8-sig")
+        elif fmt == "xlsx":
+            if isinstance(df.columns, pd.MultiIndex):
+                # Excel export needs a flat header without the index
+                df.columns = [" / ".join(str(level) for level in col) for col in df.columns]
+            df.to_excel(tmp_path, index=False, engine='openpyxl')
+        else:
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                f.write(meta["source_html"] or df.to_html(index=False))
+        os.replace(tmp_path, path)
+    finally:
+        if tmp_path.exists():
+            os.remove(tmp_path)
+    janitor.add_bytes(tables_dir.parent, path.stat().st_size)
+    return path
+
+def list_tables(tables_dir):
+    """Table names for the viewer: CSV (canonical or already rendered), else HTML-only tables."""
+    tables_dir = Path(tables_dir)
+    csv_files = {f.name for f in tables_dir.glob("*.csv")}
+    csv_files.update(f"{f.stem}.csv" for f in tables_dir.glob("*.parquet"))
+    # Get HTML files only if no CSV with same base name exists
+    html_files = sorted([f.name for f in tables_dir.glob("*.html")])
+    
+    # Combine, prioritize CSV over HTML for same table
+    tables = sorted(csv_files)
+    seen_bases = {csv.rsplit('.', 1)[0] for csv in tables}
+    for html in html_files:
+        base = html.rsplit('.', 1)[0]
+        if base not in seen_bases:
+            tables.append(html)
+    return tables
+
+# Members that are already compressed are stored as-is instead of re-deflated
+ZIP_STORED_EXTENSIONS = {'.png', '.jpg', '.jpeg', '.webp', '.gif', '.xlsx', '.docx', '.pptx', '.zip', '.pdf'}
+
+class _ZipStreamBuffer:
+    """Write-only, non-seekable sink for zipfile; bytes are drained as they are produced."""
+
+    def __init__(self):
+        self._chunks = []
+
+    def write(self, data):
+        self._chunks.append(bytes(data))
+        return len(data)
+
+    def flush(self):
+        pass
+
+    def drain(self):
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+def iter_zip_members(base_dir):
+    """
+    Yield (path, arcname) pairs for an extraction ZIP. Canonical Parquet tables
+    are expanded into their export formats, rendered as they are reached.
+    """
+    base_dir = Path(base_dir)
+    seen = set()
+    for root, dirs, files in os.walk(base_dir):
+        # dot-dirs hold derived data such as image variants
+        dirs[:] = sorted(d for d in dirs if not d.startswith("."))
+        for file_name in sorted(files):
+            # progress log and temporary renders are not results
+            if file_name == "events.ndjson" or file_name.startswith("."):
+                continue
+            file_path = Path(root) / file_name
+            if file_path.suffix == ".parquet":
+                members = []
+                for fmt in canonical_table_meta(file_path)["formats"]:
+                    members.append(materialize_table(file_path.parent, f"{file_path.stem}.{fmt}"))
+            else:
+                members = [file_path]
+            for member in members:
+                arcname = member.relative_to(base_dir)
+                if arcname not in seen:
+                    seen.add(arcname)
+                    yield member, arcname
+
+def iter_zip_stream(base_dir, chunk_size=UPLOAD_CHUNK_BYTES):
+    """Yield a ZIP archive of `base_dir` piece by piece, without writing it to disk."""
+    buffer = _ZipStreamBuffer()
+    with zipfile.ZipFile(buffer, 'w') as zipf:
+        for file_path, arcname in iter_zip_members(base_dir):
+            zinfo = zipfile.ZipInfo.from_file(file_path, arcname)
+            if file_path.suffix.lower() in ZIP_STORED_EXTENSIONS:
+                zinfo.compress_type = zipfile.ZIP_STORED
+            else:
+                zinfo.compress_type = zipfile.ZIP_DEFLATED
+            with open(file_path, 'rb') as src, zipf.open(zinfo, 'w') as dest:
+                for chunk in iter(lambda: src.read(chunk_size), b""):
+                    dest.write(chunk)
+                    data = buffer.drain()
+                    if data:
+                        yield data
+            data = buffer.drain()
+            if data:
+                yield data
+    # Central directory
+    yield buffer.drain()
+
+def zip_stream_response(base_dir, filename, headers=None):
+    disposition = f"attachment; filename*=utf-8''{quote(filename)}"
+    return StreamingResponse(
+        iter_zip_stream(base_dir),
+        media_type='application/zip',
+        headers=dict(headers or {}, **{"Content-Disposition": disposition})
+    )
+
+def path_size(path):
+    path = Path(path)
+    if path.is_file():
+        return path.stat().st_size
+    return sum(f.stat().st_size for f in path.rglob("*") if f.is_file())
+
+class ArtifactJanitor:
+    """
+    Single background sweeper for temporary artifacts.
+    Every tracked file or directory has an expiry time in an index persisted
+    next to the artifacts, so pending deletions survive restarts. Expired
+    artifacts are deleted in bulk each sweep, and when the tracked total exceeds
+    `max_bytes` the least recently accessed ones are evicted early. Sizes are
+    measured once after an artifact is (re)tracked, i.e. when it is finished, and
+    files derived later are added with add_bytes(), so a sweep never walks the
+    artifacts. Artifacts are registered as pending when they are created and
+    left alone until tracked; pending ones a previous run never got to track
+    expire `orphan_ttl` after startup. Only paths in the index are ever
+    deleted, so anything else in the managed dirs (such as the sample
+    extractions shipped in extracted/) is left alone.
+    """
+
+    def __init__(self, managed_dirs, index_path, interval, max_bytes, orphan_ttl):
+        self.managed_dirs = [Path(d) for d in managed_dirs]
+        self.index_path = Path(index_path)
+        self.interval = interval
+        self.max_bytes = max_bytes
+        self.orphan_ttl = orphan_ttl
+        self.entries = {}  # path -> {"expires_at", "last_access", "size"[, "pending"]}; size None until measured
+        self._lock = threading.Lock()
+        self._task = None
+        self._delete_callbacks = []
+        self.deleted = 0
+        self.evicted = 0
+        self.orphans_recovered = 0
+        self.tracked_bytes = 0
+
+    def track(self, path, ttl):
+        """Schedule `path` for deletion `ttl` seconds from now; its size is measured on the next sweep."""
+        now = time.time()
+        with self._lock:
+            entry = self.entries.setdefault(str(path), {})
+            entry.pop("pending", None)
+            entry["expires_at"] = now + ttl
+            entry["last_access"] = now
+            entry["size"] = None
+
+    def register(self, path):
+        """Record an artifact as it is created; it is kept until track() gives it a TTL."""
+        with self._lock:
+            self.entries.setdefault(str(path), {
+                "pending": True, "expires_at": None, "last_access": time.time(), "size": None
+            })
+
+    def add_bytes(self, path, size):
+        """Account for `size` bytes written into tracked artifact `path` after it was measured."""
+        with self._lock:
+            entry = self.entries.get(str(path))
+            if entry is not None and entry.get("size") is not None:
+                entry["size"] += size
+
+    def on_delete(self, callback):
+        """Call `callback(path)` (from the sweeper thread) after an artifact is deleted."""
+        self._delete_callbacks.append(callback)
+
+    def touch(self, path):
+        """Record an access so LRU eviction keeps recently used artifacts longest."""
+        with self._lock:
+            entry = self.entries.get(str(path))
+            if entry is not None:
+                entry["last_access"] = time.time()
+
+    def _load(self):
+        try:
+            with open(self.index_path, "r", encoding="utf-8") as f:
+                self.entries = json.load(f)
+        except (OSError, ValueError):
+            self.entries = {}
+
+    def _save(self):
+        with self._lock:
+            data = json.dumps(self.entries)
+        tmp_path = self.index_path.with_suffix(".tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.write(data)
+        os.replace(tmp_path, self.index_path)
+
+    def recover(self):
+        """
+        Reload the index left by the previous run. Artifacts that run registered
+        but never tracked are orphans of requests it did not finish.
+        """
+        self._load()
+        now = time.time()
+        with self._lock:
+            for path, entry in list(self.entries.items()):
+                if not os.path.exists(path):
+                    del self.entries[path]
+                elif entry.pop("pending", False):
+                    entry["expires_at"] = now + self.orphan_ttl
+                    self.orphans_recovered += 1
+        if self.orphans_recovered:
+            print(f"[*] Janitor recovered {self.orphans_recovered} orphaned artifacts")
+
+    def _delete(self, path):
+        try:
+            if os.path.isdir(path):
+                shutil.rmtree(path)
+            elif os.path.exists(path):
+                os.remove(path)
+        except OSError as e:
+            print(f"[!] Janitor could not delete {path}: {e}")
+            return False
+        return True
+
+    def sweep(self):
+        now = time.time()
+        with self._lock:
+            # Pending artifacts are still being written
+            snapshot = {path: entry for path, entry in self.entries.items() if not entry.get("pending")}
+
+        expired = [path for path, entry in snapshot.items() if entry["expires_at"] <= now]
+        live = []
+        measured = {}  # path -> (size, expires_at it was measured for)
+        for path, entry in snapshot.items():
+            if entry["expires_at"] <= now:
+                continue
+            size = entry.get("size")
+            if size is None:
                 try:
-                    df = table.export_to_dataframe(doc)
-                    if not df.empty:
-                        csv_path = tables_dir / f"table_{i+1}.csv"
-                        df.to_csv(csv_path, index=False, encoding="utf-8-sig")
-                        
-                        # Also save as Excel for better viewing
-                        excel_path = tables_dir / f"table_{i+1}.xlsx"
-                        df.to_excel(excel_path, index=False, engine='openpyxl')
-                        table_count += 1
-                        print(f"[✓] Table {i+1} saved")
+                    size = path_size(path)
+                except OSError:
+                    continue
+                measured[path] = (size, entry["expires_at"])
+            live.append((entry["last_access"], size, path))
+
+        total = sum(size for _, size, _ in live)
+        evict = []
+        for _, size, path in sorted(live):
+            if total <= self.max_bytes:
+                break
+            evict.append(path)
+            total -= size
+
+        removed = [path for path in expired + evict if self._delete(path)]
+        with self._lock:
+            for path in removed:
+                self.entries.pop(path, None)
+            for path, (size, expires_at) in measured.items():
+                entry = self.entries.get(path)
+                # Re-tracked meanwhile: leave it for the next sweep to measure
+                if entry is not None and entry["expires_at"] == expires_at:
+                    entry["size"] = size
+        for path in removed:
+            for callback in self._delete_callbacks:
+                try:
+                    callback(path)
                 except Exception as e:
-                    print(f"[!] Error extracting table {i+1}: {e}")
+                    print(f"[!] Janitor delete callback failed for {path}: {e}")
+        self.deleted += len(removed)
+        self.evicted += len(evict)
+        self.tracked_bytes = total
+        if removed:
+            print(f"[*] Janitor removed {len(removed)} artifacts ({len(evict)} evicted for disk quota)")
+        self._save()
+
+    async def _run(self):
+        loop = asyncio.get_event_loop()
+        while True:
+            try:
+                await loop.run_in_executor(None, self.sweep)
+            except Exception as e:
+                print(f"[!] Janitor sweep failed: {e}")
+            await asyncio.sleep(self.interval)
+
+    async def start(self):
+        loop = asyncio.get_event_loop()
+        await loop.run_in_executor(None, self.recover)
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+        self._save()
+
+    def stats(self):
+        with self._lock:
+            tracked = len(self.entries)
+        return {
+            "tracked": tracked,
+            "tracked_bytes": self.tracked_bytes,
+            "max_bytes": self.max_bytes,
+            "deleted": self.deleted,
+            "evicted": self.evicted,
+            "orphans_recovered": self.orphans_recovered,
+        }
+
+janitor = ArtifactJanitor(
+    [UPLOAD_DIR, OUTPUT_DIR, EXTRACTED_DIR],
+    EXTRACTED_DIR / ".artifacts.json",
+    JANITOR_INTERVAL, ARTIFACT_MAX_BYTES, ORPHAN_TTL
+)
+
+@app.on_event("startup")
+async def start_janitor():
+    await janitor.start()
+
+class SearchIndex:
+    """
+    Embedded full-text index (SQLite FTS5) of finished extractions at page
+    granularity. Extractions are added as they finish, from the page texts
+    stored in their derived data, and removed when the janitor deletes them.
+    """
+
+    # unicode61 strips accents but đ is a letter of its own; fold it so "dong" finds "đồng".
+    # Only the FTS index gets the folded text: snippets are cut from the original in
+    # page_texts, and folding keeps token positions, so highlights still line up.
+    FOLD = str.maketrans({"đ": "d", "Đ": "D"})
+    SCHEMA_VERSION = 2
+
+    def __init__(self, path):
+        self.path = Path(path)
+        self._lock = threading.Lock()
+        self._conn = None
+        self.available = True
+        self.queries = 0
+
+    def _connect(self):
+        # Called with the lock held; one connection shared by the executor threads
+        if self._conn is None:
+            conn = sqlite3.connect(str(self.path), check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            if conn.execute("PRAGMA user_version").fetchone()[0] != self.SCHEMA_VERSION:
+                # Older layout: rebuild, sync() reindexes from the stored page texts
+                conn.executescript("DROP TABLE IF EXISTS pages; DROP TABLE IF EXISTS page_texts; DROP TABLE IF EXISTS extractions;")
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS extractions (
+                    extract_id TEXT PRIMARY KEY, filename TEXT, page_count INTEGER, indexed_at REAL
+                )
+            """)
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS page_texts (
+                    id INTEGER PRIMARY KEY, text TEXT, extract_id TEXT, page_no INTEGER
+                )
+            """)
+            conn.execute("CREATE INDEX IF NOT EXISTS page_texts_extract ON page_texts (extract_id)")
+            conn.execute("""
+                CREATE VIRTUAL TABLE IF NOT EXISTS pages USING fts5(
+                    text, content = 'page_texts', content_rowid = 'id',
+                    tokenize = 'unicode61 remove_diacritics 2'
+                )
+            """)
+            conn.execute(f"PRAGMA user_version = {self.SCHEMA_VERSION}")
+            conn.commit()
+            self._conn = conn
+        return self._conn
+
+    def _run(self, fn):
+        if not self.available:
+            return None
+        with self._lock:
+            try:
+                return fn(self._connect())
+            except sqlite3.OperationalError as e:
+                if self._conn is None:
+                    # Typically an SQLite build without FTS5
+                    print(f"[!] Search index unavailable: {e}")
+                    self.available = False
+                    return None
+                raise
+
+    def add(self, extract_id, filename, output_base):
+        """(Re)index an extraction from its stored page texts."""
+        try:
+            pages = read_page_texts(output_base)
+        except (OSError, ValueError) as e:
+            print(f"[!] Could not index extraction {extract_id}: {e}")
+            return
+
+        def write(conn):
+            with conn:
+                self._delete_pages(conn, extract_id)
+                for page in pages:
+                    if not page["text"].strip():
+                        continue
+                    rowid = conn.execute(
+                        "INSERT INTO page_texts (text, extract_id, page_no) VALUES (?, ?, ?)",
+                        (page["text"], extract_id, page["page"])
+                    ).lastrowid
+                    conn.execute(
+                        "INSERT INTO pages (rowid, text) VALUES (?, ?)", (rowid, page["text"].translate(self.FOLD))
+                    )
+                conn.execute(
+                    "INSERT OR REPLACE INTO extractions VALUES (?, ?, ?, ?)",
+                    (extract_id, filename, len(pages), time.time())
+                )
+
+        with timed_stage("search_index"):
+            self._run(write)
+
+    def _delete_pages(self, conn, extract_id):
+        # External-content FTS5 rows are removed by replaying the indexed (folded) text
+        rows = conn.execute("SELECT id, text FROM page_texts WHERE extract_id = ?", (extract_id,)).fetchall()
+        conn.executemany(
+            "INSERT INTO pages (pages, rowid, text) VALUES ('delete', ?, ?)",
+            [(rowid, text.translate(self.FOLD)) for rowid, text in rows]
+        )
+        conn.execute("DELETE FROM page_texts WHERE extract_id = ?", (extract_id,))
+
+    def remove(self, extract_id):
+        def delete(conn):
+            with conn:
+                self._delete_pages(conn, extract_id)
+                conn.execute("DELETE FROM extractions WHERE extract_id = ?", (extract_id,))
+        self._run(delete)
+
+    def remove_path(self, path):
+        """Janitor callback: drop deleted extraction directories from the index."""
+        path = Path(path)
+        if path.parent == EXTRACTED_DIR:
+            self.remove(path.name)
+
+    def sync(self, extracted_dir):
+        """Drop extractions deleted while the server was down and index finished ones not indexed yet."""
+        indexed = self._run(lambda conn: {row[0] for row in conn.execute("SELECT extract_id FROM extractions")})
+        if indexed is None:
+            return
+        on_disk = {d.name for d in Path(extracted_dir).iterdir() if (d / PAGE_TEXTS_FILE).exists()}
+        for extract_id in indexed - on_disk:
+            self.remove(extract_id)
+        for extract_id in on_disk - indexed:
+            self.add(extract_id, None, Path(extracted_dir) / extract_id)
+
+    @staticmethod
+    def match_expression(query):
+        """Turn free text into an FTS5 query: every term must match, a trailing * matches prefixes."""
+        terms = []
+        for term in query.translate(SearchIndex.FOLD).split():
+            prefix = term.endswith("*")
+            term = term.rstrip("*")
+            if term:
+                terms.append('"' + term.replace('"', '""') + '"' + ("*" if prefix else ""))
+        return " ".join(terms)
+
+    def search(self, query, limit=20, extract_id=None):
+        """Return ranked page hits with highlighted snippets."""
+        expression = self.match_expression(query)
+        if not expression:
+            return []
+        sql = """
+            SELECT page_texts.extract_id, extractions.filename, page_texts.page_no,
+                   snippet(pages, 0, '**', '**', '…', 24), bm25(pages)
+            FROM pages
+            JOIN page_texts ON page_texts.id = pages.rowid
+            LEFT JOIN extractions ON extractions.extract_id = page_texts.extract_id
+            WHERE pages MATCH ?
+        """
+        params = [expression]
+        if extract_id:
+            sql += " AND page_texts.extract_id = ?"
+            params.append(extract_id)
+        sql += " ORDER BY bm25(pages) LIMIT ?"
+        params.append(limit)
+        self.queries += 1
+        rows = self._run(lambda conn: conn.execute(sql, params).fetchall()) or []
+        return [
+            {"extract_id": row[0], "filename": row[1], "page_no": row[2], "snippet": row[3], "score": round(-row[4], 4)}
+            for row in rows
+        ]
+
+    def stats(self):
+        counts = self._run(lambda conn: conn.execute(
+            "SELECT (SELECT COUNT(*) FROM extractions), (SELECT COUNT(*) FROM page_texts)"
+        ).fetchone())
+        return {
+            "available": self.available,
+            "extractions": counts[0] if counts else 0,
+            "pages": counts[1] if counts else 0,
+            "queries": self.queries,
+        }
+
+# Dot-file, so neither the extraction cache nor the janitor treats it as an entry
+search_index = SearchIndex(CACHE_DIR / ".search_index.sqlite")
+janitor.on_delete(search_index.remove_path)
+
+@app.on_event("startup")
+async def sync_search_index():
+    loop = asyncio.get_event_loop()
+    await loop.run_in_executor(None, search_index.sync, EXTRACTED_DIR)
+
+@app.on_event("shutdown")
+async def stop_janitor():
+    await janitor.stop()
+
+_image_encode_pool = None
+_image_encode_pool_lock = threading.Lock()
+
+def get_image_encode_pool():
+    # Pillow releases the GIL while encoding, so threads are enough here
+    global _image_encode_pool
+    with _image_encode_pool_lock:
+        if _image_encode_pool is None:
+            _image_encode_pool = ThreadPoolExecutor(max_workers=IMAGE_ENCODE_WORKERS)
+        return _image_encode_pool
+
+def image_variant_path(image_path, size):
+    # Variants live in a dot-dir, which ZIP exports skip
+    image_path = Path(image_path)
+    return image_path.parent.parent / ".derived" / f"{image_path.stem}_{size}.webp"
+
+def save_image_variants(image, image_path):
+    """Write the WebP size variants of an extracted image."""
+    if image.mode not in ("RGB", "RGBA"):
+        image = image.convert("RGBA" if "A" in image.getbands() or "transparency" in image.info else "RGB")
+    for size, max_side in IMAGE_VARIANT_SIZES.items():
+        variant_path = image_variant_path(image_path, size)
+        variant_path.parent.mkdir(exist_ok=True)
+        variant = image.copy()
+        variant.thumbnail((max_side, max_side))
+        tmp_path = variant_path.with_name(f".{uuid.uuid4().hex}{variant_path.name}")
+        variant.save(tmp_path, "WEBP", quality=80, method=4)
+        os.replace(tmp_path, variant_path)
+
+def save_extracted_image(image, image_path):
+    """Save an extracted image as PNG along with its WebP variants."""
+    image.save(image_path, "PNG")
+    save_image_variants(image, image_path)
+    return image_path
+
+def generate_image_variants(image_path):
+    with Image.open(image_path) as image:
+        save_image_variants(image, image_path)
+    return image_path
+
+def image_variant(image_path, size):
+    """Return the path of a size variant, generating it if it is missing (e.g. older extractions)."""
+    variant_path = image_variant_path(image_path, size)
+    if not variant_path.exists():
+        if not Path(image_path).exists():
+            return None
+        generate_image_variants(image_path)
+        janitor.add_bytes(
+            Path(image_path).parent.parent,
+            sum(image_variant_path(image_path, name).stat().st_size for name in IMAGE_VARIANT_SIZES)
+        )
+    return variant_path
+
+_docling_shard_pool = None
+_docling_shard_pool_lock = threading.Lock()
+
+def get_docling_shard_pool():
+    global _docling_shard_pool
+    with _docling_shard_pool_lock:
+        if _docling_shard_pool is None:
+            _docling_shard_pool = ProcessPoolExecutor(
+                max_workers=DOCLING_SHARD_WORKERS, mp_context=multiprocessing.get_context("spawn")
+            )
+        return _docling_shard_pool
+
+def pdf_page_count(pdf_path):
+    pdf = pdfium.PdfDocument(str(pdf_path))
+    try:
+        return len(pdf)
+    finally:
+        pdf.close()
+
+def parse_page_ranges(spec, page_count):
+    """
+    Parse a page selection such as "1-3,10" or "5-" into sorted, de-duplicated
+    1-based page numbers. Raises ValueError for malformed selections and pages
+    outside 1..page_count.
+    """
+    pages = set()
+    for part in spec.replace(" ", "").split(","):
+        if not part:
+            continue
+        match = re.fullmatch(r"(\d+)(?:(-)(\d*))?", part)
+        if not match:
+            raise ValueError(f"Invalid page range '{part}'")
+        first = int(match.group(1))
+        last = int(match.group(3)) if match.group(3) else (page_count if match.group(2) else first)
+        if first < 1 or last < first or last > page_count:
+            raise ValueError(f"Page range '{part}' is outside 1-{page_count}")
+        pages.update(range(first, last + 1))
+    if not pages:
+        raise ValueError("No pages selected")
+    return sorted(pages)
+
+def triage_pdf_pages(pdf_path, pages=None):
+    """
+    Classify pages (all, or the given 1-based `pages`) from their text layer and
+    image coverage: "text" when the embedded text is usable, "ocr" when the page
+    is essentially an image (scanned). Returns {page_no: route} in page order.
+    """
+    routes = {}
+    pdf = pdfium.PdfDocument(str(pdf_path))
+    try:
+        for page_no in pages or range(1, len(pdf) + 1):
+            page = pdf[page_no - 1]
+            try:
+                textpage = page.get_textpage()
+                try:
+                    chars = len("".join(textpage.get_text_bounded().split()))
+                finally:
+                    textpage.close()
+                width, height = page.get_size()
+                image_area = 0.0
+                for obj in page.get_objects(filter=(pdfium_c.FPDF_PAGEOBJ_IMAGE,)):
+                    # get_pos() was renamed get_bounds() in pypdfium2 5
+                    get_bounds = getattr(obj, "get_bounds", None) or obj.get_pos
+                    left, bottom, right, top = get_bounds()
+                    image_area += max(0.0, right - left) * max(0.0, top - bottom)
+                coverage = min(1.0, image_area / (width * height)) if width * height else 0.0
+            finally:
+                page.close()
+            scanned = chars < PAGE_TRIAGE_MIN_CHARS and coverage >= PAGE_TRIAGE_MIN_IMAGE_COVERAGE
+            routes[page_no] = "ocr" if scanned else "text"
+    finally:
+        pdf.close()
+    return routes
+
+def page_runs(routes):
+    """Group {page_no: route} into (route, first, last) runs of consecutive pages."""
+    runs = []
+    for page_no, route in sorted(routes.items()):
+        if runs and runs[-1][0] == route and runs[-1][2] == page_no - 1:
+            runs[-1][2] = page_no
+        else:
+            runs.append([route, page_no, page_no])
+    return [tuple(run) for run in runs]
+
+def format_page_list(page_numbers):
+    """Render page numbers compactly, e.g. [1, 2, 3, 7] -> "1-3,7"."""
+    parts = []
+    for page_no in sorted(page_numbers):
+        if parts and parts[-1][1] == page_no - 1:
+            parts[-1][1] = page_no
+        else:
+            parts.append([page_no, page_no])
+    return ",".join(str(a) if a == b else f"{a}-{b}" for a, b in parts)
+
+def summarize_page_routes(routes):
+    """Summary form of triage routes: {"text": "1-4,6", "ocr": "5"}."""
+    return {
+        route: format_page_list([page_no for page_no, r in routes.items() if r == route])
+        for route in sorted(set(routes.values()))
+    }
+
+def write_pdf_pages(pdf_path, output_path, first, last):
+    """Save pages first..last (1-based, inclusive) of a PDF as a new PDF."""
+    source = pdfium.PdfDocument(str(pdf_path))
+    pages = pdfium.PdfDocument.new()
+    try:
+        pages.import_pages(source, list(range(first - 1, last)))
+        pages.save(str(output_path))
+    finally:
+        pages.close()
+        source.close()
+
+# Marks page boundaries in docling exports; split off again by split_docling_pages()
+DOCLING_PAGE_BREAK = "\f<page-break>\f"
+
+def split_docling_pages(doc, exported, first_page=1):
+    """
+    Split a docling export made with page_break_placeholder=DOCLING_PAGE_BREAK into
+    (page_no, text) pages. Docling puts a break wherever the page number of the
+    body items goes up, so the pages are those increasing page numbers in order.
+    """
+    segments = [segment.strip() for segment in exported.split(DOCLING_PAGE_BREAK)]
+    page_nos = []
+    for item, _level in doc.iterate_items():
+        prov = getattr(item, "prov", None)
+        if prov and (not page_nos or prov[0].page_no > page_nos[-1]):
+            page_nos.append(prov[0].page_no)
+    if len(page_nos) != len(segments):
+        # Breaks we cannot attribute: keep the content as a single page
+        return [(page_nos[0] if page_nos else first_page, "\n\n".join(segment for segment in segments if segment))]
+    return list(zip(page_nos, segments))
+
+def docling_extract_content(pdf_path, page_range=None, do_ocr=False, profile="full"):
+    """
+    Convert a PDF, or one (first, last) page range of it, with docling and return
+    the markdown and plain text (whole and as (page_no, text) pages), (page_no,
+    DataFrame) tables and (page_no, image) pairs.
+    Tables and pictures that could not be exported are kept as None so that
+    numbering stays the same whether the document is converted whole or in shards.
+    The extraction `profile` decides which table and picture models run.
+    """
+    settings = EXTRACTION_PROFILES[profile]
+    # OCR is only turned on for scanned pages; the converter is reused across requests
+    result = run_docling_convert(
+        str(pdf_path),
+        page_range=page_range,
+        do_ocr=do_ocr,
+        do_table_structure=settings["tables"] is not None,
+        generate_picture_images=settings["pictures"],
+        table_mode=settings["tables"] or "fast",
+    )
+    doc = result.document
+    
+    first_page = page_range[0] if page_range else 1
+    with timed_stage("markdown_export"):
+        md_pages = split_docling_pages(doc, doc.export_to_markdown(page_break_placeholder=DOCLING_PAGE_BREAK), first_page)
         
-        # Extract images
+        # Extract text to plain text using export_to_text() method
+        try:
+            text_pages = split_docling_pages(doc, doc.export_to_text(page_break_placeholder=DOCLING_PAGE_BREAK), first_page)
+        except AttributeError:
+            # Fallback: derive plain text from markdown by removing markdown syntax
+            text_pages = [(page_no, re.sub(r'[#*`\[\]()]', '', md)) for page_no, md in md_pages]
+    
+    tables = []
+    if settings["tables"] is not None and hasattr(doc, 'tables') and doc.tables:
+        for table in doc.tables:
+            try:
+                with timed_stage("table_export"):
+                    df = table.export_to_dataframe(doc)
+                page_no = table.prov[0].page_no if table.prov else 0
+                tables.append(None if df.empty else (page_no, df))
+            except Exception as e:
+                print(f"[!] Error exporting table: {e}")
+                tables.append(None)
+    
+    images = []
+    if settings["pictures"] and hasattr(doc, 'pictures') and doc.pictures:
+        for picture in doc.pictures:
+            try:
+                with timed_stage("image_save"):
+                    image = picture.get_image(doc)
+                page_no = picture.prov[0].page_no if picture.prov else 0
+                images.append((page_no, image) if image else None)
+            except Exception as e:
+                print(f"[!] Error exporting image: {e}")
+                images.append(None)
+    
+    return {
+        "markdown": "\n\n".join(md for _, md in md_pages),
+        "text": "\n\n".join(text for _, text in text_pages),
+        "md_pages": md_pages,
+        "text_pages": text_pages,
+        "tables": tables,
+        "images": images,
+    }
+
+def docling_page_ranges(page_count, pages_per_range, first=1):
+    """Split pages first..page_count into (first, last) ranges of up to `pages_per_range` pages."""
+    return [
+        (start, min(start + pages_per_range - 1, page_count))
+        for start in range(first, page_count + 1, pages_per_range)
+    ]
+
+def iter_docling_content(pdf_path, shard_pages=0, stream_pages=0, routes=None, profile="full"):
+    """
+    Yield (page_range, content) chunks in page order: parallel shards for PDFs
+    longer than `shard_pages`, sequential `stream_pages`-sized steps for
+    progressive extractions, otherwise one whole-document chunk (page_range None).
+    With `routes` ({page_no: route} from triage or a page selection) only those
+    pages are converted, in chunks that follow the runs of consecutive text and
+    scanned pages, and only the scanned ones are converted with OCR.
+    docling keeps original page numbers for page_range conversions.
+    """
+    extract = functools.partial(docling_extract_content, profile=profile)
+    if routes:
+        page_count = len(routes)
+        chunk_pages = shard_pages if page_count > shard_pages > 0 else stream_pages or page_count
+        chunks = [
+            (page_range, route == "ocr")
+            for route, first, last in page_runs(routes)
+            for page_range in docling_page_ranges(last, chunk_pages, first)
+        ]
+        if "ocr" in routes.values():
+            print(f"[*] Converting {page_count} pages as {len(chunks)} chunks "
+                  f"(OCR on pages {summarize_page_routes(routes)['ocr']})")
+        if page_count > shard_pages > 0 and len(chunks) > 1:
+            pool = get_docling_shard_pool()
+            ranges = [page_range for page_range, _ in chunks]
+            flags = [do_ocr for _, do_ocr in chunks]
+            yield from zip(ranges, pool.map(extract, [str(pdf_path)] * len(chunks), ranges, flags))
+        else:
+            for page_range, do_ocr in chunks:
+                yield page_range, extract(pdf_path, page_range, do_ocr)
+        return
+
+    page_count = pdf_page_count(pdf_path) if shard_pages > 0 or stream_pages > 0 else 0
+    if page_count > shard_pages > 0:
+        ranges = docling_page_ranges(page_count, shard_pages)
+        print(f"[*] Splitting {page_count} pages into {len(ranges)} shards of up to {shard_pages} pages")
+        pool = get_docling_shard_pool()
+        # map() hands back shards in order as soon as each one is ready
+        yield from zip(ranges, pool.map(extract, [str(pdf_path)] * len(ranges), ranges))
+    elif page_count > 0 and stream_pages > 0:
+        for page_range in docling_page_ranges(page_count, stream_pages):
+            yield page_range, extract(pdf_path, page_range)
+    else:
+        yield None, extract(pdf_path)
+
+PAGE_TEXTS_FILE = Path(".derived") / "pages.jsonl"
+
+def write_page_texts(output_base, page_texts):
+    """Store {page_no: plain text} in the extraction's derived data, where the search index reads it."""
+    path = Path(output_base) / PAGE_TEXTS_FILE
+    path.parent.mkdir(exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        for page_no in sorted(page_texts):
+            f.write(json.dumps({"page": page_no, "text": page_texts[page_no]}) + "\n")
+
+def read_page_texts(output_base):
+    with open(Path(output_base) / PAGE_TEXTS_FILE, "r", encoding="utf-8") as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+TEXT_INDEX_FILE = "pages_index.json"
+
+def write_paged_text(path, pages, separator="\n\n"):
+    """
+    Write (page_no, text) pages as one UTF-8 file, separated by `separator`, and
+    return the [page_no, start, end] byte offsets of each page in it.
+    """
+    offsets = []
+    position = 0
+    separator = separator.encode("utf-8")
+    # Binary, so newline translation cannot shift the offsets
+    with open(path, "wb") as f:
+        for i, (page_no, text) in enumerate(pages):
+            if i:
+                f.write(separator)
+                position += len(separator)
+            data = text.encode("utf-8")
+            f.write(data)
+            offsets.append([page_no, position, position + len(data)])
+            position += len(data)
+    return offsets
+
+def write_text_index(text_dir, page_count, offsets):
+    """Store the document's page count and {format: [[page_no, start, end], ...]} next to the text files."""
+    with open(Path(text_dir) / TEXT_INDEX_FILE, "w", encoding="utf-8") as f:
+        json.dump(dict(offsets, page_count=page_count), f)
+
+class TextIndexCache:
+    """
+    Small LRU of parsed page offset indexes, so paged text reads cost one stat
+    and one seek. Entries are checked against the index file's mtime.
+    """
+
+    def __init__(self, max_entries):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()  # path -> (mtime_ns, index)
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, text_dir):
+        """Return the index for `text_dir`, or None for extractions without one."""
+        path = Path(text_dir) / TEXT_INDEX_FILE
+        try:
+            mtime = path.stat().st_mtime_ns
+        except OSError:
+            with self._lock:
+                self._entries.pop(path, None)
+            return None
+        with self._lock:
+            entry = self._entries.get(path)
+            if entry and entry[0] == mtime:
+                self._entries.move_to_end(path)
+                self.hits += 1
+                return entry[1]
+        with open(path, "r", encoding="utf-8") as f:
+            index = json.load(f)
+        with self._lock:
+            self.misses += 1
+            self._entries[path] = (mtime, index)
+            self._entries.move_to_end(path)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return index
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / lookups, 3) if lookups else 0.0,
+        }
+
+text_indexes = TextIndexCache(TEXT_INDEX_CACHE_SIZE)
+
+def read_text_pages(text_file, offsets, page_numbers):
+    """
+    Read the pages in `page_numbers` from `text_file` using its page `offsets`.
+    Adjacent pages are read as one slice, so a range costs a single seek and read.
+    """
+    runs = []
+    for i, (page_no, start, end) in enumerate(offsets):
+        if page_no not in page_numbers:
+            continue
+        if runs and runs[-1][0] == i - 1:
+            runs[-1] = (i, runs[-1][1], end, runs[-1][3] + [page_no])
+        else:
+            runs.append((i, start, end, [page_no]))
+    parts = []
+    with open(text_file, "rb") as f:
+        for _, start, end, _ in runs:
+            f.seek(start)
+            parts.append(f.read(end - start).decode("utf-8"))
+    return "\n\n".join(parts), [page_no for run in runs for page_no in run[3]]
+
+class ExtractionCancelled(Exception):
+    """Raised by an extractor that stops early because its job was cancelled."""
+
+class ExtractionEvents:
+    """
+    Appends progress events for one extraction to events.ndjson in its output
+    directory, where /extraction-events tails them. Plain file appends work the
+    same from the web process and from extraction worker processes. The web
+    process cancels a running extraction by dropping a marker file next to it,
+    which the extractor checks between steps.
+    """
+
+    FILENAME = "events.ndjson"
+    CANCEL_FILENAME = ".cancel"
+
+    def __init__(self, output_base):
+        self.path = Path(output_base) / self.FILENAME
+
+    @classmethod
+    def request_cancel(cls, output_base):
+        try:
+            (Path(output_base) / cls.CANCEL_FILENAME).touch()
+        except OSError as e:
+            print(f"[!] Could not mark extraction for cancellation: {e}")
+
+    def check_cancelled(self):
+        """Raise ExtractionCancelled once the job has been cancelled."""
+        if (self.path.parent / self.CANCEL_FILENAME).exists():
+            raise ExtractionCancelled("Job cancelled")
+
+    def emit(self, event_type, **data):
+        try:
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write(json.dumps(dict(data, type=event_type), default=str) + "\n")
+        except OSError as e:
+            print(f"[!] Could not record {event_type} event: {e}")
+
+def extract_from_pdf(pdf_path, extract_id, shard_pages=None, stream_pages=0, triage=None, profile="full", pages=None):
+    """
+    Extract text, tables, and images from PDF using docling.
+    Works on Windows without requiring poppler/tesseract installation.
+    PDFs longer than `shard_pages` pages (default DOCLING_SHARD_PAGES) are
+    converted as parallel page-range shards; `stream_pages` converts in steps of
+    that many pages so page/table/image events are published as each step finishes.
+    With `triage` (default PAGE_TRIAGE) scanned pages are found up front and
+    only those are converted with OCR. `profile` is one of EXTRACTION_PROFILES.
+    `pages` ("1-3,10") restricts conversion to those pages; page numbers in the
+    output stay those of the original document.
+    """
+    if shard_pages is None:
+        shard_pages = DOCLING_SHARD_PAGES
+    if triage is None:
+        triage = PAGE_TRIAGE
+    events = None
+    try:
+        pdf_path = Path(pdf_path)
+        output_base = EXTRACTED_DIR / extract_id
+        output_base.mkdir(exist_ok=True)
+        events = ExtractionEvents(output_base)
+        
+        # Setup directories
+        text_dir = output_base / "text"
+        tables_dir = output_base / "tables"
+        images_dir = output_base / "images"
+        text_dir.mkdir(exist_ok=True)
+        tables_dir.mkdir(exist_ok=True)
+        images_dir.mkdir(exist_ok=True)
+        
+        print(f"[*] Extracting from: {pdf_path}")
+        page_count = pdf_page_count(pdf_path)
+        page_numbers = parse_page_ranges(pages, page_count) if pages else None
+        routes = None
+        if triage:
+            with timed_stage("triage"):
+                routes = triage_pdf_pages(pdf_path, page_numbers)
+        elif page_numbers:
+            routes = dict.fromkeys(page_numbers, "text")
+        md_pages = []
+        text_pages = []
+        table_index = 0
+        image_index = 0
+        table_count = 0
         image_count = 0
-        if hasattr(doc, 'pictures') and doc.pictures:
-            for i, picture in enumerate(doc.pictures):
+        for page_range, content in iter_docling_content(pdf_path, shard_pages, stream_pages, routes, profile):
+            events.check_cancelled()
+            md_pages.extend(content["md_pages"])
+            text_pages.extend(content["text_pages"])
+            events.emit("page", pages=list(page_range) if page_range else None, markdown=content["markdown"])
+            
+            # Extract tables to CSV
+            for table in content["tables"]:
+                table_index += 1
+                if table is None:
+                    continue
                 try:
-                    image = picture.get_image(doc)
-                    if image:
-                        page_no = picture.prov[0].page_no if picture.prov else 0
-                        img_filename = f"image_{i+1}_page_{page_no}.png"
-                        img_path = images_dir / img_filename
-                        image.save(img_path, "PNG")
-                        image_count += 1
-                        print(f"[✓] Image {i+1} saved")
+                    page_no, df = table
+                    # CSV and Excel versions are rendered when first requested
+                    with timed_stage("table_export"):
+                        write_canonical_table(df, tables_dir / f"table_{table_index}.parquet", ("csv", "xlsx"))
+                    table_count += 1
+                    print(f"[✓] Table {table_index} saved")
+                    events.emit("table", filename=f"table_{table_index}.csv", page_no=page_no)
                 except Exception as e:
-                    print(f"[!] Error extracting image {i+1}: {e}")
+                    print(f"[!] Error extracting table {table_index}: {e}")
+            
+            # Extract images, encoding PNG and WebP variants in parallel
+            pending = []
+            for picture in content["images"]:
+                image_index += 1
+                if picture is None:
+                    continue
+                page_no, image = picture
+                img_path = images_dir / f"image_{image_index}_page_{page_no}.png"
+                pending.append((image_index, page_no, img_path,
+                                get_image_encode_pool().submit(save_extracted_image, image, img_path)))
+            for index, page_no, img_path, future in pending:
+                try:
+                    with timed_stage("image_save"):
+                        future.result()
+                    image_count += 1
+                    print(f"[✓] Image {index} saved")
+                    events.emit("image", filename=img_path.name, page_no=page_no)
+                except Exception as e:
+                    print(f"[!] Error extracting image {index}: {e}")
+        
+        # Extract text to markdown, with a page offset index for paged reads
+        text_file = text_dir / "extracted_text.md"
+        with timed_stage("markdown_export"):
+            md_offsets = write_paged_text(text_file, md_pages)
+        print(f"[✓] Text saved: {text_file}")
+        
+        txt_file = text_dir / "extracted_text.txt"
+        with timed_stage("markdown_export"):
+            txt_offsets = write_paged_text(txt_file, text_pages)
+        print(f"[✓] Plain text saved: {txt_file}")
+        write_text_index(text_dir, page_count, {"md": md_offsets, "txt": txt_offsets})
+        write_page_texts(output_base, dict(text_pages))
         
         # Create summary file
         summary = {
@@ -291,6 +2838,9 @@ def extract_from_pdf(pdf_path, extract_id):
             "text_files": 2,
             "tables_count": table_count,
             "images_count": image_count,
+            "profile": profile,
+            "pages": pages,
+            "page_routes": summarize_page_routes(routes) if routes and triage else None,
             "output_structure": {
                 "text": ["extracted_text.md", "extracted_text.txt"],
                 "tables": [f"table_{i+1}.csv / .xlsx" for i in range(table_count)],
@@ -304,7 +2854,13 @@ def extract_from_pdf(pdf_path, extract_id):
             f.write("PDF EXTRACTION SUMMARY\n")
             f.write("=" * 60 + "\n\n")
             f.write(f"Source PDF: {summary['pdf_filename']}\n")
-            f.write(f"Extraction ID: {summary['extracted_at']}\n\n")
+            f.write(f"Extraction ID: {summary['extracted_at']}\n")
+            f.write(f"Profile: {summary['profile']}\n")
+            if summary["pages"]:
+                f.write(f"Pages: {summary['pages']}\n")
+            f.write("\n")
+            if summary["page_routes"]:
+                f.write("Page routes: " + "; ".join(f"{route} {pages}" for route, pages in summary["page_routes"].items()) + "\n\n")
             f.write(f"📄 Text Files: {summary['text_files']}\n")
             f.write(f"📊 Tables Extracted: {summary['tables_count']}\n")
             f.write(f"🖼️  Images Extracted: {summary['images_count']}\n\n")
@@ -314,6 +2870,7 @@ def extract_from_pdf(pdf_path, extract_id):
             f.write(f"  images/   -> PNG images\n")
         
         print(f"[✓] Summary saved: {summary_file}")
+        events.emit("done", summary=summary)
         
         return {
             "success": True,
@@ -323,27 +2880,234 @@ def extract_from_pdf(pdf_path, extract_id):
         }
         
     except Exception as e:
-        print(f"[✗] Extraction error: {e}")
-        return {
-            "success": False,
-            "error": str(e)
-        }
+        print(f"[✗] Extraction error: {e}")
+        if events is not None:
+            events.emit("error", error=str(e))
+        return {
+            "success": False,
+            "error": str(e)
+        }
+
+# Tesseract is looked up once per process. pytesseract and TESSDATA_PREFIX are
+# process-wide settings, so they are set here, before any extraction runs,
+# rather than from the threads that run extractions.
+TESSERACT_CANDIDATES = [
+    r"C:\Program Files\Tesseract-OCR\tesseract.exe",
+    r"C:\Program Files (x86)\Tesseract-OCR\tesseract.exe",
+    r"C:\Tesseract-OCR\tesseract.exe",
+    "tesseract"  # Try PATH
+]
+_ocr_engine = None
+_ocr_engine_detected = False
+_ocr_engine_lock = threading.Lock()
+
+def get_ocr_engine():
+    """Return {"cmd", "version", "tessdata"} for the Tesseract install, or None without one."""
+    global _ocr_engine, _ocr_engine_detected
+    with _ocr_engine_lock:
+        if _ocr_engine_detected:
+            return _ocr_engine
+        _ocr_engine_detected = True
+        import subprocess
+        for path in TESSERACT_CANDIDATES:
+            try:
+                result = subprocess.run([path, '--version'], capture_output=True, timeout=5, shell=False)
+            except (FileNotFoundError, OSError, subprocess.TimeoutExpired):
+                continue
+            if result.returncode != 0:
+                continue
+            version_output = (result.stdout or result.stderr).decode(errors="replace").split()
+            engine = {
+                "cmd": path,
+                "version": version_output[1] if len(version_output) > 1 else "unknown",
+                "tessdata": None,
+            }
+            if pytesseract:
+                pytesseract.pytesseract.tesseract_cmd = path
+            tessdata_dir = Path(path).parent / 'tessdata'
+            if path != "tesseract" and tessdata_dir.exists():
+                os.environ['TESSDATA_PREFIX'] = str(tessdata_dir)
+                engine["tessdata"] = str(tessdata_dir)
+            print(f"[✓] Tesseract OCR detected at: {path} (version {engine['version']})")
+            _ocr_engine = engine
+            break
+        else:
+            print("[!] Tesseract not found - Unstructured will use the auto strategy (limited extraction)")
+            print("[💡] Install Tesseract for full features: See TESSERACT_INSTALL.md")
+        return _ocr_engine
+
+@app.on_event("startup")
+async def detect_ocr_engine():
+    if UNSTRUCTURED_AVAILABLE:
+        loop = asyncio.get_event_loop()
+        await loop.run_in_executor(None, get_ocr_engine)
+
+def load_unstructured_models():
+    """Load the hi_res layout (YOLOX) and table-structure models into this process."""
+    try:
+        from unstructured_inference.models.base import get_model
+        from unstructured_inference.models import tables
+        get_model("yolox")
+        tables.load_agent()
+    except Exception as e:
+        # Not fatal: partition_pdf loads them on first use
+        print(f"[!] Could not preload Unstructured models: {e}")
+
+_ocr_pool = None
+_ocr_pool_lock = threading.Lock()
+
+def _init_ocr_worker(threads):
+    # Each worker runs one Tesseract at a time; keep it from spreading over every core
+    os.environ["OMP_THREAD_LIMIT"] = str(threads)
+    if get_ocr_engine() is not None:
+        load_unstructured_models()
+
+def get_ocr_pool():
+    global _ocr_pool
+    with _ocr_pool_lock:
+        if _ocr_pool is None:
+            _ocr_pool = ProcessPoolExecutor(
+                max_workers=UNSTRUCTURED_OCR_WORKERS,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_init_ocr_worker,
+                initargs=(UNSTRUCTURED_OCR_THREADS,),
+            )
+        return _ocr_pool
+
+def partition_pdf_pages(pdf_path, images_dir, page_range=None, strategy="hi_res", profile="full", ocr_mode=None):
+    """
+    Run Unstructured's hi_res (OCR, layout and table models), auto or fast
+    (text layer only) strategy on a PDF, or on one (first, last) page range of it.
+    hi_res with ocr_mode="individual_blocks" takes text from the text layer and
+    only OCRs blocks that have none.
+    Ranges are partitioned from a PDF of just those pages and keep the original
+    page numbers, both in the elements and in the names of the image blocks
+    written to `images_dir` (figure-<page>-<n>). The extraction `profile`
+    decides whether hi_res infers table structure and extracts images.
+    """
+    settings = EXTRACTION_PROFILES[profile]
+    if strategy in ("hi_res", "auto"):
+        options = dict(
+            strategy=strategy,
+            infer_table_structure=settings["tables"] is not None,
+            extract_images_in_pdf=settings["pictures"],
+        )
+        if strategy == "hi_res":
+            options["hi_res_model_name"] = "yolox"
+            if ocr_mode:
+                options["ocr_mode"] = ocr_mode
+    else:
+        options = dict(strategy=strategy)
+    if page_range is None:
+        return partition_pdf(filename=str(pdf_path), extract_image_block_output_dir=str(images_dir), **options)
+
+    first, last = page_range
+    images_dir = Path(images_dir)
+    range_dir = images_dir / f".pages_{first}_{last}"
+    range_dir.mkdir(parents=True, exist_ok=True)
+    try:
+        range_pdf = range_dir / "pages.pdf"
+        write_pdf_pages(pdf_path, range_pdf, first, last)
+        elements = partition_pdf(
+            filename=str(range_pdf),
+            extract_image_block_output_dir=str(range_dir),
+            starting_page_number=first,
+            **options
+        )
+        # Move image blocks next to the other ranges' under their original page number
+        per_page = {}
+        for el in elements:
+            image_path = getattr(el.metadata, "image_path", None)
+            if not image_path or not os.path.exists(image_path):
+                continue
+            page_no = el.metadata.page_number or first
+            per_page[page_no] = per_page.get(page_no, 0) + 1
+            kind = Path(image_path).stem.split("-")[0]
+            target = images_dir / f"{kind}-{page_no}-{per_page[page_no]}{Path(image_path).suffix}"
+            os.replace(image_path, target)
+            el.metadata.image_path = str(target)
+        return elements
+    finally:
+        shutil.rmtree(range_dir, ignore_errors=True)
+
+def partition_pdf_ocr(pdf_path, images_dir, routes=None, profile="full"):
+    """
+    Partitioning with OCR. Without `routes` every page goes through hi_res;
+    with them ({page_no: route} from triage or a page selection) only those
+    pages are partitioned. Scanned pages use hi_res. Text pages use hi_res
+    without page OCR (ocr_mode="individual_blocks") when the profile wants
+    tables or images, and the fast strategy when it wants neither.
+    hi_res pages are split into UNSTRUCTURED_OCR_PAGES-page ranges partitioned
+    in parallel on the OCR pool, so long documents use every core instead of
+    one page after another.
+    """
+    settings = EXTRACTION_PROFILES[profile]
+    text_layout = settings["tables"] is not None or settings["pictures"]
+    page_count = pdf_page_count(pdf_path)
+    runs = page_runs(routes) if routes else [("ocr", 1, page_count)]
+    # Whole-document runs are partitioned from the original file
+    if len(runs) == 1 and runs[0][1:] == (1, page_count):
+        if runs[0][0] == "text" and not text_layout:
+            return partition_pdf_pages(pdf_path, images_dir, strategy="fast")
+        if UNSTRUCTURED_OCR_WORKERS <= 1 or page_count <= UNSTRUCTURED_OCR_PAGES:
+            ocr_mode = "individual_blocks" if runs[0][0] == "text" else None
+            return partition_pdf_pages(pdf_path, images_dir, profile=profile, ocr_mode=ocr_mode)
+
+    # (page_range, strategy, ocr_mode)
+    tasks = []
+    for route, first, last in runs:
+        if route == "text" and not text_layout:
+            tasks.append(((first, last), "fast", None))
+        else:
+            ocr_mode = "individual_blocks" if route == "text" else None
+            tasks.extend((page_range, "hi_res", ocr_mode)
+                         for page_range in docling_page_ranges(last, UNSTRUCTURED_OCR_PAGES, first))
+    hi_res_ranges = [page_range for page_range, strategy, _ in tasks if strategy == "hi_res"]
+    print(f"[*] Partitioning {sum(last - first + 1 for _, first, last in runs)} pages: {len(hi_res_ranges)} hi_res range(s), "
+          f"{len(tasks) - len(hi_res_ranges)} fast run(s)")
 
-def extract_from_pdf_unstructured(pdf_path, extract_id):
+    # hi_res ranges go to the pool first; fast runs are cheap and run here meanwhile
+    results = {}
+    if UNSTRUCTURED_OCR_WORKERS > 1 and len(hi_res_ranges) > 1:
+        pool = get_ocr_pool()
+        futures = {page_range: pool.submit(partition_pdf_pages, str(pdf_path), str(images_dir), page_range, strategy,
+                                           profile, ocr_mode)
+                   for page_range, strategy, ocr_mode in tasks if strategy == "hi_res"}
+    else:
+        futures = {}
+    for page_range, strategy, ocr_mode in tasks:
+        if page_range not in futures:
+            results[page_range] = partition_pdf_pages(pdf_path, images_dir, page_range, strategy, profile, ocr_mode)
+    elements = []
+    for page_range, _, _ in tasks:
+        elements.extend(futures[page_range].result() if page_range in futures else results[page_range])
+    return elements
+
+def extract_from_pdf_unstructured(pdf_path, extract_id, triage=None, profile="full", pages=None):
     """
     Extract text, tables, and images from PDF using Unstructured library.
     Alternative to docling with different extraction capabilities.
+    partition_pdf works on the whole document, so page events are published
+    once partitioning has finished. With `triage` (default PAGE_TRIAGE) and
+    Tesseract available, only scanned pages get page OCR; pages with a text
+    layer keep it (see partition_pdf_ocr). `profile` is one of EXTRACTION_PROFILES.
+    `pages` ("1-3,10") restricts partitioning to those pages; page numbers in
+    the output stay those of the original document.
     """
+    if triage is None:
+        triage = PAGE_TRIAGE
     if not UNSTRUCTURED_AVAILABLE:
         return {
             "success": False,
             "error": "Unstructured library not installed. Run: pip install unstructured[all-docs]"
         }
     
+    events = None
     try:
         pdf_path = Path(pdf_path)
         output_base = EXTRACTED_DIR / extract_id
         output_base.mkdir(exist_ok=True)
+        events = ExtractionEvents(output_base)
         
         # Setup directories
         text_dir = output_base / "text"
@@ -355,109 +3119,95 @@ def extract_from_pdf_unstructured(pdf_path, extract_id):
         
         print(f"[*] Extracting from: {pdf_path} (using Unstructured)")
         
-        # Check if Tesseract is available
-        tesseract_available = False
-        tesseract_cmd = None
-        try:
-            import subprocess
-            
-            # Common Tesseract installation paths on Windows
-            possible_paths = [
-                r"C:\Program Files\Tesseract-OCR\tesseract.exe",
-                r"C:\Program Files (x86)\Tesseract-OCR\tesseract.exe",
-                r"C:\Tesseract-OCR\tesseract.exe",
-                "tesseract"  # Try PATH
-            ]
-            
-            # Try each possible path
-            for path in possible_paths:
-                try:
-                    result = subprocess.run([path, '--version'], 
-                                          capture_output=True, timeout=5, shell=False)
-                    if result.returncode == 0:
-                        tesseract_available = True
-                        tesseract_cmd = path
-                        print(f"[✓] Tesseract OCR detected at: {path}")
-                        print(f"    Version: {result.stdout.decode().split()[1]}")
-                        break
-                except (FileNotFoundError, OSError):
-                    continue
-            
-            if not tesseract_available:
-                print("[!] Tesseract not found - using auto strategy (limited extraction)")
-                print("[💡] Install Tesseract for full features: See TESSERACT_INSTALL.md")
-        except Exception as e:
-            print(f"[!] Error checking Tesseract: {e}")
-            print("[!] Using auto strategy (limited extraction)")
+        # Tesseract is detected once per process, see get_ocr_engine()
+        tesseract_available = get_ocr_engine() is not None
+        if not tesseract_available:
+            print("[!] Tesseract not found - using auto strategy (limited extraction)")
+        
+        page_count = pdf_page_count(pdf_path)
+        page_numbers = parse_page_ranges(pages, page_count) if pages else None
+        # Consecutive runs of the selected pages, partitioned from PDFs of just those pages
+        selected_runs = page_runs(dict.fromkeys(page_numbers, "text")) if page_numbers else None
+        routes = None
+        if tesseract_available and triage:
+            with timed_stage("triage"):
+                routes = triage_pdf_pages(pdf_path, page_numbers)
+        elif tesseract_available and page_numbers:
+            routes = dict.fromkeys(page_numbers, "ocr")
         
         # Extract using unstructured
-        try:
-            if tesseract_available:
-                # Set tesseract path for pytesseract (used by unstructured internally)
-                if pytesseract and tesseract_cmd:
-                    pytesseract.pytesseract.tesseract_cmd = tesseract_cmd
-                    print(f"[*] Configured pytesseract with: {tesseract_cmd}")
-                    
-                    # Also set TESSDATA_PREFIX if needed
-                    tessdata_dir = str(Path(tesseract_cmd).parent / 'tessdata')
-                    if Path(tessdata_dir).exists():
-                        os.environ['TESSDATA_PREFIX'] = tessdata_dir
-                        print(f"[*] Set TESSDATA_PREFIX: {tessdata_dir}")
-                
-                # Full hi-res extraction with OCR support (like in notebook)
-                elements = partition_pdf(
-                    filename=str(pdf_path),
-                    strategy="hi_res",
-                    hi_res_model_name="yolox",
-                    infer_table_structure=True,
-                    extract_images_in_pdf=True,
-                    extract_image_block_output_dir=str(images_dir),
-                )
-            else:
-                # Use auto strategy without OCR for better results than fast
-                elements = partition_pdf(
-                    filename=str(pdf_path),
-                    strategy="auto",  # Better than fast, works without OCR
-                    infer_table_structure=True,
-                    extract_images_in_pdf=True,
-                    extract_image_block_output_dir=str(images_dir),
-                )
-        except Exception as e:
-            print(f"[!] Primary extraction failed: {e}")
-            print(f"[*] Trying basic strategy...")
-            # Last resort: basic extraction
-            elements = partition_pdf(
-                filename=str(pdf_path),
-                infer_table_structure=True,
-            )
+        with timed_stage("partition"):
+            try:
+                if tesseract_available:
+                    # Full hi-res extraction with OCR support (like in notebook), scanned pages only with triage
+                    elements = partition_pdf_ocr(pdf_path, images_dir, routes, profile)
+                elif selected_runs:
+                    elements = [
+                        el for _, first, last in selected_runs
+                        for el in partition_pdf_pages(pdf_path, images_dir, (first, last), "auto", profile)
+                    ]
+                else:
+                    # Use auto strategy without OCR for better results than fast
+                    elements = partition_pdf(
+                        filename=str(pdf_path),
+                        strategy="auto",  # Better than fast, works without OCR
+                        infer_table_structure=EXTRACTION_PROFILES[profile]["tables"] is not None,
+                        extract_images_in_pdf=EXTRACTION_PROFILES[profile]["pictures"],
+                        extract_image_block_output_dir=str(images_dir),
+                    )
+            except Exception as e:
+                print(f"[!] Primary extraction failed: {e}")
+                print(f"[*] Trying basic strategy...")
+                # Last resort: basic extraction
+                if selected_runs:
+                    elements = [
+                        el for _, first, last in selected_runs
+                        for el in partition_pdf_pages(pdf_path, images_dir, (first, last), "fast")
+                    ]
+                else:
+                    elements = partition_pdf(
+                        filename=str(pdf_path),
+                        infer_table_structure=EXTRACTION_PROFILES[profile]["tables"] is not None,
+                    )
+        events.check_cancelled()
         
         # Extract text
         text_elements = [el for el in elements if el.category in ["Title", "NarrativeText", "ListItem", "Text"]]
         
         # Save as markdown-style
-        md_content = []
+        page_md = {}
         for el in elements:
             if el.category == "Title":
-                md_content.append(f"# {el.text}\n")
+                line = f"# {el.text}\n"
             elif el.category == "NarrativeText":
-                md_content.append(f"{el.text}\n")
+                line = f"{el.text}\n"
             elif el.category == "ListItem":
-                md_content.append(f"- {el.text}")
+                line = f"- {el.text}"
             elif el.category == "Text":
-                md_content.append(f"{el.text}\n")
+                line = f"{el.text}\n"
+            else:
+                continue
+            page_md.setdefault(getattr(el.metadata, "page_number", None) or 0, []).append(line)
         
-        md_text = "\n".join(md_content)
+        md_pages = [(page_no, "\n".join(page_md[page_no])) for page_no in sorted(page_md)]
         text_file = text_dir / "extracted_text.md"
-        with open(text_file, "w", encoding="utf-8") as f:
-            f.write(md_text)
+        with timed_stage("markdown_export"):
+            md_offsets = write_paged_text(text_file, md_pages, separator="\n")
         print(f"[✓] Text saved: {text_file}")
+        for page_no in sorted(page_md):
+            events.emit("page", pages=[page_no, page_no] if page_no else None, markdown="\n".join(page_md[page_no]))
         
         # Save as plain text
-        plain_text = "\n\n".join([el.text for el in text_elements])
+        page_texts = {}
+        for el in text_elements:
+            page_texts.setdefault(getattr(el.metadata, "page_number", None) or 0, []).append(el.text)
+        text_pages = [(page_no, "\n\n".join(page_texts[page_no])) for page_no in sorted(page_texts)]
         txt_file = text_dir / "extracted_text.txt"
-        with open(txt_file, "w", encoding="utf-8") as f:
-            f.write(plain_text)
+        with timed_stage("markdown_export"):
+            txt_offsets = write_paged_text(txt_file, text_pages)
         print(f"[✓] Plain text saved: {txt_file}")
+        write_text_index(text_dir, page_count, {"md": md_offsets, "txt": txt_offsets})
+        write_page_texts(output_base, dict(text_pages))
         
         # Extract tables
         table_elements = [el for el in elements if el.category == "Table"]
@@ -475,20 +3225,16 @@ def extract_from_pdf_unstructured(pdf_path, extract_id):
                         df = pd.read_html(io.StringIO(html_content))[0]
                         
                         if not df.empty:
-                            csv_path = tables_dir / f"table_{i+1}.csv"
-                            df.to_csv(csv_path, index=False, encoding="utf-8-sig")
-                            
-                            # Also save as Excel
-                            excel_path = tables_dir / f"table_{i+1}.xlsx"
-                            df.to_excel(excel_path, index=False, engine='openpyxl')
-                            
-                            # Save HTML version too
-                            html_path = tables_dir / f"table_{i+1}.html"
-                            with open(html_path, "w", encoding="utf-8") as f:
-                                f.write(html_content)
+                            # CSV, Excel and the original HTML are rendered when first requested
+                            with timed_stage("table_export"):
+                                write_canonical_table(
+                                    df, tables_dir / f"table_{i+1}.parquet", ("csv", "xlsx", "html"),
+                                    source_html=html_content
+                                )
                             
                             table_count += 1
                             print(f"[✓] Table {i+1} saved (CSV, Excel, HTML)")
+                            events.emit("table", filename=f"table_{i+1}.csv", page_no=getattr(table.metadata, "page_number", None))
                     except Exception as e:
                         # If HTML parsing fails, save raw HTML only
                         html_path = tables_dir / f"table_{i+1}.html"
@@ -496,6 +3242,7 @@ def extract_from_pdf_unstructured(pdf_path, extract_id):
                             f.write(html_content)
                         table_count += 1
                         print(f"[✓] Table {i+1} saved (HTML only): {e}")
+                        events.emit("table", filename=html_path.name, page_no=getattr(table.metadata, "page_number", None))
             except Exception as e:
                 print(f"[!] Error extracting table {i+1}: {e}")
         
@@ -505,14 +3252,36 @@ def extract_from_pdf_unstructured(pdf_path, extract_id):
             image_files = list(images_dir.glob("*.png")) + list(images_dir.glob("*.jpg")) + list(images_dir.glob("*.jpeg"))
             image_count = len(image_files)
             print(f"[✓] {image_count} images extracted")
+            for image_file, future in [(f, get_image_encode_pool().submit(generate_image_variants, f)) for f in image_files]:
+                try:
+                    with timed_stage("image_save"):
+                        future.result()
+                except Exception as e:
+                    print(f"[!] Error creating variants for {image_file.name}: {e}")
+            for image_file in sorted(image_files):
+                # Unstructured names image blocks figure-<page>-<n>.jpg
+                match = re.match(r"\w+-(\d+)-\d+", image_file.stem)
+                events.emit("image", filename=image_file.name, page_no=int(match.group(1)) if match else None)
         
         # Create summary
-        extraction_strategy = "Hi-Res (with Tesseract)" if tesseract_available else "Auto (without Tesseract)"
+        text_layout = EXTRACTION_PROFILES[profile]["tables"] is not None or EXTRACTION_PROFILES[profile]["pictures"]
+        text_strategy = "Hi-Res on the text layer" if text_layout else "Fast"
+        if not tesseract_available:
+            extraction_strategy = "Auto (without Tesseract)"
+        elif routes and "ocr" not in routes.values():
+            extraction_strategy = f"{text_strategy} (no scanned pages)"
+        elif routes and "text" in routes.values():
+            extraction_strategy = f"Hi-Res OCR on scanned pages, {text_strategy} elsewhere (with Tesseract)"
+        else:
+            extraction_strategy = "Hi-Res (with Tesseract)"
         summary = {
             "pdf_filename": pdf_path.name,
             "extracted_at": extract_id,
             "extraction_method": "Unstructured",
             "strategy": extraction_strategy,
+            "profile": profile,
+            "pages": pages,
+            "page_routes": summarize_page_routes(routes) if routes and triage else None,
             "text_files": 2,
             "tables_count": table_count,
             "images_count": image_count,
@@ -531,7 +3300,13 @@ def extract_from_pdf_unstructured(pdf_path, extract_id):
             f.write(f"Source PDF: {summary['pdf_filename']}\n")
             f.write(f"Extraction ID: {summary['extracted_at']}\n")
             f.write(f"Method: {summary['extraction_method']}\n")
-            f.write(f"Strategy: {summary['strategy']}\n\n")
+            f.write(f"Strategy: {summary['strategy']}\n")
+            f.write(f"Profile: {summary['profile']}\n")
+            if summary["pages"]:
+                f.write(f"Pages: {summary['pages']}\n")
+            if summary["page_routes"]:
+                f.write("Page routes: " + "; ".join(f"{route} {pages}" for route, pages in summary["page_routes"].items()) + "\n")
+            f.write("\n")
             if not tesseract_available:
                 f.write("⚠️  LIMITED EXTRACTION MODE\n")
                 f.write("For better results, install Tesseract OCR:\n")
@@ -545,6 +3320,7 @@ def extract_from_pdf_unstructured(pdf_path, extract_id):
             f.write(f"  images/   -> PNG/JPG images\n")
         
         print(f"[✓] Summary saved: {summary_file}")
+        events.emit("done", summary=summary)
         
         return {
             "success": True,
@@ -557,102 +3333,750 @@ def extract_from_pdf_unstructured(pdf_path, extract_id):
         print(f"[✗] Extraction error: {e}")
         import traceback
         traceback.print_exc()
+        if events is not None:
+            events.emit("error", error=str(e))
         return {
             "success": False,
             "error": str(e)
         }
 
 
+EXTRACTORS = {
+    "docling": extract_from_pdf,
+    "unstructured": extract_from_pdf_unstructured,
+}
+
+def run_extractor(method, pdf_path, extract_id, **options):
+    """
+    Worker-process entry point: run an extractor and return its result with the
+    stage timings and this process's docling converter counters.
+    """
+    with record_stages() as stages:
+        result = EXTRACTORS[method](pdf_path, extract_id, **options)
+    result["stages"] = stages
+    result["converters"] = (os.getpid(), docling_converter_stats())
+    return result
+
+class UnstructuredWorkerPool:
+    """
+    Resident processes for Unstructured extractions. Each worker detects OCR and
+    loads the layout and table models at boot. One warm-up task per worker, held
+    at a shared barrier so each lands on a different process, marks the pool
+    ready once every worker has finished that. After `recycle_after` documents
+    a replacement pool is started; the current one keeps serving until the
+    replacement is warm, then finishes its in-flight documents and exits.
+    """
+
+    def __init__(self, workers, recycle_after):
+        self.workers = workers
+        self.recycle_after = recycle_after
+        self._pool = None
+        self._warmup = None
+        self._next = None  # (pool, warm-up futures) being prepared as the replacement
+        self._documents = 0
+        self.documents_total = 0
+        self.recycles = 0
+        self.warmup_seconds = None
+        self.warmup_error = None
+
+    def _launch(self):
+        context = multiprocessing.get_context("spawn")
+        # Synchronization primitives reach spawned workers only through the initializer
+        barrier = context.Barrier(self.workers)
+        pool = ProcessPoolExecutor(
+            max_workers=self.workers,
+            mp_context=context,
+            initializer=_init_unstructured_worker,
+            initargs=(barrier,),
+        )
+        started = time.perf_counter()
+        warmups = [pool.submit(unstructured_worker_warmup) for _ in range(self.workers)]
+
+        def warmed(_):
+            if not all(future.done() for future in warmups):
+                return
+            self.warmup_seconds = round(time.perf_counter() - started, 3)
+            errors = [str(future.exception()) for future in warmups if future.exception()]
+            self.warmup_error = errors[0] if errors else None
+            if self.warmup_error:
+                print(f"[!] Unstructured worker warm-up failed: {self.warmup_error}")
+            else:
+                print(f"[*] {self.workers} Unstructured worker(s) ready in {self.warmup_seconds}s")
+
+        for future in warmups:
+            future.add_done_callback(warmed)
+        return pool, warmups
+
+    @staticmethod
+    def _warm(warmups):
+        return all(future.done() and future.exception() is None for future in warmups)
+
+    def start(self):
+        if self._pool is None:
+            self._pool, self._warmup = self._launch()
+
+    @property
+    def ready(self):
+        return self._warmup is not None and self._warm(self._warmup)
+
+    def executor(self):
+        """Return the pool to run the next document on, recycling it when due."""
+        self.start()
+        if self._documents >= self.recycle_after and self._next is None:
+            print(f"[*] Recycling Unstructured workers after {self._documents} documents")
+            self._next = self._launch()
+        if self._next is not None and all(future.done() for future in self._next[1]):
+            # shutdown(wait=False) lets the retired pool finish what it already has
+            self._pool.shutdown(wait=False)
+            self._pool, self._warmup = self._next
+            self._next = None
+            self._documents = 0
+            self.recycles += 1
+        self._documents += 1
+        self.documents_total += 1
+        return self._pool
+
+    def stop(self):
+        for pool in (self._pool, self._next[0] if self._next else None):
+            if pool is not None:
+                pool.shutdown(wait=False, cancel_futures=True)
+        self._pool = self._warmup = self._next = None
+
+    def stats(self):
+        return {
+            "workers": self.workers,
+            "ready": self.ready,
+            "warmup_seconds": self.warmup_seconds,
+            "warmup_error": self.warmup_error,
+            "recycle_after": self.recycle_after,
+            "documents_on_current_pool": self._documents,
+            "documents_total": self.documents_total,
+            "recycles": self.recycles,
+            "replacement_warming": self._next is not None,
+        }
+
+_warmup_barrier = None
+
+def _init_unstructured_worker(barrier):
+    global _warmup_barrier
+    _warmup_barrier = barrier
+    if get_ocr_engine() is not None:
+        load_unstructured_models()
+
+def _ocr_worker_ready(_):
+    return os.getpid()
+
+def unstructured_worker_warmup():
+    """
+    Pool task run once per pool: models are loaded by the initializer. Also starts
+    UNSTRUCTURED_OCR_WARM processes of the OCR range pool; ProcessPoolExecutor only
+    spawns a process when a task finds no idle one, so the rest start on demand.
+    """
+    warm = min(UNSTRUCTURED_OCR_WARM, UNSTRUCTURED_OCR_WORKERS)
+    try:
+        if get_ocr_engine() is not None and UNSTRUCTURED_OCR_WORKERS > 1 and warm > 0:
+            list(get_ocr_pool().map(_ocr_worker_ready, range(warm)))
+        # Hold this process until every worker has a warm-up task, so none is left cold
+        _warmup_barrier.wait(timeout=UNSTRUCTURED_WARMUP_TIMEOUT)
+    except threading.BrokenBarrierError:
+        raise RuntimeError(f"Unstructured workers did not all warm up within {UNSTRUCTURED_WARMUP_TIMEOUT}s")
+    except BaseException:
+        # Release the workers already waiting instead of leaving them at the barrier
+        _warmup_barrier.abort()
+        raise
+    return os.getpid()
+
+unstructured_workers = UnstructuredWorkerPool(UNSTRUCTURED_WORKERS, UNSTRUCTURED_RECYCLE_DOCS)
+
+@app.on_event("startup")
+async def start_unstructured_workers():
+    if UNSTRUCTURED_AVAILABLE:
+        unstructured_workers.start()
+
+@app.on_event("shutdown")
+async def stop_unstructured_workers():
+    unstructured_workers.stop()
+
+class ExtractionJob:
+    def __init__(self, input_path, extract_id, method, filename, cache_key, options=None):
+        self.job_id = str(uuid.uuid4())
+        self.input_path = Path(input_path)
+        self.extract_id = extract_id
+        self.method = method
+        self.options = options or {}
+        self.filename = filename
+        self.cache_key = cache_key
+        self.status = "queued"
+        self.cache_hit = False
+        self.cancel_requested = False
+        self.submitted_at = time.time()
+        self.started_at = None
+        self.finished_at = None
+        self.result = None
+        self.done = asyncio.Event()
+        self._callbacks = []
+
+    def add_done_callback(self, callback):
+        """Call `callback(job)` when the job finishes (immediately if it already has)."""
+        if self.done.is_set():
+            callback(self)
+        else:
+            self._callbacks.append(callback)
+
+    def finish(self, status, result):
+        self.status = status
+        self.result = result
+        self.finished_at = time.time()
+        self.done.set()
+        for callback in self._callbacks:
+            callback(self)
+        self._callbacks.clear()
+
+    async def wait(self):
+        await self.done.wait()
+        return self.result
+
+    def to_dict(self):
+        now = time.time()
+        started = self.started_at or (self.finished_at if self.cache_hit else None)
+        return {
+            "job_id": self.job_id,
+            "extract_id": self.extract_id,
+            "status": self.status,
+            "method": self.method,
+            "profile": self.options.get("profile"),
+            "pages": self.options.get("pages"),
+            "filename": self.filename,
+            "cache_hit": self.cache_hit,
+            "wait_seconds": round((started or now) - self.submitted_at, 3),
+            "run_seconds": round((self.finished_at or now) - self.started_at, 3) if self.started_at else None,
+            "error": self.result.get("error") if self.result and not self.result.get("success") else None,
+        }
+
+class ExtractionJobQueue:
+    """
+    Bounded queue of extraction jobs feeding a dedicated process pool, so slow
+    documents never run on the web workers or the default thread executor.
+    Unstructured jobs have a queue and dispatchers of their own, sized to the
+    resident Unstructured workers, so they never hold the docling pool's slots.
+    """
+
+    def __init__(self, workers, max_queue, retention):
+        self.workers = workers
+        self.max_queue = max_queue
+        self.retention = retention
+        self.jobs = {}
+        self._queues = None  # lane -> asyncio.Queue
+        self._pool = None
+        self._dispatchers = []
+        self._converter_reports = {}  # worker pid -> its docling_converter_stats()
+        self._recent_waits = deque(maxlen=100)
+        self.running = 0
+        self.completed = 0
+        self.failed = 0
+        self.cancelled = 0
+        self.rejected = 0
+
+    @staticmethod
+    def _lane(job):
+        return "unstructured" if job.method == "unstructured" and UNSTRUCTURED_AVAILABLE else "pool"
+
+    def start(self):
+        if self._queues is not None:
+            return
+        self._queues = {lane: asyncio.Queue(maxsize=self.max_queue) for lane in ("pool", "unstructured")}
+        # spawn keeps the workers independent of the server's threads and event loop
+        self._pool = ProcessPoolExecutor(max_workers=self.workers, mp_context=multiprocessing.get_context("spawn"))
+        self._dispatchers = [asyncio.create_task(self._dispatch("pool")) for _ in range(self.workers)]
+        if UNSTRUCTURED_AVAILABLE:
+            self._dispatchers += [asyncio.create_task(self._dispatch("unstructured")) for _ in range(unstructured_workers.workers)]
+        print(f"[*] Extraction pool started with {self.workers} worker process(es)")
+
+    async def stop(self):
+        for task in self._dispatchers:
+            task.cancel()
+        self._dispatchers = []
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
+        self._queues = None
+
+    def add_finished(self, job, result):
+        """Register a job that completed without the pool (e.g. an extraction cache hit)."""
+        self._prune()
+        self.jobs[job.job_id] = job
+        self.completed += 1
+        job.finish("done", result)
+
+    def submit(self, job):
+        """Queue a job; raises asyncio.QueueFull when the queue is at capacity."""
+        self.start()
+        self._prune()
+        try:
+            self._queues[self._lane(job)].put_nowait(job)
+        except asyncio.QueueFull:
+            self.rejected += 1
+            raise
+        self.jobs[job.job_id] = job
+
+    def find_by_extract_id(self, extract_id):
+        for job in self.jobs.values():
+            if job.extract_id == extract_id:
+                return job
+        return None
+
+    def cancel(self, job_id):
+        """
+        Cancel a job. A queued job is cancelled at once; a running one moves to
+        "cancelling", its extractor stops at its next step and the result is
+        discarded when the worker returns.
+        """
+        job = self.jobs.get(job_id)
+        if job is None or job.done.is_set():
+            return job
+        job.cancel_requested = True
+        if job.status == "queued":
+            self._finish_cancelled(job)
+        else:
+            job.status = "cancelling"
+            ExtractionEvents.request_cancel(EXTRACTED_DIR / job.extract_id)
+        return job
+
+    def _finish_cancelled(self, job):
+        self.cancelled += 1
+        shutil.rmtree(EXTRACTED_DIR / job.extract_id, ignore_errors=True)
+        job.finish("cancelled", {"success": False, "error": "Job cancelled"})
+
+    def _prune(self):
+        cutoff = time.time() - self.retention
+        for job_id, job in list(self.jobs.items()):
+            if job.finished_at and job.finished_at < cutoff:
+                del self.jobs[job_id]
+
+    async def _dispatch(self, lane):
+        loop = asyncio.get_event_loop()
+        queue = self._queues[lane]
+        while True:
+            job = await queue.get()
+            try:
+                if job.cancel_requested:
+                    continue
+                job.status = "running"
+                job.started_at = time.time()
+                self._recent_waits.append(job.started_at - job.submitted_at)
+                self.running += 1
+                try:
+                    extractor = functools.partial(run_extractor, job.method, **job.options)
+                    # Unstructured jobs run on the resident workers that already hold its models
+                    pool = unstructured_workers.executor() if lane == "unstructured" else self._pool
+                    result = await loop.run_in_executor(
+                        pool, extractor, str(job.input_path), job.extract_id
+                    )
+                except Exception as e:
+                    result = {"success": False, "error": str(e)}
+                finally:
+                    self.running -= 1
+                # Stage histograms live in this process; the worker only measured them
+                for stage, samples in result.pop("stages", {}).items():
+                    for seconds in samples:
+                        observe_stage(stage, seconds)
+                if "converters" in result:
+                    pid, converters = result.pop("converters")
+                    self._converter_reports[pid] = converters
+
+                if job.cancel_requested:
+                    self._finish_cancelled(job)
+                elif result["success"]:
+                    await loop.run_in_executor(
+                        None, extraction_cache.store, job.cache_key, Path(result["output_path"]),
+                        job.extract_id, result["summary"]
+                    )
+                    await loop.run_in_executor(
+                        None, search_index.add, job.extract_id, job.filename, Path(result["output_path"])
+                    )
+                    self.completed += 1
+                    job.finish("done", result)
+                else:
+                    self.failed += 1
+                    job.finish("failed", result)
+            finally:
+                queue.task_done()
+
+    def converter_stats(self):
+        """Docling converter counters summed over the worker processes (and this one) per configuration."""
+        totals = {}
+        reports = dict(self._converter_reports)
+        reports[os.getpid()] = docling_converter_stats()
+        for converters in reports.values():
+            for converter in converters:
+                key = tuple(converter[name] for name in ("do_ocr", "do_table_structure", "generate_picture_images", "table_mode"))
+                total = totals.setdefault(key, dict(converter, converters=0, cold_runs=0, warm_runs=0, processes=0))
+                total["converters"] += converter.get("converters", 0)
+                total["cold_runs"] += converter["cold_runs"]
+                total["warm_runs"] += converter["warm_runs"]
+                total["processes"] += 1
+        return list(totals.values())
+
+    def stats(self):
+        waits = list(self._recent_waits)
+        queued = [job for job in self.jobs.values() if job.status == "queued"]
+        now = time.time()
+        return {
+            "workers": self.workers,
+            "queue_depth": sum(queue.qsize() for queue in self._queues.values()) if self._queues is not None else 0,
+            "queue_capacity": self.max_queue,
+            "running": self.running,
+            "completed": self.completed,
+            "failed": self.failed,
+            "cancelled": self.cancelled,
+            "rejected": self.rejected,
+            "avg_wait_seconds": round(sum(waits) / len(waits), 3) if waits else 0.0,
+            "max_wait_seconds": round(max(waits), 3) if waits else 0.0,
+            "oldest_queued_seconds": round(now - min(job.submitted_at for job in queued), 3) if queued else 0.0,
+        }
+
+extraction_jobs = ExtractionJobQueue(EXTRACTION_WORKERS, EXTRACTION_QUEUE_SIZE, EXTRACTION_JOB_RETENTION)
+
+@app.on_event("startup")
+async def start_extraction_jobs():
+    extraction_jobs.start()
+
+@app.on_event("shutdown")
+async def stop_extraction_jobs():
+    await extraction_jobs.stop()
+
+async def submit_extraction(input_path, extract_id, method, filename, file_hash, progressive=False, profile="full",
+                            pages=None):
+    """
+    Create an extraction job for a saved upload. Cache hits complete immediately;
+    everything else is queued for the extraction pool. `progressive` makes docling
+    convert in DOCLING_STREAM_PAGES steps so the viewer can render pages early;
+    `profile` picks the pipeline configuration (see EXTRACTION_PROFILES) and
+    `pages` ("1-3,10") limits extraction to those pages.
+    Raises HTTPException(400) for an invalid page selection and 503 when the queue is full.
+    """
+    if method not in EXTRACTORS:
+        method = "docling"  # default to docling
+    # Triage and the profile change the output, so they are part of the cache key
+    # (stream_pages only changes delivery and is left out of it, see ExtractionCache)
+    options = {"triage": PAGE_TRIAGE, "profile": profile}
+    if progressive and method == "docling" and DOCLING_STREAM_PAGES > 0:
+        options["stream_pages"] = DOCLING_STREAM_PAGES
+    loop = asyncio.get_event_loop()
+    if pages:
+        page_count = await loop.run_in_executor(None, pdf_page_count, input_path)
+        try:
+            page_numbers = parse_page_ranges(pages, page_count)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        # Normalized, so equivalent selections share cache entries; all pages is no selection
+        if len(page_numbers) < page_count:
+            options["pages"] = format_page_list(page_numbers)
+    cache_key = extraction_cache.key(file_hash, method, options)
+    janitor.register(EXTRACTED_DIR / extract_id)
+    job = ExtractionJob(input_path, extract_id, method, filename, cache_key, options)
+
+    # Serve repeat uploads of the same PDF from the extraction cache
+    cached_summary = await loop.run_in_executor(None, extraction_cache.restore, cache_key, extract_id)
+    if cached_summary is not None:
+        print(f"[✓] Extraction cache hit for {filename}")
+        await loop.run_in_executor(None, search_index.add, extract_id, filename, EXTRACTED_DIR / extract_id)
+        job.cache_hit = True
+        extraction_jobs.add_finished(job, {
+            "success": True,
+            "extract_id": extract_id,
+            "summary": cached_summary,
+            "output_path": str(EXTRACTED_DIR / extract_id)
+        })
+        return job
+
+    try:
+        extraction_jobs.submit(job)
+    except asyncio.QueueFull:
+        raise HTTPException(
+            status_code=503,
+            detail="Extraction queue is full, please retry later",
+            headers={"Retry-After": "30"}
+        )
+    return job
+
+
 @app.get("/", response_class=HTMLResponse)
 async def index(request: Request):
     return templates.TemplateResponse("index.html", {"request": request})
 
+def pdf_name_for_url(url):
+    # Clean URL filename
+    safe_filename = re.sub(r'[\\/*?:"<>|]', '_', url.split('//')[-1])[:50]
+    if not safe_filename.endswith('.pdf'): safe_filename += '.pdf'
+    return safe_filename
+
+def pdf_name_for_file(filename):
+    # Clean original filename
+    original_name = Path(filename).stem
+    safe_name = re.sub(r'[\\/*?:"<>|]', '_', original_name)
+    return f"{safe_name}.pdf"
+
 @app.post("/convert-url")
 async def convert_url(background_tasks: BackgroundTasks, url: str = Form(...)):
     file_id = str(uuid.uuid4())
     output_path = OUTPUT_DIR / f"{file_id}.pdf"
+    janitor.register(output_path)
     success = await convert_web_to_pdf(url, output_path)
     if success:
-        background_tasks.add_task(cleanup_files, None, str(output_path))
-        # Clean URL filename
-        safe_filename = re.sub(r'[\\/*?:"<>|]', '_', url.split('//')[-1])[:50]
-        if not safe_filename.endswith('.pdf'): safe_filename += '.pdf'
-        return FileResponse(output_path, filename=safe_filename, media_type='application/pdf')
+        background_tasks.add_task(janitor.track, output_path, CONVERT_TTL)
+        return FileResponse(output_path, filename=pdf_name_for_url(url), media_type='application/pdf')
+    janitor.track(output_path, 0)
     raise HTTPException(status_code=500, detail="Conversion failed")
 
+def single_upload_dest(prefix, require_pdf=False):
+    """`dest_for` for endpoints taking one `file` field: UPLOAD_DIR/<prefix>_<filename>."""
+    def dest_for(field, filename):
+        if field != "file":
+            raise HTTPException(status_code=400, detail=f"Unexpected file field {field}")
+        if require_pdf and not filename.lower().endswith('.pdf'):
+            raise HTTPException(status_code=400, detail="Only PDF files are supported")
+        path = UPLOAD_DIR / f"{prefix}_{filename}"
+        janitor.register(path)
+        return path
+    return dest_for
+
+def form_upload(form):
+    file = form.get("file")
+    if not isinstance(file, ReceivedUpload):
+        raise HTTPException(status_code=400, detail="No file uploaded")
+    return file
+
 @app.post("/convert-file")
-async def convert_upload(background_tasks: BackgroundTasks, file: UploadFile = File(...)):
+async def convert_upload(request: Request, background_tasks: BackgroundTasks):
+    """Convert an uploaded document or image (`file`) to PDF."""
     file_id = str(uuid.uuid4())
-    input_path = UPLOAD_DIR / f"{file_id}_{file.filename}"
+    file = form_upload(await receive_upload_form(request, single_upload_dest(file_id)))
+    input_path = file.path
     output_path = OUTPUT_DIR / f"{file_id}.pdf"
-    with open(input_path, "wb") as buffer: shutil.copyfileobj(file.file, buffer)
+    janitor.register(output_path)
     success = await convert_file_to_pdf(str(input_path), str(output_path))
-    background_tasks.add_task(cleanup_files, str(input_path), str(output_path))
+    janitor.track(input_path, CONVERT_TTL)
+    background_tasks.add_task(janitor.track, output_path, CONVERT_TTL)
     if success:
-        # Clean original filename
-        original_name = Path(file.filename).stem
-        safe_name = re.sub(r'[\\/*?:"<>|]', '_', original_name)
-        return FileResponse(output_path, filename=f"{safe_name}.pdf", media_type='application/pdf')
+        return FileResponse(output_path, filename=pdf_name_for_file(file.filename), media_type='application/pdf')
     raise HTTPException(status_code=500, detail="Conversion failed (Docker uses LibreOffice)")
 
+def merge_pdfs(pdf_paths, output_path):
+    """Concatenate PDFs into one document, in the given order."""
+    merged = pdfium.PdfDocument.new()
+    try:
+        for pdf_path in pdf_paths:
+            source = pdfium.PdfDocument(str(pdf_path))
+            try:
+                merged.import_pages(source)
+            finally:
+                source.close()
+        merged.save(str(output_path))
+    finally:
+        merged.close()
+
+async def convert_batch_item(item, output_path, limits):
+    """Convert one batch item under its engine's concurrency limit and fill in its report entry."""
+    started = time.perf_counter()
+    async with limits[item["engine"]]:
+        try:
+            if item["engine"] == "web":
+                success = await convert_web_to_pdf(item["source"], output_path)
+            else:
+                success = await convert_file_to_pdf(item["input_path"], output_path)
+        except Exception as e:
+            print(f"[X] Batch item {item['index']} failed: {e}")
+            success = False
+    item["seconds"] = round(time.perf_counter() - started, 3)
+    item["success"] = bool(success) and output_path.exists()
+    if item["success"]:
+        item["filename"] = output_path.name
+    else:
+        item["error"] = "Conversion failed"
+
+@app.post("/convert-batch")
+async def convert_batch(request: Request, background_tasks: BackgroundTasks):
+    """
+    Convert several uploads (`files`) and URLs (`urls`, repeated field or one per
+    line) concurrently, bounded per engine (image, office, web).
+    output=zip (default) returns a ZIP of PDFs plus batch_report.json;
+    output=merged returns one PDF of the successful items in input order, with
+    the per-item report at the URL in the X-Batch-Report-Url header.
+    Both set X-Batch-Succeeded and X-Batch-Failed.
+    """
+    batch_id = str(uuid.uuid4())
+    upload_dir = UPLOAD_DIR / f"batch_{batch_id}"
+    batch_dir = OUTPUT_DIR / f"batch_{batch_id}"
+    upload_dir.mkdir()
+    janitor.register(upload_dir)
+    received = 0
+
+    def dest_for(field, filename):
+        nonlocal received
+        if field != "files":
+            raise HTTPException(status_code=400, detail=f"Unexpected file field {field}")
+        received += 1
+        if received > BATCH_MAX_ITEMS:
+            raise HTTPException(status_code=413, detail=f"Batch exceeds the {BATCH_MAX_ITEMS} item limit")
+        return upload_dir / f"{received:03d}_{Path(filename).name}"
+
+    try:
+        form = await receive_upload_form(request, dest_for, per_file_errors=True)
+        output = form.get("output", "zip")
+        if output not in ("zip", "merged"):
+            raise HTTPException(status_code=400, detail="output must be 'zip' or 'merged'")
+
+        # Keep the order in which files and URLs were sent
+        items = []
+        for key, value in form.multi_items():
+            if key == "files" and isinstance(value, ReceivedUpload):
+                items.append({"kind": "file", "source": value.filename, "upload": value})
+            elif key == "urls" and isinstance(value, str):
+                items.extend({"kind": "url", "source": url.strip()} for url in value.splitlines() if url.strip())
+        if not items:
+            raise HTTPException(status_code=400, detail="No files or URLs provided")
+        if len(items) > BATCH_MAX_ITEMS:
+            raise HTTPException(status_code=413, detail=f"Batch exceeds the {BATCH_MAX_ITEMS} item limit")
+    except HTTPException:
+        shutil.rmtree(upload_dir, ignore_errors=True)
+        raise
+
+    batch_dir.mkdir()
+    janitor.register(batch_dir)
+    try:
+        pending = []
+        for index, item in enumerate(items, start=1):
+            item["index"] = index
+            if item["kind"] == "url":
+                item["engine"] = "web"
+                name = pdf_name_for_url(item["source"])
+            else:
+                upload = item.pop("upload")
+                input_path = upload.path
+                item["engine"] = "image" if input_path.suffix.lower() in IMAGE_EXTENSIONS else "office"
+                if upload.error:
+                    item["success"] = False
+                    item["error"] = upload.error
+                    continue
+                item["input_path"] = input_path
+                name = pdf_name_for_file(upload.filename)
+            pending.append((item, batch_dir / f"{index:03d}_{name}"))
+
+        limits = {engine: asyncio.Semaphore(limit) for engine, limit in BATCH_CONCURRENCY.items()}
+        print(f"[*] Batch {batch_id}: converting {len(pending)} item(s)")
+        await asyncio.gather(*(convert_batch_item(item, output_path, limits) for item, output_path in pending))
+    finally:
+        janitor.track(upload_dir, CONVERT_TTL)
+
+    for item in items:
+        item.pop("input_path", None)
+    converted = [item for item in items if item["success"]]
+    report = {
+        "batch_id": batch_id,
+        "total": len(items),
+        "succeeded": len(converted),
+        "failed": len(items) - len(converted),
+        "items": items,
+    }
+    print(f"[✓] Batch {batch_id}: {report['succeeded']}/{report['total']} converted")
+    background_tasks.add_task(janitor.track, batch_dir, CONVERT_TTL)
+    if not converted:
+        return JSONResponse(report, status_code=422)
+
+    # The report is kept next to the batch for /batch-report and linked into it for the ZIP
+    report_file = batch_report_path(batch_id)
+    with open(report_file, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+    _link_or_copy(report_file, batch_dir / "batch_report.json")
+    janitor.track(report_file, BATCH_REPORT_TTL)
+    # Only counts go in headers; a full report can outgrow proxy header buffers
+    headers = {"X-Batch-Succeeded": str(report["succeeded"]), "X-Batch-Failed": str(report["failed"])}
+
+    if output == "merged":
+        merged_path = batch_dir / "merged.pdf"
+        loop = asyncio.get_event_loop()
+        await loop.run_in_executor(
+            None, merge_pdfs, [batch_dir / item["filename"] for item in converted], merged_path
+        )
+        headers["X-Batch-Report-Url"] = f"/batch-report/{batch_id}"
+        return FileResponse(merged_path, filename="merged.pdf", media_type='application/pdf', headers=headers)
+
+    return zip_stream_response(batch_dir, "converted.zip", headers=headers)
+
+def batch_report_path(batch_id):
+    return OUTPUT_DIR / f"batch_{Path(batch_id).name}_report.json"
+
+@app.get("/batch-report/{batch_id}")
+async def get_batch_report(batch_id: str):
+    """Per-item report of a /convert-batch request, kept for BATCH_REPORT_TTL seconds."""
+    report_file = batch_report_path(batch_id)
+    if not report_file.exists():
+        raise HTTPException(status_code=404, detail="Batch report not found")
+    janitor.touch(report_file)
+    return FileResponse(report_file, media_type="application/json")
+
+async def receive_extraction_form(request, extract_id):
+    """
+    Receive the PDF upload and fields of an extraction request. Returns
+    (upload, fields); the upload is removed again if the fields are invalid.
+    """
+    form = await receive_upload_form(request, single_upload_dest(extract_id, require_pdf=True), require_pdf=True)
+    file = form_upload(form)
+    fields = {name: form.get(name) or default for name, default in
+              (("view_mode", "download"), ("method", "docling"), ("profile", "full"), ("pages", None))}
+    try:
+        if fields["profile"] not in EXTRACTION_PROFILES:
+            raise HTTPException(status_code=400, detail=f"Unknown profile, use one of: {', '.join(EXTRACTION_PROFILES)}")
+        # Check if unstructured method is requested but not available
+        if fields["method"] == "unstructured" and not UNSTRUCTURED_AVAILABLE:
+            raise HTTPException(
+                status_code=400,
+                detail="Unstructured library not installed. Please install with: pip install unstructured[all-docs]"
+            )
+    except HTTPException:
+        janitor.track(file.path, 0)
+        raise
+    return file, fields
+
 @app.post("/extract-pdf")
-async def extract_pdf(
-    background_tasks: BackgroundTasks, 
-    file: UploadFile = File(...), 
-    view_mode: str = Form("download"),
-    method: str = Form("docling")
-):
+async def extract_pdf(request: Request, background_tasks: BackgroundTasks):
     """
     Extract text, tables, and images from uploaded PDF file.
     Returns either a ZIP file or JSON with extract_id for viewing.
     
-    Parameters:
+    Parameters (multipart form):
     - file: PDF file to extract
     - view_mode: "view" or "download"
     - method: "docling" or "unstructured" (extraction method)
+    - profile: "full", "fast" (cheaper table model) or "text-only" (no table or picture models)
+    - pages: page selection such as "1-3,10" (default: all pages)
     """
-    if not file.filename.lower().endswith('.pdf'):
-        raise HTTPException(status_code=400, detail="Only PDF files are supported")
-    
-    # Check if unstructured method is requested but not available
-    if method == "unstructured" and not UNSTRUCTURED_AVAILABLE:
-        raise HTTPException(
-            status_code=400, 
-            detail="Unstructured library not installed. Please install with: pip install unstructured[all-docs]"
-        )
-    
     extract_id = str(uuid.uuid4())
-    input_path = UPLOAD_DIR / f"{extract_id}_{file.filename}"
+    # The upload is written and checked as it arrives
+    file, fields = await receive_extraction_form(request, extract_id)
+    input_path = file.path
+    file_hash = file.sha256
+    view_mode, method, profile, pages = fields["view_mode"], fields["method"], fields["profile"], fields["pages"]
     
-    # Save uploaded file
-    with open(input_path, "wb") as buffer:
-        shutil.copyfileobj(file.file, buffer)
-    
-    # Run extraction in thread pool to avoid blocking
-    loop = asyncio.get_event_loop()
-    
-    # Choose extraction method
-    if method == "unstructured":
-        result = await loop.run_in_executor(None, extract_from_pdf_unstructured, str(input_path), extract_id)
-    else:  # default to docling
-        result = await loop.run_in_executor(None, extract_from_pdf, str(input_path), extract_id)
+    # Run extraction on the extraction pool to avoid blocking
+    try:
+        job = await submit_extraction(
+            input_path, extract_id, method, file.filename, file_hash, profile=profile, pages=pages
+        )
+        result = await job.wait()
+    finally:
+        # The upload is no longer needed once extraction has finished
+        janitor.track(input_path, CONVERT_TTL)
     
     if not result["success"]:
-        background_tasks.add_task(cleanup_files, str(input_path))
+        janitor.track(EXTRACTED_DIR / extract_id, CONVERT_TTL)
         raise HTTPException(status_code=500, detail=f"Extraction failed: {result.get('error', 'Unknown error')}")
     
     # If view mode, return JSON with extract_id
     if view_mode == "view":
-        # Schedule cleanup after 10 minutes for view mode
-        async def cleanup_extraction():
-            await asyncio.sleep(600)  # Keep for 10 minutes
-            try:
-                if input_path.exists():
-                    os.remove(input_path)
-            except Exception as e:
-                print(f"Cleanup error: {e}")
-        
-        background_tasks.add_task(cleanup_extraction)
+        # Keep the results around for the viewer
+        janitor.track(EXTRACTED_DIR / extract_id, EXTRACTION_VIEW_TTL)
         
         return JSONResponse({
             "success": True,
@@ -661,45 +4085,99 @@ async def extract_pdf(
             "view_url": f"/view-extraction/{extract_id}"
         })
     
-    # Otherwise, create and return ZIP file (original behavior)
+    # Otherwise, stream the extraction as a ZIP file
     output_base = Path(result["output_path"])
-    zip_filename = f"extracted_{extract_id}.zip"
-    zip_path = EXTRACTED_DIR / zip_filename
-    
-    with zipfile.ZipFile(zip_path, 'w', zipfile.ZIP_DEFLATED) as zipf:
-        for root, dirs, files in os.walk(output_base):
-            for file_name in files:
-                file_path = Path(root) / file_name
-                arcname = file_path.relative_to(output_base)
-                zipf.write(file_path, arcname)
-    
-    # Schedule cleanup
-    async def cleanup_extraction():
-        await asyncio.sleep(120)  # Keep for 2 minutes
-        try:
-            if input_path.exists():
-                os.remove(input_path)
-            if output_base.exists():
-                shutil.rmtree(output_base)
-            if zip_path.exists():
-                os.remove(zip_path)
-        except Exception as e:
-            print(f"Cleanup error: {e}")
     
-    background_tasks.add_task(cleanup_extraction)
+    # Schedule cleanup once the ZIP has been streamed
+    background_tasks.add_task(janitor.track, output_base, EXTRACTION_DOWNLOAD_TTL)
     
     # Return ZIP file
     original_name = Path(file.filename).stem
     safe_name = re.sub(r'[\\/*?:"<>|]', '_', original_name)
-    return FileResponse(
-        zip_path, 
-        filename=f"{safe_name}_extracted.zip", 
-        media_type='application/zip',
+    return zip_stream_response(
+        output_base,
+        f"{safe_name}_extracted.zip",
         headers={
             "X-Extraction-Summary": f"Text:2,Tables:{result['summary']['tables_count']},Images:{result['summary']['images_count']}"
         }
     )
 
+@app.post("/extract-jobs", status_code=202)
+async def submit_extract_job(request: Request):
+    """
+    Queue a PDF extraction and return a job id right away. Takes the same form
+    fields as /extract-pdf except view_mode.
+    Poll /extract-jobs/{job_id} for status and fetch /extract-jobs/{job_id}/result when done,
+    or follow per-page progress on /extraction-events/{extract_id}.
+    """
+    extract_id = str(uuid.uuid4())
+    file, fields = await receive_extraction_form(request, extract_id)
+    input_path = file.path
+    file_hash = file.sha256
+    method, profile, pages = fields["method"], fields["profile"], fields["pages"]
+    
+    try:
+        job = await submit_extraction(
+            input_path, extract_id, method, file.filename, file_hash, progressive=True, profile=profile, pages=pages
+        )
+    except HTTPException:
+        janitor.track(input_path, 0)
+        raise
+    
+    # Once the job finishes the upload can go; results follow the viewer TTL
+    def track_job_artifacts(job):
+        janitor.track(input_path, 0)
+        janitor.track(EXTRACTED_DIR / job.extract_id, EXTRACTION_VIEW_TTL)
+    
+    job.add_done_callback(track_job_artifacts)
+    
+    return JSONResponse(dict(
+        job.to_dict(),
+        status_url=f"/extract-jobs/{job.job_id}",
+        result_url=f"/extract-jobs/{job.job_id}/result",
+        events_url=f"/extraction-events/{job.extract_id}",
+        view_url=f"/view-extraction/{job.extract_id}"
+    ), status_code=202)
+
+@app.get("/extract-jobs/{job_id}")
+async def get_extract_job(job_id: str):
+    """Get the status of an extraction job."""
+    job = extraction_jobs.jobs.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return JSONResponse(job.to_dict())
+
+@app.get("/extract-jobs/{job_id}/result")
+async def get_extract_job_result(job_id: str):
+    """Get the result of a finished extraction job."""
+    job = extraction_jobs.jobs.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    
+    if job.status in ("queued", "running", "cancelling"):
+        return JSONResponse(job.to_dict(), status_code=202)
+    if job.status == "cancelled":
+        raise HTTPException(status_code=410, detail="Job was cancelled")
+    if job.status == "failed":
+        raise HTTPException(status_code=500, detail=f"Extraction failed: {job.result.get('error', 'Unknown error')}")
+    
+    return JSONResponse({
+        "success": True,
+        "job_id": job.job_id,
+        "extract_id": job.extract_id,
+        "summary": job.result["summary"],
+        "view_url": f"/view-extraction/{job.extract_id}",
+        "download_url": f"/download-extraction-zip/{job.extract_id}"
+    })
+
+@app.delete("/extract-jobs/{job_id}")
+async def cancel_extract_job(job_id: str):
+    """Cancel a queued or running extraction job (202 while a running job is still stopping)."""
+    job = extraction_jobs.cancel(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return JSONResponse(job.to_dict(), status_code=202 if job.status == "cancelling" else 200)
+
 @app.get("/extraction-info/{extract_id}")
 async def get_extraction_info(extract_id: str):
     """Get information about an extraction result."""
@@ -722,8 +4200,13 @@ async def get_extraction_info(extract_id: str):
 async def view_extraction(request: Request, extract_id: str):
     """View extraction results in browser."""
     output_base = EXTRACTED_DIR / extract_id
+    janitor.touch(output_base)
     
-    if not output_base.exists():
+    # Extractions still in progress are rendered from /extraction-events
+    job = extraction_jobs.find_by_extract_id(extract_id)
+    streaming = job is not None and not job.done.is_set()
+    
+    if not output_base.exists() and not streaming:
         raise HTTPException(status_code=404, detail="Extraction not found")
     
     # Get summary info
@@ -737,26 +4220,13 @@ async def view_extraction(request: Request, extract_id: str):
     tables_dir = output_base / "tables"
     images_dir = output_base / "images"
     
+    # While streaming, the page fills these lists from the event stream
     tables = []
-    if tables_dir.exists():
-        # Get CSV files
-        csv_files = sorted([f.name for f in tables_dir.glob("*.csv")])
-        # Get HTML files only if no CSV with same base name exists
-        html_files = sorted([f.name for f in tables_dir.glob("*.html")])
-        
-        # Combine, prioritize CSV over HTML for same table
-        seen_bases = set()
-        for csv in csv_files:
-            tables.append(csv)
-            seen_bases.add(csv.rsplit('.', 1)[0])
-        
-        for html in html_files:
-            base = html.rsplit('.', 1)[0]
-            if base not in seen_bases:
-                tables.append(html)
+    if tables_dir.exists() and not streaming:
+        tables = list_tables(tables_dir)
     
     images = []
-    if images_dir.exists():
+    if images_dir.exists() and not streaming:
         images = sorted([f.name for f in images_dir.glob("*.png")]) + \
                  sorted([f.name for f in images_dir.glob("*.jpg")]) + \
                  sorted([f.name for f in images_dir.glob("*.jpeg")])
@@ -766,13 +4236,69 @@ async def view_extraction(request: Request, extract_id: str):
         "extract_id": extract_id,
         "summary": summary_text,
         "tables": tables,
-        "images": images
+        "images": images,
+        "streaming": streaming
     })
 
+@app.get("/extraction-events/{extract_id}")
+async def extraction_events(extract_id: str):
+    """
+    Stream an extraction's page, table and image events as Server-Sent Events.
+    Finished extractions replay their events; the stream ends with a done or error event.
+    """
+    output_base = EXTRACTED_DIR / extract_id
+    events_file = output_base / ExtractionEvents.FILENAME
+    job = extraction_jobs.find_by_extract_id(extract_id)
+    
+    if job is None and not output_base.exists():
+        raise HTTPException(status_code=404, detail="Extraction not found")
+    
+    def read_from(offset):
+        if not events_file.exists():
+            return offset, []
+        with open(events_file, "rb") as f:
+            f.seek(offset)
+            data = f.read()
+        # Only hand out complete lines; a partial line is picked up next poll
+        end = data.rfind(b"\n") + 1
+        return offset + end, data[:end].decode("utf-8").splitlines()
+    
+    async def event_stream():
+        loop = asyncio.get_event_loop()
+        offset = 0
+        while True:
+            finished = job is None or job.done.is_set()
+            offset, lines = await loop.run_in_executor(None, read_from, offset)
+            for line in lines:
+                yield f"data: {line}\n\n"
+                if json.loads(line).get("type") in ("done", "error"):
+                    return
+            if finished:
+                # Job ended without recording a terminal event (e.g. cancelled or crashed)
+                if job is not None and job.result and not job.result.get("success"):
+                    error = json.dumps({"type": "error", "error": job.result.get("error", "Unknown error")})
+                    yield f"data: {error}\n\n"
+                else:
+                    summary = json.dumps({"type": "done", "summary": job.result.get("summary") if job else None})
+                    yield f"data: {summary}\n\n"
+                return
+            await asyncio.sleep(0.5)
+    
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
 @app.get("/get-extracted-text/{extract_id}")
-async def get_extracted_text(extract_id: str, format: str = "md"):
-    """Get extracted text in markdown or plain text format."""
+async def get_extracted_text(extract_id: str, format: str = "md", page: int = None,
+                             page_range: str = Query(None, alias="range")):
+    """
+    Get extracted text in markdown or plain text format. With `page` (3) or
+    `range` ("3-7,10") only those pages are read, via the page offset index.
+    """
     output_base = EXTRACTED_DIR / extract_id
+    janitor.touch(output_base)
     text_dir = output_base / "text"
     
     if format == "md":
@@ -783,18 +4309,64 @@ async def get_extracted_text(extract_id: str, format: str = "md"):
     if not text_file.exists():
         raise HTTPException(status_code=404, detail="Text file not found")
     
+    if page is not None or page_range is not None:
+        loop = asyncio.get_event_loop()
+        index = await loop.run_in_executor(None, text_indexes.get, text_dir)
+        if index is None:
+            raise HTTPException(status_code=404, detail="No page index for this extraction")
+        offsets = index["md" if format == "md" else "txt"]
+        # Pages without text have no offsets, so validate against the document itself
+        page_count = index.get("page_count") or max((page_no for page_no, _, _ in offsets), default=0)
+        try:
+            page_numbers = parse_page_ranges(page_range if page_range is not None else str(page), page_count)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        content, pages = await loop.run_in_executor(
+            None, read_text_pages, text_file, offsets, set(page_numbers)
+        )
+        # Pages without any text have no entry, so `pages` can be narrower than requested
+        return JSONResponse({
+            "content": content,
+            "format": format,
+            "pages": format_page_list(pages),
+            "page_count": page_count
+        })
+    
     with open(text_file, "r", encoding="utf-8") as f:
         content = f.read()
     
     return JSONResponse({"content": content, "format": format})
 
+@app.get("/search")
+async def search_extractions(q: str, limit: int = 20, extract_id: str = None):
+    """Full-text search over the pages of all extractions (or one, with `extract_id`)."""
+    if not q.strip():
+        raise HTTPException(status_code=400, detail="Empty search query")
+    if not search_index.available:
+        raise HTTPException(status_code=503, detail="Search index is not available")
+    limit = max(1, min(limit, 100))
+    start = time.perf_counter()
+    loop = asyncio.get_event_loop()
+    hits = await loop.run_in_executor(None, search_index.search, q, limit, extract_id)
+    for hit in hits:
+        hit["view_url"] = f"/view-extraction/{hit['extract_id']}"
+    return JSONResponse({
+        "query": q,
+        "took_ms": round((time.perf_counter() - start) * 1000, 2),
+        "hits": hits
+    })
+
 @app.get("/serve-table/{extract_id}/{filename}")
 async def serve_table(extract_id: str, filename: str):
     """Serve table CSV or HTML file."""
     output_base = EXTRACTED_DIR / extract_id
-    table_file = output_base / "tables" / filename
+    janitor.touch(output_base)
+    
+    # CSV/Excel/HTML exports are rendered from the canonical table on first request
+    loop = asyncio.get_event_loop()
+    table_file = await loop.run_in_executor(None, materialize_table, output_base / "tables", Path(filename).name)
     
-    if not table_file.exists():
+    if table_file is None:
         raise HTTPException(status_code=404, detail="Table file not found")
     
     # Determine media type
@@ -805,53 +4377,137 @@ async def serve_table(extract_id: str, filename: str):
     else:
         return FileResponse(table_file, filename=filename)
 
+# Explicit, since slim images have no /etc/mime.types and mimetypes does not know .webp
+IMAGE_MEDIA_TYPES = {".png": "image/png", ".jpg": "image/jpeg", ".jpeg": "image/jpeg", ".webp": "image/webp"}
+
 @app.get("/serve-image/{extract_id}/{filename}")
-async def serve_image(extract_id: str, filename: str):
-    """Serve extracted image file."""
+async def serve_image(extract_id: str, filename: str, size: str = None):
+    """
+    Serve extracted image file.
+    size: "thumb" or "medium" for a WebP variant, omitted for the original.
+    """
     output_base = EXTRACTED_DIR / extract_id
-    image_file = output_base / "images" / filename
+    janitor.touch(output_base)
+    image_file = output_base / "images" / Path(filename).name
+    
+    if size in IMAGE_VARIANT_SIZES:
+        loop = asyncio.get_event_loop()
+        image_file = await loop.run_in_executor(None, image_variant, image_file, size)
+    elif size is not None:
+        raise HTTPException(status_code=400, detail=f"Unknown size, use one of: {', '.join(IMAGE_VARIANT_SIZES)}")
     
-    if not image_file.exists():
+    if image_file is None or not image_file.exists():
         raise HTTPException(status_code=404, detail="Image not found")
     
-    return FileResponse(image_file, media_type="image/png")
+    media_type = IMAGE_MEDIA_TYPES.get(image_file.suffix.lower(), "application/octet-stream")
+    return FileResponse(image_file, media_type=media_type)
 
 @app.get("/download-extraction-zip/{extract_id}")
-async def download_extraction_zip(extract_id: str, background_tasks: BackgroundTasks):
+async def download_extraction_zip(extract_id: str):
     """Download extraction results as ZIP file."""
     output_base = EXTRACTED_DIR / extract_id
+    janitor.touch(output_base)
     
     if not output_base.exists():
         raise HTTPException(status_code=404, detail="Extraction not found")
     
-    # Create ZIP file
-    zip_filename = f"extracted_{extract_id}.zip"
-    zip_path = EXTRACTED_DIR / zip_filename
-    
-    with zipfile.ZipFile(zip_path, 'w', zipfile.ZIP_DEFLATED) as zipf:
-        for root, dirs, files in os.walk(output_base):
-            for file_name in files:
-                file_path = Path(root) / file_name
-                arcname = file_path.relative_to(output_base)
-                zipf.write(file_path, arcname)
-    
-    # Schedule cleanup
-    async def cleanup_zip():
-        await asyncio.sleep(60)  # Keep for 1 minute
-        try:
-            if zip_path.exists():
-                os.remove(zip_path)
-        except Exception as e:
-            print(f"Cleanup error: {e}")
-    
-    background_tasks.add_task(cleanup_zip)
-    
-    return FileResponse(
-        zip_path,
-        filename=f"extraction_{extract_id}.zip",
-        media_type='application/zip'
+    return zip_stream_response(output_base, f"extraction_{extract_id}.zip")
+
+class EngineMetricsCollector:
+    """Exports engine gauges, read from the components' stats() at scrape time."""
+
+    def collect(self):
+        jobs = extraction_jobs.stats()
+        browser = browser_manager.stats()
+        assets = render_assets.stats()
+        libreoffice = libreoffice_pool.stats()
+        janitor_stats = janitor.stats()
+        gauges = [
+            ("allto_pdf_extraction_jobs_running", "Extractions running in worker processes", jobs["running"]),
+            ("allto_pdf_extraction_queue_depth", "Extraction jobs waiting for a worker", jobs["queue_depth"]),
+            ("allto_pdf_extraction_queue_capacity", "Extraction job queue capacity", jobs["queue_capacity"]),
+            ("allto_pdf_extraction_oldest_queued_seconds", "Age of the oldest queued extraction", jobs["oldest_queued_seconds"]),
+            ("allto_pdf_browser_open_contexts", "Open Chromium contexts", browser["open_contexts"]),
+            ("allto_pdf_browser_max_contexts", "Chromium context limit", browser["max_contexts"]),
+            ("allto_pdf_render_asset_hit_ratio", "Render asset cache hit ratio", assets["hit_ratio"]),
+            ("allto_pdf_render_asset_bytes_saved", "Bytes served from the render asset cache", assets["bytes_saved"]),
+            ("allto_pdf_render_blocked_requests", "Render requests blocked by RENDER_BLOCK", assets["blocked_requests"]),
+            ("allto_pdf_unstructured_workers_ready", "1 once the Unstructured workers have loaded their models", int(unstructured_workers.ready)),
+            ("allto_pdf_libreoffice_idle_workers", "Idle LibreOffice workers", libreoffice["idle"]),
+            ("allto_pdf_libreoffice_workers", "LibreOffice workers", libreoffice["workers"]),
+            ("allto_pdf_artifact_bytes", "Disk used by tracked upload/output/extraction artifacts", janitor_stats["tracked_bytes"]),
+            ("allto_pdf_artifact_max_bytes", "Artifact disk budget", janitor_stats["max_bytes"]),
+            ("allto_pdf_artifacts_tracked", "Tracked artifacts", janitor_stats["tracked"]),
+        ]
+        for name, documentation, value in gauges:
+            yield GaugeMetricFamily(name, documentation, value=value)
+
+if PROMETHEUS_AVAILABLE:
+    REGISTRY.register(EngineMetricsCollector())
+
+def route_template(scope):
+    """Path template of the route serving `scope`, also for requests answered before routing."""
+    route = scope.get("route")
+    if route is None:
+        # e.g. a 413 from reject_oversized_uploads, which never reaches the router
+        for candidate in app.router.routes:
+            if candidate.matches(scope)[0] == Match.FULL:
+                route = candidate
+                break
+    return getattr(route, "path", "unmatched")
+
+@app.middleware("http")
+async def record_request_metrics(request: Request, call_next):
+    start = time.perf_counter()
+    try:
+        return await call_next(request)
+    finally:
+        if PROMETHEUS_AVAILABLE:
+            # Label by route template, not the raw path, to keep cardinality bounded
+            REQUEST_SECONDS.labels(request.method, route_template(request.scope)).observe(
+                time.perf_counter() - start
+            )
+
+@app.get("/metrics")
+async def get_metrics():
+    """Prometheus metrics: request latency, engine stage histograms and engine gauges."""
+    if not PROMETHEUS_AVAILABLE:
+        raise HTTPException(status_code=503, detail="prometheus_client not installed. Run: pip install prometheus-client")
+    return Response(generate_latest(), media_type=CONTENT_TYPE_LATEST)
+
+@app.get("/ready")
+async def get_ready():
+    """Readiness probe: 503 until the Unstructured workers have loaded their models."""
+    ready = not UNSTRUCTURED_AVAILABLE or unstructured_workers.ready
+    return JSONResponse(
+        {"ready": ready, "unstructured_workers": unstructured_workers.stats() if UNSTRUCTURED_AVAILABLE else None},
+        status_code=200 if ready else 503
     )
 
+@app.get("/stats")
+async def get_stats():
+    """Runtime statistics for the conversion and extraction engines."""
+    return JSONResponse({
+        "docling_converters": extraction_jobs.converter_stats(),
+        "browser": browser_manager.stats(),
+        "render_assets": render_assets.stats(),
+        "pdf_downloads": pdf_downloader.stats(),
+        "libreoffice": libreoffice_pool.stats(),
+        "extraction_cache": extraction_cache.stats(),
+        "extraction_jobs": extraction_jobs.stats(),
+        "unstructured_workers": unstructured_workers.stats(),
+        "ingest": ingest_stats.stats(),
+        "janitor": janitor.stats(),
+        "search_index": search_index.stats(),
+        "text_indexes": text_indexes.stats(),
+        "ocr": {
+            "tesseract": get_ocr_engine() if UNSTRUCTURED_AVAILABLE else None,
+            "workers": UNSTRUCTURED_OCR_WORKERS,
+            "pages_per_task": UNSTRUCTURED_OCR_PAGES,
+            "threads_per_worker": UNSTRUCTURED_OCR_THREADS,
+        }
+    })
+
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run(app, host="0.0.0.0", port=8000)
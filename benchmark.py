@@ -0,0 +1,444 @@
+"""
+Offline benchmark for the conversion and extraction engines.
+
+Generates a deterministic corpus (PDFs, DOCX/XLSX/PPTX, images and local HTML
+pages), then times convert_file_to_pdf, convert_web_to_pdf, extract_from_pdf and
+extract_from_pdf_unstructured in-process, broken down by the stages recorded
+with app.timed_stage (model_init, convert, markdown_export, table_export,
+image_save, ...). No running server or network access is needed.
+
+Usage:
+    python benchmark.py                                   # run everything, write bench_results.json
+    python benchmark.py --only extract_docling --repeat 5
+    python benchmark.py --baseline bench_baseline.json    # exit 1 on regressions
+"""
+
+import argparse
+import asyncio
+import base64
+import functools
+import http.server
+import io
+import json
+import os
+import platform
+import random
+import shutil
+import statistics
+import sys
+import threading
+import time
+import uuid
+from pathlib import Path
+
+import pandas as pd
+from PIL import Image, ImageDraw
+
+import app
+
+CORPUS_VERSION = 1
+DEFAULT_CORPUS_DIR = Path("bench_corpus")
+BENCH_ID_PREFIX = "bench_"
+
+WORDS = (
+    "document conversion extraction table image layout page model engine "
+    "pipeline render archive invoice report summary quarterly revenue margin "
+    "growth customer region product segment forecast budget variance"
+).split()
+
+
+# ==================== CORPUS ====================
+
+def _paragraph(rng, words=60):
+    text = " ".join(rng.choice(WORDS) for _ in range(words))
+    return text.capitalize() + "."
+
+def _table_frame(rng, rows=12, cols=5):
+    columns = ["Region"] + [f"Q{i}" for i in range(1, cols)]
+    data = [[f"{rng.choice(WORDS).title()} {r + 1}"] + [rng.randint(100, 9999) for _ in range(cols - 1)]
+            for r in range(rows)]
+    return pd.DataFrame(data, columns=columns)
+
+def _chart_image(rng, width=640, height=360):
+    image = Image.new("RGB", (width, height), "white")
+    draw = ImageDraw.Draw(image)
+    bars = 8
+    for i in range(bars):
+        bar_height = rng.randint(height // 6, height - 40)
+        x0 = 30 + i * (width - 60) // bars
+        draw.rectangle([x0, height - 20 - bar_height, x0 + (width - 60) // bars - 10, height - 20],
+                       fill=(rng.randint(0, 200), rng.randint(0, 200), rng.randint(0, 200)))
+    draw.line([20, height - 20, width - 20, height - 20], fill="black", width=2)
+    return image
+
+def _data_uri(image):
+    buffer = io.BytesIO()
+    image.save(buffer, "PNG")
+    return "data:image/png;base64," + base64.b64encode(buffer.getvalue()).decode()
+
+def _html_page(rng, sections, lazy_images=False, image_dir=None):
+    """HTML report with headings, paragraphs, tables and charts."""
+    body = []
+    for s in range(sections):
+        body.append(f"<h2>Section {s + 1}: {rng.choice(WORDS).title()}</h2>")
+        body.extend(f"<p>{_paragraph(rng)}</p>" for _ in range(3))
+        body.append(_table_frame(rng).to_html(index=False, border=1))
+        chart = _chart_image(rng)
+        if image_dir is not None:
+            name = f"chart_{s + 1}.png"
+            chart.save(image_dir / name)
+            src = name
+        else:
+            src = _data_uri(chart)
+        if lazy_images:
+            body.append(f'<img loading="lazy" src="{src}" width="640" height="360">')
+        else:
+            body.append(f'<img src="{src}" width="640" height="360">')
+        body.append('<div style="height: 400px"></div>' if lazy_images else "")
+    return (
+        "<!DOCTYPE html><html><head><meta charset='utf-8'><title>Benchmark report</title>"
+        "<style>body{font-family:sans-serif;margin:40px} table{border-collapse:collapse} "
+        "td,th{padding:4px 8px}</style></head><body><h1>Benchmark report</h1>"
+        + "".join(body) + "</body></html>"
+    )
+
+def _scanned_pdf(rng, path, pages):
+    """Image-only PDF (no text layer) to exercise OCR paths."""
+    images = []
+    for p in range(pages):
+        image = Image.new("RGB", (1240, 1754), "white")
+        draw = ImageDraw.Draw(image)
+        y = 80
+        for _ in range(40):
+            draw.text((80, y), _paragraph(rng, 12), fill="black")
+            y += 40
+        draw.text((80, 1700), f"Page {p + 1}", fill="black")
+        images.append(image)
+    images[0].save(path, "PDF", resolution=150.0, save_all=True, append_images=images[1:])
+
+def _docx(rng, path):
+    import docx
+    document = docx.Document()
+    document.add_heading("Benchmark report", 0)
+    for s in range(6):
+        document.add_heading(f"Section {s + 1}", level=1)
+        for _ in range(3):
+            document.add_paragraph(_paragraph(rng))
+        df = _table_frame(rng, rows=8)
+        table = document.add_table(rows=1, cols=len(df.columns))
+        for cell, name in zip(table.rows[0].cells, df.columns):
+            cell.text = str(name)
+        for row in df.itertuples(index=False):
+            for cell, value in zip(table.add_row().cells, row):
+                cell.text = str(value)
+    document.save(path)
+
+def _pptx(rng, path):
+    from pptx import Presentation
+    from pptx.util import Inches
+    presentation = Presentation()
+    for s in range(8):
+        slide = presentation.slides.add_slide(presentation.slide_layouts[5])
+        slide.shapes.title.text = f"Slide {s + 1}: {rng.choice(WORDS).title()}"
+        chart = io.BytesIO()
+        _chart_image(rng).save(chart, "PNG")
+        chart.seek(0)
+        slide.shapes.add_picture(chart, Inches(1), Inches(1.6), width=Inches(8))
+    presentation.save(path)
+
+async def _html_to_pdf(html_path, pdf_path):
+    async with app.browser_manager.new_context() as context:
+        page = await context.new_page()
+        await page.goto(html_path.absolute().as_uri(), wait_until="load")
+        await page.pdf(path=str(pdf_path), format="A4", print_background=True)
+
+async def build_corpus(corpus_dir):
+    """
+    Write the benchmark corpus into `corpus_dir` (skipped when a corpus of the
+    same version is already there). Everything is generated from a fixed seed.
+    """
+    corpus_dir = Path(corpus_dir)
+    manifest_path = corpus_dir / "manifest.json"
+    if manifest_path.exists():
+        manifest = json.loads(manifest_path.read_text(encoding="utf-8"))
+        if manifest.get("version") == CORPUS_VERSION:
+            return manifest
+
+    print(f"[*] Generating benchmark corpus in {corpus_dir}")
+    rng = random.Random(1234)
+    for sub in ("pdf", "office", "images", "web"):
+        (corpus_dir / sub).mkdir(parents=True, exist_ok=True)
+    files = {"pdf": [], "office": [], "images": [], "web": []}
+
+    # Digital PDFs rendered from HTML reports: text, tables and pictures
+    for name, sections in (("report_short", 2), ("report_long", 12)):
+        html_path = corpus_dir / "pdf" / f"{name}.html"
+        html_path.write_text(_html_page(rng, sections), encoding="utf-8")
+        pdf_path = corpus_dir / "pdf" / f"{name}.pdf"
+        try:
+            await _html_to_pdf(html_path, pdf_path)
+            files["pdf"].append(pdf_path.name)
+        except Exception as e:
+            print(f"[!] Could not render {pdf_path.name}: {e}")
+        finally:
+            html_path.unlink(missing_ok=True)
+
+    scanned_path = corpus_dir / "pdf" / "scanned.pdf"
+    _scanned_pdf(rng, scanned_path, pages=3)
+    files["pdf"].append(scanned_path.name)
+
+    # Office documents
+    xlsx_path = corpus_dir / "office" / "sheet.xlsx"
+    with pd.ExcelWriter(xlsx_path) as writer:
+        for s in range(3):
+            _table_frame(rng, rows=60, cols=8).to_excel(writer, sheet_name=f"Sheet{s + 1}", index=False)
+    files["office"].append(xlsx_path.name)
+    for name, builder in (("report.docx", _docx), ("slides.pptx", _pptx)):
+        try:
+            builder(rng, corpus_dir / "office" / name)
+            files["office"].append(name)
+        except ImportError as e:
+            print(f"[!] Skipping {name}: {e}")
+
+    # Images
+    for name, size in (("chart.png", (1280, 720)), ("photo.jpg", (3000, 2000))):
+        image = _chart_image(rng, *size)
+        image.save(corpus_dir / "images" / name)
+        files["images"].append(name)
+
+    # Local web pages, served over HTTP during the run
+    (corpus_dir / "web" / "static.html").write_text(_html_page(rng, 3), encoding="utf-8")
+    (corpus_dir / "web" / "lazy.html").write_text(
+        _html_page(rng, 10, lazy_images=True, image_dir=corpus_dir / "web"), encoding="utf-8"
+    )
+    files["web"] = ["static.html", "lazy.html"]
+
+    manifest = {"version": CORPUS_VERSION, "files": files}
+    manifest_path.write_text(json.dumps(manifest, indent=2), encoding="utf-8")
+    print(f"[✓] Corpus ready: {sum(len(v) for v in files.values())} files")
+    return manifest
+
+
+class _QuietHandler(http.server.SimpleHTTPRequestHandler):
+    def log_message(self, format, *args):
+        pass
+
+def serve_directory(directory):
+    """Serve `directory` on a free localhost port from a background thread."""
+    handler = functools.partial(_QuietHandler, directory=str(directory))
+    server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+# ==================== CASES ====================
+
+async def _time_async(func, *args):
+    with app.record_stages() as stages:
+        start = time.perf_counter()
+        result = await func(*args)
+        total = time.perf_counter() - start
+    return result, total, {stage: sum(samples) for stage, samples in stages.items()}
+
+def _time_sync(func, *args):
+    with app.record_stages() as stages:
+        start = time.perf_counter()
+        result = func(*args)
+        total = time.perf_counter() - start
+    return result, total, {stage: sum(samples) for stage, samples in stages.items()}
+
+def _cleanup_extraction(extract_id):
+    shutil.rmtree(app.EXTRACTED_DIR / extract_id, ignore_errors=True)
+
+def build_cases(corpus_dir, manifest, base_url, out_dir):
+    """Return {suite: [(case name, callable returning (ok, total, stages))]}."""
+    corpus_dir = Path(corpus_dir)
+    files = manifest["files"]
+
+    def convert_file(path):
+        async def run():
+            output = out_dir / f"{uuid.uuid4().hex}.pdf"
+            ok, total, stages = await _time_async(app.convert_file_to_pdf, path, output)
+            output.unlink(missing_ok=True)
+            return ok, total, stages
+        return run
+
+    def convert_web(url):
+        async def run():
+            output = out_dir / f"{uuid.uuid4().hex}.pdf"
+            ok, total, stages = await _time_async(app.convert_web_to_pdf, url, output)
+            output.unlink(missing_ok=True)
+            return ok, total, stages
+        return run
+
+    def extract(func, path):
+        async def run():
+            extract_id = f"{BENCH_ID_PREFIX}{uuid.uuid4().hex[:8]}"
+            try:
+                # Run on the calling thread so record_stages() sees every stage
+                result, total, stages = _time_sync(func, path, extract_id)
+            finally:
+                _cleanup_extraction(extract_id)
+            return result.get("success", False), total, stages
+        return run
+
+    return {
+        "convert_file": [(f"images/{n}", convert_file(corpus_dir / "images" / n)) for n in files["images"]]
+                        + [(f"office/{n}", convert_file(corpus_dir / "office" / n)) for n in files["office"]],
+        "convert_web": [(f"web/{n}", convert_web(f"{base_url}/{n}")) for n in files["web"]],
+        "extract_docling": [(f"pdf/{n}", extract(app.extract_from_pdf, corpus_dir / "pdf" / n)) for n in files["pdf"]],
+        "extract_unstructured": [(f"pdf/{n}", extract(app.extract_from_pdf_unstructured, corpus_dir / "pdf" / n))
+                                 for n in files["pdf"]],
+    }
+
+
+# ==================== RUN / REPORT ====================
+
+def _summarize(samples):
+    return {
+        "median": round(statistics.median(samples), 4),
+        "min": round(min(samples), 4),
+        "max": round(max(samples), 4),
+    }
+
+async def run_case(name, case, repeat):
+    """
+    Run a case once to warm it up (its stages are reported separately as `cold`,
+    which is where model_init lands), then `repeat` more times.
+    """
+    print(f"[*] {name}")
+    ok, total, stages = await case()
+    cold = {"total": round(total, 4), "stages": {k: round(v, 4) for k, v in stages.items()}}
+    if not ok:
+        print(f"[X] {name} failed")
+        return {"ok": False, "cold": cold}
+
+    totals = []
+    stage_samples = {}
+    for _ in range(repeat):
+        ok, total, stages = await case()
+        if not ok:
+            print(f"[X] {name} failed on a warm run")
+            return {"ok": False, "cold": cold}
+        totals.append(total)
+        for stage, seconds in stages.items():
+            stage_samples.setdefault(stage, []).append(seconds)
+
+    warm = {
+        "total": _summarize(totals),
+        "stages": {stage: _summarize(samples) for stage, samples in sorted(stage_samples.items())},
+    }
+    print(f"[✓] {name}: cold {cold['total']:.3f}s, warm median {warm['total']['median']:.3f}s")
+    return {"ok": True, "cold": cold, "warm": warm}
+
+def compare(results, baseline, threshold):
+    """
+    Compare warm medians against a previous results file. Returns a list of
+    {case, stage, baseline, current, change} rows and the regressions among them.
+    """
+    rows = []
+    for suite, cases in results["suites"].items():
+        for case_name, current in cases.items():
+            previous = baseline.get("suites", {}).get(suite, {}).get(case_name)
+            if not current.get("ok") or not previous or not previous.get("ok"):
+                continue
+            pairs = [("total", previous["warm"]["total"], current["warm"]["total"])]
+            pairs += [
+                (stage, previous["warm"]["stages"][stage], value)
+                for stage, value in current["warm"]["stages"].items()
+                if stage in previous["warm"]["stages"]
+            ]
+            for stage, before, after in pairs:
+                if before["median"] <= 0:
+                    continue
+                change = (after["median"] - before["median"]) / before["median"]
+                rows.append({
+                    "case": f"{suite}:{case_name}",
+                    "stage": stage,
+                    "baseline": before["median"],
+                    "current": after["median"],
+                    "change": round(change, 4),
+                })
+    regressions = [r for r in rows if r["change"] > threshold]
+    return rows, regressions
+
+def environment_info():
+    return {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "docling": app.engine_version("docling"),
+        "unstructured": app.engine_version("unstructured"),
+        "playwright": app.engine_version("playwright"),
+        "unstructured_available": app.UNSTRUCTURED_AVAILABLE,
+        "libreoffice": app.get_libreoffice_path() if os.name != "nt" else "office",
+    }
+
+async def main(args):
+    corpus_dir = Path(args.corpus)
+    manifest = await build_corpus(corpus_dir)
+
+    out_dir = app.OUTPUT_DIR / ".bench"
+    out_dir.mkdir(parents=True, exist_ok=True)
+    server = serve_directory(corpus_dir / "web")
+    base_url = f"http://127.0.0.1:{server.server_address[1]}"
+
+    suites = build_cases(corpus_dir, manifest, base_url, out_dir)
+    if not app.UNSTRUCTURED_AVAILABLE:
+        print("[!] Unstructured not installed - skipping extract_unstructured")
+        suites.pop("extract_unstructured")
+    if args.only:
+        suites = {name: cases for name, cases in suites.items() if name in args.only}
+
+    results = {
+        "created_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "repeat": args.repeat,
+        "environment": environment_info(),
+        "suites": {},
+    }
+    try:
+        for suite, cases in suites.items():
+            results["suites"][suite] = {}
+            for case_name, case in cases:
+                results["suites"][suite][case_name] = await run_case(f"{suite}:{case_name}", case, args.repeat)
+    finally:
+        server.shutdown()
+        await app.browser_manager.stop()
+        await app.libreoffice_pool.stop()
+
+    exit_code = 0
+    if args.baseline:
+        baseline = json.loads(Path(args.baseline).read_text(encoding="utf-8"))
+        rows, regressions = compare(results, baseline, args.threshold)
+        results["comparison"] = {"baseline": args.baseline, "threshold": args.threshold,
+                                 "rows": rows, "regressions": regressions}
+        print(f"\n{'case':<45} {'stage':<16} {'baseline':>9} {'current':>9} {'change':>8}")
+        for row in rows:
+            flag = "  <-- regression" if row in regressions else ""
+            print(f"{row['case']:<45} {row['stage']:<16} {row['baseline']:>9.3f} {row['current']:>9.3f} "
+                  f"{row['change']:>+8.1%}{flag}")
+        if regressions:
+            print(f"\n[X] {len(regressions)} stage(s) slower than baseline by more than {args.threshold:.0%}")
+            exit_code = 1
+        else:
+            print("\n[✓] No regressions against baseline")
+
+    Path(args.output).write_text(json.dumps(results, indent=2), encoding="utf-8")
+    print(f"[✓] Results written to {args.output}")
+    return exit_code
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Offline per-stage benchmark for All-To-PDF engines")
+    parser.add_argument("--corpus", default=str(DEFAULT_CORPUS_DIR), help="corpus directory (generated if missing)")
+    parser.add_argument("--repeat", type=int, default=3, help="warm runs per case (after one cold run)")
+    parser.add_argument("--only", nargs="+",
+                        choices=["convert_file", "convert_web", "extract_docling", "extract_unstructured"],
+                        help="run only these suites")
+    parser.add_argument("--output", default="bench_results.json", help="where to write the JSON results")
+    parser.add_argument("--baseline", help="previous results file to compare warm medians against")
+    parser.add_argument("--threshold", type=float, default=0.10,
+                        help="relative slowdown counted as a regression (default 0.10 = 10%%)")
+    return parser.parse_args(argv)
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main(parse_args())))
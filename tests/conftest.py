@@ -0,0 +1,20 @@
+import importlib
+import os
+import sys
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+
+@pytest.fixture(scope="session")
+def app(tmp_path_factory):
+    """The app module, imported from a scratch directory so its working dirs are created there."""
+    cwd = os.getcwd()
+    os.chdir(tmp_path_factory.mktemp("workdir"))
+    try:
+        return importlib.import_module("app")
+    finally:
+        os.chdir(cwd)
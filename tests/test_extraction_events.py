@@ -0,0 +1,28 @@
+import json
+
+import pytest
+
+
+def test_docling_page_ranges_cover_every_page_once(app):
+    assert app.docling_page_ranges(10, 4) == [(1, 4), (5, 8), (9, 10)]
+    assert app.docling_page_ranges(7, 4, first=5) == [(5, 7)]
+    assert app.docling_page_ranges(3, 10) == [(1, 3)]
+
+
+def test_events_are_appended_as_ndjson(app, tmp_path):
+    events = app.ExtractionEvents(tmp_path)
+    events.emit("page", pages=[1, 2], markdown="# Trang 1")
+    events.emit("done", summary={"pages": 2})
+    lines = (tmp_path / app.ExtractionEvents.FILENAME).read_text(encoding="utf-8").splitlines()
+    assert [json.loads(line) for line in lines] == [
+        {"type": "page", "pages": [1, 2], "markdown": "# Trang 1"},
+        {"type": "done", "summary": {"pages": 2}},
+    ]
+
+
+def test_cancel_marker_stops_the_extraction(app, tmp_path):
+    events = app.ExtractionEvents(tmp_path)
+    events.check_cancelled()
+    app.ExtractionEvents.request_cancel(tmp_path)
+    with pytest.raises(app.ExtractionCancelled):
+        events.check_cancelled()
@@ -0,0 +1,65 @@
+import time
+
+
+def make_janitor(app, tmp_path, max_bytes=1024 ** 3):
+    managed = tmp_path / "outputs"
+    managed.mkdir(exist_ok=True)
+    janitor = app.ArtifactJanitor([managed], tmp_path / "janitor.json", 60, max_bytes, orphan_ttl=0)
+    return janitor, managed
+
+
+def test_expired_artifacts_are_deleted_and_pending_ones_kept(app, tmp_path):
+    janitor, managed = make_janitor(app, tmp_path)
+    done = managed / "done.pdf"
+    writing = managed / "writing.pdf"
+    done.write_bytes(b"%PDF-")
+    writing.write_bytes(b"%PDF-")
+    janitor.register(done)
+    janitor.register(writing)
+    janitor.track(done, 0)
+    janitor.sweep()
+    assert not done.exists()
+    assert writing.exists()
+    assert janitor.deleted == 1
+
+
+def test_untracked_files_are_never_deleted(app, tmp_path):
+    janitor, managed = make_janitor(app, tmp_path, max_bytes=0)
+    sample = managed / "sample"
+    sample.mkdir()
+    (sample / "summary.txt").write_text("sample extraction", encoding="utf-8")
+    janitor.recover()
+    janitor.sweep()
+    assert (sample / "summary.txt").exists()
+    assert janitor.orphans_recovered == 0
+
+
+def test_pending_artifacts_of_a_previous_run_expire_after_restart(app, tmp_path):
+    janitor, managed = make_janitor(app, tmp_path)
+    orphan = managed / "orphan.pdf"
+    orphan.write_bytes(b"%PDF-")
+    janitor.register(orphan)
+    janitor.register(managed / "never-written.pdf")
+    janitor._save()
+
+    restarted, _ = make_janitor(app, tmp_path)
+    restarted.recover()
+    assert list(restarted.entries) == [str(orphan)]
+    assert restarted.orphans_recovered == 1
+    time.sleep(0.01)
+    restarted.sweep()
+    assert not orphan.exists()
+
+
+def test_least_recently_used_artifacts_are_evicted_over_quota(app, tmp_path):
+    janitor, managed = make_janitor(app, tmp_path, max_bytes=150)
+    old, new = managed / "old.pdf", managed / "new.pdf"
+    old.write_bytes(b"0" * 100)
+    new.write_bytes(b"0" * 100)
+    janitor.track(old, 3600)
+    janitor.track(new, 3600)
+    janitor.entries[str(old)]["last_access"] -= 10
+    janitor.sweep()
+    assert not old.exists()
+    assert new.exists()
+    assert janitor.evicted == 1
@@ -0,0 +1,40 @@
+import pytest
+
+
+def test_single_pages_and_ranges(app):
+    assert app.parse_page_ranges("1-3,10", 12) == [1, 2, 3, 10]
+
+
+def test_overlaps_are_merged_and_sorted(app):
+    assert app.parse_page_ranges("5,2-4, 3", 6) == [2, 3, 4, 5]
+
+
+def test_open_ended_range_runs_to_the_last_page(app):
+    assert app.parse_page_ranges("8-", 10) == [8, 9, 10]
+
+
+def test_empty_parts_are_ignored(app):
+    assert app.parse_page_ranges(",2,,", 3) == [2]
+
+
+@pytest.mark.parametrize("spec", ["a", "1-2-3", "-3", "1.5"])
+def test_malformed_selection(app, spec):
+    with pytest.raises(ValueError, match="Invalid page range"):
+        app.parse_page_ranges(spec, 10)
+
+
+@pytest.mark.parametrize("spec", ["0", "11", "4-2", "9-11"])
+def test_pages_outside_the_document(app, spec):
+    with pytest.raises(ValueError, match="outside 1-10"):
+        app.parse_page_ranges(spec, 10)
+
+
+def test_nothing_selected(app):
+    with pytest.raises(ValueError, match="No pages selected"):
+        app.parse_page_ranges(" , ", 10)
+
+
+def test_normalized_selection_round_trips(app):
+    pages = app.parse_page_ranges("3,1-2,7,8", 10)
+    assert app.format_page_list(pages) == "1-3,7-8"
+    assert app.parse_page_ranges(app.format_page_list(pages), 10) == pages
@@ -0,0 +1,19 @@
+def test_page_runs_groups_consecutive_pages_per_route(app):
+    routes = {1: "text", 2: "text", 3: "ocr", 4: "text", 5: "text", 7: "text"}
+    assert app.page_runs(routes) == [("text", 1, 2), ("ocr", 3, 3), ("text", 4, 5), ("text", 7, 7)]
+
+
+def test_page_runs_sorts_pages(app):
+    assert app.page_runs({3: "ocr", 1: "ocr", 2: "ocr"}) == [("ocr", 1, 3)]
+    assert app.page_runs({}) == []
+
+
+def test_format_page_list(app):
+    assert app.format_page_list([7, 1, 3, 2]) == "1-3,7"
+    assert app.format_page_list([4]) == "4"
+    assert app.format_page_list([]) == ""
+
+
+def test_summarize_page_routes(app):
+    routes = {1: "text", 2: "text", 3: "ocr", 4: "text", 6: "ocr"}
+    assert app.summarize_page_routes(routes) == {"ocr": "3,6", "text": "1-2,4"}
@@ -0,0 +1,51 @@
+import asyncio
+
+import httpx
+
+PDF = b"%PDF-1.7\n" + b"0" * 4096
+
+
+def make_downloader(app, tmp_path, handler, max_bytes=1024 ** 2):
+    downloader = app.PdfDownloader(tmp_path / "store", max_bytes, 10 * 1024 ** 2, 2)
+    downloader._client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    return downloader
+
+
+def test_unchanged_pdf_is_revalidated_from_the_store(app, tmp_path):
+    seen = []
+
+    def handler(request):
+        seen.append(request.headers.get("if-none-match"))
+        if request.headers.get("if-none-match") == '"v1"':
+            return httpx.Response(304)
+        return httpx.Response(200, content=PDF, headers={"etag": '"v1"'})
+
+    downloader = make_downloader(app, tmp_path, handler)
+    url = "https://example.com/doc.pdf"
+    assert asyncio.run(downloader.download(url, tmp_path / "first.pdf"))
+    assert asyncio.run(downloader.download(url, tmp_path / "second.pdf"))
+    assert seen == [None, '"v1"']
+    assert (tmp_path / "second.pdf").read_bytes() == PDF
+    stats = downloader.stats()
+    assert stats["downloads"] == 1
+    assert stats["revalidated"] == 1
+    assert stats["bytes_saved"] == len(PDF)
+
+
+def test_non_pdf_body_is_not_written(app, tmp_path):
+    downloader = make_downloader(app, tmp_path, lambda request: httpx.Response(200, content=b"<html></html>"))
+    assert not asyncio.run(downloader.download("https://example.com/pdf/page", tmp_path / "out.pdf"))
+    assert not (tmp_path / "out.pdf").exists()
+    assert downloader.stats()["not_pdf"] == 1
+
+
+def test_oversized_body_is_rejected_and_removed(app, tmp_path):
+    downloader = make_downloader(app, tmp_path, lambda request: httpx.Response(200, content=PDF), max_bytes=1024)
+    try:
+        asyncio.run(downloader.download("https://example.com/big.pdf", tmp_path / "out.pdf"))
+    except ValueError as e:
+        assert "download limit" in str(e)
+    else:
+        raise AssertionError("oversized PDF was accepted")
+    assert not (tmp_path / "out.pdf").exists()
+    assert downloader.stats()["rejected"] == 1
@@ -0,0 +1,42 @@
+def make_cache(app, tmp_path):
+    cache = app.RenderAssetCache(tmp_path / "assets", 1024 ** 2, 3600, ())
+    cache.load()
+    return cache
+
+
+def test_vary_headers(app):
+    vary = app.RenderAssetCache.vary_headers
+    assert vary({"vary": "Accept-Encoding, Accept-Language"}) == ["accept-language"]
+    assert vary({}) == []
+    assert vary({"vary": "User-Agent, *"}) is None
+
+
+def test_freshness_follows_cache_control(app, tmp_path):
+    cache = make_cache(app, tmp_path)
+    assert cache.freshness({"cache-control": "public, max-age=60"}) == 60
+    assert cache.freshness({"cache-control": "max-age=60, s-maxage=600"}) == 600
+    assert cache.freshness({}) == 3600
+    assert cache.freshness({"cache-control": "no-store"}) == 0
+    assert cache.freshness({"set-cookie": "id=1"}) == 0
+
+
+def test_responses_are_stored_per_vary_value(app, tmp_path):
+    cache = make_cache(app, tmp_path)
+    url = "https://cdn.example.com/app.css"
+    vary = ["accept-language"]
+    cache.put(url, 200, {}, b"body { lang: vi }", 60, {"accept-language": "vi"}, vary)
+    cache.put(url, 200, {}, b"body { lang: en }", 60, {"accept-language": "en"}, vary)
+    assert cache.get(url, {"accept-language": "vi"})[1] == b"body { lang: vi }"
+    assert cache.get(url, {"accept-language": "en"})[1] == b"body { lang: en }"
+    assert cache.get(url, {"accept-language": "fr"}) is None
+
+    reloaded = make_cache(app, tmp_path)
+    assert reloaded.get(url, {"accept-language": "vi"})[1] == b"body { lang: vi }"
+
+
+def test_expired_entries_are_dropped(app, tmp_path):
+    cache = make_cache(app, tmp_path)
+    url = "https://cdn.example.com/app.js"
+    cache.put(url, 200, {}, b"console.log(1)", 0)
+    assert cache.get(url) is None
+    assert cache.entries == {}
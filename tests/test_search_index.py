@@ -0,0 +1,69 @@
+import pytest
+
+
+@pytest.fixture
+def index(app, tmp_path):
+    search_index = app.SearchIndex(tmp_path / ".search_index.sqlite")
+    yield search_index
+    if search_index._conn is not None:
+        search_index._conn.close()
+
+
+def add_extraction(app, index, root, extract_id, pages, filename="doc.pdf"):
+    output_base = root / extract_id
+    output_base.mkdir()
+    app.write_page_texts(output_base, pages)
+    index.add(extract_id, filename, output_base)
+    return output_base
+
+
+def test_match_expression_quotes_terms_and_keeps_prefixes(app):
+    assert app.SearchIndex.match_expression("hợp đồng") == '"hợp" "dồng"'
+    assert app.SearchIndex.match_expression('say "hi" pre*') == '"say" """hi""" "pre"*'
+    assert app.SearchIndex.match_expression("  * ") == ""
+
+
+def test_match_expression_folds_d_with_stroke(app):
+    assert app.SearchIndex.match_expression("Đà Nẵng") == '"Dà" "Nẵng"'
+
+
+def test_unaccented_query_finds_vietnamese_text(app, index, tmp_path):
+    add_extraction(app, index, tmp_path, "e1", {1: "Mẫu hợp đồng lao động", 2: "Phụ lục"})
+    hits = index.search("hop dong")
+    assert [(hit["extract_id"], hit["page_no"]) for hit in hits] == [("e1", 1)]
+    # Snippets are cut from the original text, not the folded copy
+    assert hits[0]["snippet"] == "Mẫu **hợp** **đồng** lao **động**"
+    assert hits[0]["filename"] == "doc.pdf"
+
+
+def test_prefix_query_and_extract_filter(app, index, tmp_path):
+    add_extraction(app, index, tmp_path, "e1", {1: "transformer architecture"})
+    add_extraction(app, index, tmp_path, "e2", {3: "transformers everywhere"})
+    assert {hit["extract_id"] for hit in index.search("transform*")} == {"e1", "e2"}
+    assert [hit["page_no"] for hit in index.search("transform*", extract_id="e2")] == [3]
+    assert index.search("transform") == []
+
+
+def test_reindex_and_remove(app, index, tmp_path):
+    output_base = add_extraction(app, index, tmp_path, "e1", {1: "alpha", 2: "  "})
+    assert index.stats()["pages"] == 1
+    app.write_page_texts(output_base, {1: "beta"})
+    index.add("e1", "doc.pdf", output_base)
+    assert index.search("alpha") == []
+    assert [hit["page_no"] for hit in index.search("beta")] == [1]
+    index.remove("e1")
+    assert index.search("beta") == []
+    assert index.stats()["extractions"] == 0
+
+
+def test_sync_indexes_new_and_drops_deleted_extractions(app, index, tmp_path):
+    extracted = tmp_path / "extracted"
+    extracted.mkdir()
+    add_extraction(app, index, extracted, "gone", {1: "stale"})
+    (extracted / "gone" / app.PAGE_TEXTS_FILE).unlink()
+    fresh = extracted / "fresh"
+    fresh.mkdir()
+    app.write_page_texts(fresh, {1: "fresh text"})
+    index.sync(extracted)
+    assert index.search("stale") == []
+    assert [hit["extract_id"] for hit in index.search("fresh")] == ["fresh"]
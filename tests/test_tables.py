@@ -0,0 +1,48 @@
+import pandas as pd
+
+
+def test_round_trip_keeps_values_and_columns(app, tmp_path):
+    df = pd.DataFrame({"Tên": ["Hà Nội", "Đà Nẵng"], "Dân số": [8.4, 1.2]})
+    path = tmp_path / "table_1.parquet"
+    app.write_canonical_table(df, path, ("csv", "xlsx"))
+    restored, meta = app.read_canonical_table(path)
+    pd.testing.assert_frame_equal(restored, df)
+    assert meta == {"columns": ["Tên", "Dân số"], "formats": ["csv", "xlsx"], "source_html": None}
+    assert app.canonical_table_meta(path) == meta
+
+
+def test_duplicate_and_multi_level_columns(app, tmp_path):
+    duplicated = pd.DataFrame([[1, 2]], columns=["x", "x"])
+    app.write_canonical_table(duplicated, tmp_path / "dup.parquet", ("csv",))
+    assert list(app.read_canonical_table(tmp_path / "dup.parquet")[0].columns) == ["x", "x"]
+
+    columns = pd.MultiIndex.from_tuples([("2023", "Q1"), ("2023", "Q2")])
+    multi = pd.DataFrame([[1, 2]], columns=columns)
+    app.write_canonical_table(multi, tmp_path / "multi.parquet", ("csv",))
+    restored, _ = app.read_canonical_table(tmp_path / "multi.parquet")
+    assert list(restored.columns) == [("2023", "Q1"), ("2023", "Q2")]
+
+
+def test_mixed_type_columns_are_kept_as_text(app, tmp_path):
+    df = pd.DataFrame({"value": [1, "n/a", None]})
+    app.write_canonical_table(df, tmp_path / "mixed.parquet", ("csv",))
+    restored, _ = app.read_canonical_table(tmp_path / "mixed.parquet")
+    values = restored["value"].tolist()
+    assert values[:2] == ["1", "n/a"] and pd.isna(values[2])
+
+
+def test_source_html_is_kept_for_html_exports(app, tmp_path):
+    html = "<table><tr><td>gộp ô</td></tr></table>"
+    app.write_canonical_table(pd.DataFrame({"a": ["gộp ô"]}), tmp_path / "table_2.parquet", ("html",), source_html=html)
+    path = app.materialize_table(tmp_path, "table_2.html")
+    assert path.read_text(encoding="utf-8") == html
+
+
+def test_materialize_only_offered_formats(app, tmp_path):
+    app.write_canonical_table(pd.DataFrame({"a": [1]}), tmp_path / "table_3.parquet", ("csv",))
+    assert app.materialize_table(tmp_path, "table_3.xlsx") is None
+    assert app.materialize_table(tmp_path, "table_4.csv") is None
+    csv_path = app.materialize_table(tmp_path, "table_3.csv")
+    assert csv_path == tmp_path / "table_3.csv"
+    assert csv_path.read_text(encoding="utf-8-sig").splitlines() == ["a", "1"]
+    assert not [p for p in tmp_path.iterdir() if p.name.startswith(".")]
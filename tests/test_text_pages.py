@@ -0,0 +1,85 @@
+import os
+
+from docling_core.types.doc import BoundingBox, DocItemLabel, DoclingDocument, ProvenanceItem, Size
+
+PAGES = [(1, "Hợp đồng mua bán"), (2, "Điều 1. Giá: 1.000.000 đ"), (4, "日本語のページ\r\nsecond line")]
+
+
+def test_write_paged_text_offsets_are_utf8_byte_offsets(app, tmp_path):
+    text_file = tmp_path / "extracted_text.md"
+    offsets = app.write_paged_text(text_file, PAGES)
+    data = text_file.read_bytes()
+    assert [page_no for page_no, _, _ in offsets] == [1, 2, 4]
+    for (page_no, start, end), (_, text) in zip(offsets, PAGES):
+        assert data[start:end].decode("utf-8") == text
+    # Written as is: CRLF inside a page is not translated
+    assert data.decode("utf-8") == "\n\n".join(text for _, text in PAGES)
+
+
+def test_read_text_pages_multibyte_round_trip(app, tmp_path):
+    text_file = tmp_path / "extracted_text.md"
+    offsets = app.write_paged_text(text_file, PAGES)
+    assert app.read_text_pages(text_file, offsets, {2}) == (PAGES[1][1], [2])
+    # Adjacent pages come back as one slice, including the separator between them
+    assert app.read_text_pages(text_file, offsets, {1, 2}) == (PAGES[0][1] + "\n\n" + PAGES[1][1], [1, 2])
+    text, pages = app.read_text_pages(text_file, offsets, {1, 4})
+    assert (text, pages) == (PAGES[0][1] + "\n\n" + PAGES[2][1], [1, 4])
+    assert app.read_text_pages(text_file, offsets, {3}) == ("", [])
+
+
+def test_custom_separator(app, tmp_path):
+    text_file = tmp_path / "extracted_text.md"
+    offsets = app.write_paged_text(text_file, PAGES, separator="\n")
+    assert app.read_text_pages(text_file, offsets, {1, 2})[0] == PAGES[0][1] + "\n" + PAGES[1][1]
+
+
+def test_text_index_cache_reloads_a_rewritten_index(app, tmp_path):
+    cache = app.TextIndexCache(max_entries=2)
+    assert cache.get(tmp_path) is None
+    app.write_text_index(tmp_path, 4, {"md": [[1, 0, 3]]})
+    assert cache.get(tmp_path) == {"md": [[1, 0, 3]], "page_count": 4}
+    assert cache.get(tmp_path)["page_count"] == 4
+    assert cache.hits == 1
+    index_file = tmp_path / app.TEXT_INDEX_FILE
+    app.write_text_index(tmp_path, 5, {"md": [[1, 0, 3]]})
+    stat = index_file.stat()
+    # Make sure the rewrite is visible even on filesystems with coarse mtimes
+    os.utime(index_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+    assert cache.get(tmp_path)["page_count"] == 5
+
+
+def test_page_texts_round_trip(app, tmp_path):
+    app.write_page_texts(tmp_path, {3: "ba", 1: "một"})
+    assert app.read_page_texts(tmp_path) == [{"page": 1, "text": "một"}, {"page": 3, "text": "ba"}]
+
+
+def _document(pages):
+    doc = DoclingDocument(name="test")
+    for page_no in sorted({page_no for page_no, _ in pages}):
+        doc.add_page(page_no=page_no, size=Size(width=100, height=100))
+    for page_no, text in pages:
+        prov = ProvenanceItem(page_no=page_no, bbox=BoundingBox(l=0, t=0, r=10, b=10), charspan=(0, len(text)))
+        doc.add_text(label=DocItemLabel.TEXT, text=text, prov=prov)
+    return doc
+
+
+def test_split_docling_pages_follows_page_numbers(app):
+    doc = _document([(1, "Trang một"), (1, "vẫn trang một"), (3, "page three")])
+    exported = doc.export_to_markdown(page_break_placeholder=app.DOCLING_PAGE_BREAK)
+    assert app.split_docling_pages(doc, exported) == [(1, "Trang một\n\nvẫn trang một"), (3, "page three")]
+
+
+def test_split_docling_pages_plain_text_export(app):
+    doc = _document([(2, "two"), (5, "five")])
+    exported = doc.export_to_text(page_break_placeholder=app.DOCLING_PAGE_BREAK)
+    assert app.split_docling_pages(doc, exported) == [(2, "two"), (5, "five")]
+
+
+def test_split_docling_pages_keeps_unattributable_breaks_as_one_page(app):
+    doc = _document([(2, "two"), (3, "three")])
+    exported = "two" + app.DOCLING_PAGE_BREAK + "extra" + app.DOCLING_PAGE_BREAK + "three"
+    assert app.split_docling_pages(doc, exported) == [(2, "two\n\nextra\n\nthree")]
+
+
+def test_split_docling_pages_empty_document(app):
+    assert app.split_docling_pages(_document([]), "", first_page=7) == [(7, "")]
@@ -0,0 +1,48 @@
+import io
+import os
+import zipfile
+
+import pandas as pd
+
+
+def make_extraction(app, base):
+    (base / "text").mkdir(parents=True)
+    (base / "text" / "extracted_text.md").write_text("# Tiêu đề\n" + "nội dung " * 5000, encoding="utf-8")
+    (base / "images").mkdir()
+    (base / "images" / "image_1_page_1.png").write_bytes(os.urandom(20000))
+    (base / "images" / ".variants").mkdir()
+    (base / "images" / ".variants" / "image_1_page_1.webp").write_bytes(b"derived")
+    (base / "tables").mkdir()
+    app.write_canonical_table(pd.DataFrame({"a": [1, 2]}), base / "tables" / "table_1.parquet", ("csv",))
+    (base / "summary.txt").write_text("summary", encoding="utf-8")
+    (base / "events.ndjson").write_text('{"type": "done"}\n', encoding="utf-8")
+    (base / ".cancel").touch()
+
+
+def test_zip_stream_is_a_valid_archive_of_the_results(app, tmp_path):
+    base = tmp_path / "extraction"
+    make_extraction(app, base)
+    pieces = list(app.iter_zip_stream(base, chunk_size=4096))
+    assert len(pieces) > 2
+    with zipfile.ZipFile(io.BytesIO(b"".join(pieces))) as archive:
+        assert archive.testzip() is None
+        assert sorted(archive.namelist()) == [
+            "images/image_1_page_1.png", "summary.txt", "tables/table_1.csv", "text/extracted_text.md",
+        ]
+        assert archive.read("text/extracted_text.md") == (base / "text" / "extracted_text.md").read_bytes()
+        assert archive.read("tables/table_1.csv").decode("utf-8-sig").splitlines() == ["a", "1", "2"]
+        assert archive.getinfo("images/image_1_page_1.png").compress_type == zipfile.ZIP_STORED
+        assert archive.getinfo("text/extracted_text.md").compress_type == zipfile.ZIP_DEFLATED
+
+
+def test_table_exports_already_rendered_are_not_duplicated(app, tmp_path):
+    base = tmp_path / "extraction"
+    make_extraction(app, base)
+    app.materialize_table(base / "tables", "table_1.csv")
+    with zipfile.ZipFile(io.BytesIO(b"".join(app.iter_zip_stream(base)))) as archive:
+        assert archive.namelist().count("tables/table_1.csv") == 1
+
+
+def test_empty_directory(app, tmp_path):
+    with zipfile.ZipFile(io.BytesIO(b"".join(app.iter_zip_stream(tmp_path)))) as archive:
+        assert archive.namelist() == []
@@ -0,0 +1,56 @@
+"""
+UNO bridge for the LibreOffice worker pool.
+
+app.py imports this in-process when its interpreter can `import uno`. Otherwise
+it runs this file under a Python that ships the UNO bindings (the distro
+python3 with python3-uno, or LibreOffice's bundled python):
+
+    python3 uno_bridge.py <port> <input_path> <output_path>
+"""
+import sys
+from pathlib import Path
+
+import uno
+from com.sun.star.beans import PropertyValue
+
+def _uno_property(name, value):
+    prop = PropertyValue()
+    prop.Name = name
+    prop.Value = value
+    return prop
+
+def uno_convert_to_pdf(port, input_path, output_path):
+    """Convert a document to PDF through a running soffice listening on `port` (blocking)."""
+    local_ctx = uno.getComponentContext()
+    resolver = local_ctx.ServiceManager.createInstanceWithContext("com.sun.star.bridge.UnoUrlResolver", local_ctx)
+    ctx = resolver.resolve(f"uno:socket,host=127.0.0.1,port={port};urp;StarOffice.ComponentContext")
+    desktop = ctx.ServiceManager.createInstanceWithContext("com.sun.star.frame.Desktop", ctx)
+    doc = desktop.loadComponentFromURL(
+        uno.systemPathToFileUrl(str(Path(input_path).absolute())), "_blank", 0,
+        (_uno_property("Hidden", True),)
+    )
+    if doc is None:
+        raise RuntimeError(f"LibreOffice could not open {input_path}")
+    try:
+        if doc.supportsService("com.sun.star.sheet.SpreadsheetDocument"):
+            pdf_filter = "calc_pdf_Export"
+        elif doc.supportsService("com.sun.star.presentation.PresentationDocument"):
+            pdf_filter = "impress_pdf_Export"
+        elif doc.supportsService("com.sun.star.drawing.DrawingDocument"):
+            pdf_filter = "draw_pdf_Export"
+        else:
+            pdf_filter = "writer_pdf_Export"
+        doc.storeToURL(
+            uno.systemPathToFileUrl(str(Path(output_path).absolute())),
+            (_uno_property("FilterName", pdf_filter),)
+        )
+    finally:
+        doc.close(True)
+
+if __name__ == "__main__":
+    if len(sys.argv) != 4:
+        sys.exit("usage: uno_bridge.py <port> <input_path> <output_path>")
+    try:
+        uno_convert_to_pdf(int(sys.argv[1]), sys.argv[2], sys.argv[3])
+    except Exception as e:
+        sys.exit(f"UNO conversion failed: {e}")